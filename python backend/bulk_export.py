@@ -0,0 +1,317 @@
+"""
+Native Bulk Exports
+Writes the generated dataset straight into the formats the backends restore
+natively: a mongodump directory or archive (BSON plus index metadata) for
+mongorestore
+"""
+
+from seed import generate_all_seed_data, COLLECTION_NAMES
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import struct
+import time
+import uuid
+
+
+# ============================================================================
+# BSON
+# ============================================================================
+
+class ObjectId(bytes):
+    """12-byte MongoDB ObjectId, encoded as BSON type 0x07"""
+
+
+class Int64(int):
+    """Integer always encoded as BSON int64 (type 0x12), even when it fits in 32 bits"""
+
+
+_INT32 = struct.Struct("<i")
+_INT64 = struct.Struct("<q")
+_DOUBLE = struct.Struct("<d")
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _bson_element(key: str, value: Any) -> bytes:
+    name = key.encode("utf-8") + b"\0"
+    if value is None:
+        return b"\x0a" + name
+    if isinstance(value, bool):
+        return b"\x08" + name + (b"\x01" if value else b"\x00")
+    if isinstance(value, Int64):
+        return b"\x12" + name + _INT64.pack(value)
+    if isinstance(value, int):
+        if -2 ** 31 <= value < 2 ** 31:
+            return b"\x10" + name + _INT32.pack(value)
+        return b"\x12" + name + _INT64.pack(value)
+    if isinstance(value, float):
+        return b"\x01" + name + _DOUBLE.pack(value)
+    if isinstance(value, str):
+        encoded = value.encode("utf-8")
+        return b"\x02" + name + _INT32.pack(len(encoded) + 1) + encoded + b"\0"
+    if isinstance(value, ObjectId):
+        return b"\x07" + name + bytes(value)
+    if isinstance(value, dict):
+        return b"\x03" + name + encode_bson(value)
+    if isinstance(value, (list, tuple)):
+        return b"\x04" + name + encode_bson({str(i): item for i, item in enumerate(value)})
+    if isinstance(value, datetime):
+        millis = int((value.replace(tzinfo=None) - _EPOCH).total_seconds() * 1000)
+        return b"\x09" + name + _INT64.pack(millis)
+    return _bson_element(key, str(value))
+
+
+def encode_bson(document: Dict[str, Any]) -> bytes:
+    """Encode a dict as one BSON document (keys in insertion order)"""
+    body = b"".join([_bson_element(key, value) for key, value in document.items()])
+    return _INT32.pack(len(body) + 5) + body + b"\0"
+
+
+def object_id_for(record: Dict[str, Any]) -> ObjectId:
+    """
+    Stable _id for a seed record: createdAt seconds plus 8 bytes of its UUID,
+    so repeated exports of the same data restore to the same _ids
+    """
+    seconds = 0
+    created = record.get("createdAt")
+    if isinstance(created, str):
+        try:
+            seconds = int((datetime.fromisoformat(created.rstrip("Z")) - _EPOCH).total_seconds())
+        except ValueError:
+            pass
+    record_id = str(record.get("id", ""))
+    try:
+        tail = uuid.UUID(record_id).bytes[:8]
+    except ValueError:
+        tail = hashlib.blake2b(record_id.encode("utf-8"), digest_size=8).digest()
+    return ObjectId(struct.pack(">I", max(0, min(seconds, 2 ** 32 - 1))) + tail)
+
+
+# ============================================================================
+# CHECKSUMS
+# ============================================================================
+
+def _reflected_table(polynomial: int) -> List[int]:
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ polynomial if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC64_ECMA_TABLE = _reflected_table(0xC96C5795D7870F42)
+
+
+def crc64_ecma(data: bytes, crc: int = 0) -> int:
+    """CRC-64/ECMA as Go's hash/crc64 computes it (mongodump archive namespace checksums)"""
+    table = _CRC64_ECMA_TABLE
+    crc ^= 0xFFFFFFFFFFFFFFFF
+    for byte in data:
+        crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFFFFFFFFFF
+
+
+# ============================================================================
+# MONGODUMP
+# ============================================================================
+
+# mongodump archive framing (mongo-tools archive package)
+ARCHIVE_MAGIC = 0x8199E26D
+ARCHIVE_TERMINATOR = b"\xff\xff\xff\xff"
+
+
+def mongo_indexes(table: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Index specs for a collection's metadata: _id, the `id` lookup key, and the
+    keyset indexes that retention.py / propagation.py page on (plus geo_index.py's
+    2dsphere indexes when the records carry GeoJSON, and search_index.py's
+    searchKeywords indexes when they carry keywords)
+    """
+    from retention import DEFAULT_POLICIES
+    from propagation import DENORMALIZATIONS
+    from geo_index import MONGO_GEO_INDEXES
+    from search_index import MONGO_SEARCH_INDEXES
+
+    keys: List[List[Tuple[str, Any]]] = [[("id", 1)]]
+    keys += [[(field, 1) for field in p.index_fields()] for p in DEFAULT_POLICIES if p.table == table]
+    keys += [[(d.foreign_key, 1), ("id", 1)] for d in DENORMALIZATIONS if d.target == table]
+    if records and "geo" in records[0]:
+        keys += [list(k) for k in MONGO_GEO_INDEXES.get(table, [])]
+    if records and "searchKeywords" in records[0]:
+        keys += [list(k) for k in MONGO_SEARCH_INDEXES.get(table, [])]
+
+    indexes = [{"v": 2, "key": {"_id": 1}, "name": "_id_"}]
+    for key in keys:
+        spec = {"v": 2, "key": dict(key), "name": "_".join(f"{field}_{direction}" for field, direction in key)}
+        if any(direction == "2dsphere" for _, direction in key):
+            spec["2dsphereIndexVersion"] = 3
+        indexes.append(spec)
+    return indexes
+
+
+def collection_metadata(table: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """<collection>.metadata.json contents"""
+    return {"options": {}, "indexes": mongo_indexes(table, records), "collectionName": table, "type": "collection"}
+
+
+def _mongo_documents(records: Iterable[Dict[str, Any]]) -> Iterable[bytes]:
+    for record in records:
+        yield encode_bson({"_id": object_id_for(record), **record})
+
+
+def write_mongodump_dir(seed_data: Dict[str, List[Dict[str, Any]]], out_dir: str, database: str = "drlocum",
+                        table_mapping: Optional[Dict[str, str]] = None, compress: bool = False) -> Dict[str, Any]:
+    """
+    mongodump directory layout: <out_dir>/<database>/<collection>.bson and
+    <collection>.metadata.json (both .gz with compress, as mongodump --gzip)
+
+    Restore with: mongorestore [--gzip] --dir <out_dir>
+
+    Returns:
+        Summary with per-collection document counts and total bytes written
+    """
+    table_mapping = table_mapping or COLLECTION_NAMES
+    db_dir = os.path.join(out_dir, database)
+    os.makedirs(db_dir, exist_ok=True)
+    suffix = ".gz" if compress else ""
+    opener = (lambda path: gzip.open(path, "wb", compresslevel=6)) if compress else (lambda path: open(path, "wb"))
+    summary = {"collections": {}, "bytes": 0}
+    for seed_key, table in table_mapping.items():
+        records = seed_data.get(seed_key, [])
+        with opener(os.path.join(db_dir, f"{table}.bson{suffix}")) as f:
+            for document in _mongo_documents(records):
+                f.write(document)
+                summary["bytes"] += len(document)
+        with opener(os.path.join(db_dir, f"{table}.metadata.json{suffix}")) as f:
+            f.write(json.dumps(collection_metadata(table, records)).encode("utf-8"))
+        summary["collections"][table] = len(records)
+    return summary
+
+
+def write_mongodump_archive(seed_data: Dict[str, List[Dict[str, Any]]], path: str, database: str = "drlocum",
+                            table_mapping: Optional[Dict[str, str]] = None, compress: bool = False) -> Dict[str, Any]:
+    """
+    Single-file mongodump archive (mongodump --archive [--gzip])
+
+    Layout: magic number, header document, one metadata document per
+    collection, terminator; then each collection's BSON documents after a
+    namespace header, closed by an EOF namespace header carrying the CRC-64 of
+    the collection's documents. The body is spooled to <path>.body first,
+    because the prelude records each collection's size.
+
+    Restore with: mongorestore [--gzip] --archive=<path>
+
+    Returns:
+        Summary with per-collection document counts and total bytes of BSON documents
+    """
+    table_mapping = table_mapping or COLLECTION_NAMES
+    summary = {"collections": {}, "bytes": 0}
+    prelude = []
+    body_path = path + ".body"
+    with open(body_path, "wb") as body:
+        for seed_key, table in table_mapping.items():
+            records = seed_data.get(seed_key, [])
+            size = crc = 0
+            if records:
+                body.write(encode_bson({"db": database, "collection": table, "EOF": False, "CRC": Int64(0)}))
+                for document in _mongo_documents(records):
+                    body.write(document)
+                    crc = crc64_ecma(document, crc)
+                    size += len(document)
+                body.write(ARCHIVE_TERMINATOR)
+            body.write(encode_bson({"db": database, "collection": table, "EOF": True,
+                                    "CRC": Int64(crc - 2 ** 64 if crc >= 2 ** 63 else crc)}))
+            body.write(ARCHIVE_TERMINATOR)
+            prelude.append(encode_bson({
+                "db": database,
+                "collection": table,
+                "metadata": json.dumps(collection_metadata(table, records)),
+                "size": Int64(size),
+                "type": "collection",
+            }))
+            summary["collections"][table] = len(records)
+            summary["bytes"] += size
+
+    try:
+        with (gzip.open(path, "wb", compresslevel=6) if compress else open(path, "wb")) as f:
+            f.write(_INT32.pack(ARCHIVE_MAGIC - 2 ** 32))
+            f.write(encode_bson({"concurrent_collections": 1, "version": "0.1",
+                                 "server_version": "", "tool_version": "drlocum-bulk-export"}))
+            for document in prelude:
+                f.write(document)
+            f.write(ARCHIVE_TERMINATOR)
+            with open(body_path, "rb") as body:
+                shutil.copyfileobj(body, f, 1024 * 1024)
+    finally:
+        os.remove(body_path)
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Export seed data in native bulk-restore formats')
+    parser.add_argument('--mongodump-dir', type=str, help='Write a mongodump directory (restore: mongorestore --dir)')
+    parser.add_argument('--mongodump-archive', type=str,
+                       help='Write a mongodump archive file (restore: mongorestore --archive=FILE)')
+    parser.add_argument('--database', type=str, default='drlocum', help='MongoDB database name (default: drlocum)')
+    parser.add_argument('--gzip', action='store_true', help='Compress mongodump output (restore with --gzip)')
+    parser.add_argument('--with-read-models', action='store_true',
+                       help='Also export precomputed dashboard read models')
+    parser.add_argument('--with-geo', action='store_true',
+                       help='Add geohash/GeoJSON fields to hospitals and jobs (and 2dsphere indexes to the dump)')
+    parser.add_argument('--with-search', action='store_true',
+                       help='Add searchKeywords to jobs and doctors (and their indexes to the dump)')
+    parser.add_argument('--skewed', action='store_true', help='Generate the large skewed dataset')
+    parser.add_argument('--jobs', type=int, default=20000, help='Number of jobs for --skewed (default: 20000)')
+    parser.add_argument('--doctors', type=int, default=2000, help='Number of doctors for --skewed (default: 2000)')
+
+    args = parser.parse_args()
+
+    if not (args.mongodump_dir or args.mongodump_archive):
+        parser.print_help()
+        sys.exit(1)
+
+    if args.skewed:
+        from seed import generate_skewed_seed_data
+        seed_data = generate_skewed_seed_data(num_doctors=args.doctors, num_jobs=args.jobs)
+    else:
+        seed_data = generate_all_seed_data()
+    if args.with_geo:
+        from geo_index import add_geo_fields
+        add_geo_fields(seed_data)
+    if args.with_search:
+        from search_index import add_keyword_fields
+        add_keyword_fields(seed_data)
+    table_mapping = dict(COLLECTION_NAMES)
+    if args.with_read_models:
+        from read_models import add_read_models, READ_MODEL_COLLECTIONS
+        seed_data = add_read_models(seed_data)
+        table_mapping.update(READ_MODEL_COLLECTIONS)
+
+    exports = []
+    if args.mongodump_dir:
+        exports.append(("mongodump directory", args.mongodump_dir,
+                        lambda: write_mongodump_dir(seed_data, args.mongodump_dir, args.database, table_mapping, args.gzip)))
+    if args.mongodump_archive:
+        exports.append(("mongodump archive", args.mongodump_archive,
+                        lambda: write_mongodump_archive(seed_data, args.mongodump_archive, args.database,
+                                                        table_mapping, args.gzip)))
+
+    for label, target, export in exports:
+        started = time.perf_counter()
+        try:
+            summary = export()
+        except OSError as e:
+            print(f"[ERROR] {label} to {target} failed: {e}")
+            sys.exit(1)
+        documents = sum(summary["collections"].values())
+        print(f"[OK] Wrote {label} {target}: {documents} documents in {len(summary['collections'])} collections, "
+              f"{summary['bytes'] / 1024 / 1024:.1f} MB in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,439 @@
+"""
+Domain Event Log
+Rebuilds the ordered status transitions behind the seed data (job posted ->
+applied -> approved -> shift started -> ... -> paid) as an append-only log of
+NDJSON or binary segments, and replays it against a sink at a fixed rate or as
+fast as possible
+"""
+
+from seed import generate_all_seed_data
+from read_models import ReadModels
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, Tuple
+import gzip
+import json
+import os
+import struct
+import time
+import uuid
+
+
+# Event type -> (seed data key, status after the event)
+EVENT_TYPES = {
+    "JobPosted": ("jobs", "Open"),
+    "JobApplied": ("jobs", "Applied"),
+    "JobApproved": ("jobs", "Approved"),
+    "JobTaken": ("jobs", "Taken"),
+    "JobCompleted": ("jobs", "Completed"),
+    "JobCancelled": ("jobs", "Cancelled"),
+    "ApplicationSubmitted": ("applications", "Pending"),
+    "ApplicationApproved": ("applications", "Approved"),
+    "ApplicationRejected": ("applications", "Rejected"),
+    "ShiftScheduled": ("shifts", "Scheduled"),
+    "ShiftStarted": ("shifts", "Started"),
+    "ShiftExitPending": ("shifts", "Exit Pending"),
+    "ShiftCompleted": ("shifts", "Completed"),
+    "PaymentCreated": ("payments", "Pending"),
+    "PaymentProcessing": ("payments", "Processing"),
+    "PaymentPaid": ("payments", "Paid"),
+}
+
+# Events that create their entity; every other event changes the status of an existing one
+CREATED_EVENTS = {"JobPosted", "ApplicationSubmitted", "ShiftScheduled", "PaymentCreated"}
+
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+EVENT_NAMES = list(EVENT_TYPES)
+
+SEGMENT_EXTENSIONS = {("ndjson", None): ".ndjson", ("ndjson", "gzip"): ".ndjson.gz",
+                      ("binary", None): ".bin", ("binary", "gzip"): ".bin.gz"}
+
+# Binary record header: timestamp (µs since epoch), event code, entity UUID, payload length
+_HEADER = struct.Struct("<qB16sI")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _micros(value: str) -> int:
+    delta = datetime.fromisoformat(value.rstrip("Z")) - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _iso(micros: int) -> str:
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat() + "Z"
+
+
+# ============================================================================
+# EVENT DERIVATION
+# ============================================================================
+
+def derive_events(seed_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Ordered event stream that leads to the final state in seed_data
+
+    Created events carry the record as it was first written (initial status,
+    no approval fields); transitions carry only the fields they change, plus
+    updatedAt for entities that have one: the event time, except on each
+    entity's last event, which carries the record's final updatedAt so a replay
+    ends in exactly the seeded rows.
+    Timestamps come from the records' own audit fields and are clamped so each
+    entity's events, and each approval relative to its application, stay in
+    causal order.
+
+    Returns:
+        Events sorted by timestamp: {"seq", "ts", "type", "id", "data"}
+    """
+    shifts_by_job = {s["jobId"]: s for s in seed_data.get("shifts", [])}
+    applications_by_job: Dict[str, List[Dict[str, Any]]] = {}
+    for application in seed_data.get("applications", []):
+        applications_by_job.setdefault(application["jobId"], []).append(application)
+
+    raw: List[Tuple[int, int, str, str, Dict[str, Any]]] = []
+
+    def chain(entity_id: str, steps: List[Tuple[str, Optional[str], Dict[str, Any]]],
+              final_updated_at: Optional[str] = None):
+        """Append an entity's events, keeping its timestamps non-decreasing and stamping updatedAt"""
+        last = None
+        stamp = "updatedAt" in steps[0][2]
+        for order, (event_type, ts, data) in enumerate(steps):
+            micros = _micros(ts) if ts else last
+            if last is not None and micros < last:
+                micros = last
+            last = micros
+            if stamp and event_type not in CREATED_EVENTS:
+                data["updatedAt"] = _iso(micros)
+            raw.append((micros, order, event_type, entity_id, data))
+        if stamp and final_updated_at:
+            # Event times are clamped or inferred; the record's own audit value wins at the end
+            steps[-1][2]["updatedAt"] = final_updated_at
+
+    for job in seed_data.get("jobs", []):
+        status = job["status"]
+        shift = shifts_by_job.get(job["id"])
+        applications = applications_by_job.get(job["id"], [])
+        decided_at = shift["createdAt"] if shift else None
+        if decided_at is None and status == "Cancelled":
+            decided_at = job["startDate"]
+        if decided_at is not None:
+            # A decision cannot precede the applications it decides on
+            applied = [a["appliedAt"] for a in applications if a["status"] != "Pending"]
+            decided_at = max([decided_at] + applied)
+        decided_at = decided_at or job["updatedAt"]
+
+        posted = {**job, "status": "Open", "approvedDoctorId": None, "updatedAt": job["createdAt"]}
+        steps = [("JobPosted", job["createdAt"], posted)]
+        if status == "Cancelled":
+            steps.append(("JobCancelled", decided_at, {"status": "Cancelled"}))
+        elif status != "Open":
+            first_applied = min((a["appliedAt"] for a in applications), default=job["updatedAt"])
+            steps.append(("JobApplied", first_applied, {"status": "Applied"}))
+        if status in ("Approved", "Taken", "Completed"):
+            steps.append(("JobApproved", decided_at, {"status": "Approved", "approvedDoctorId": job["approvedDoctorId"]}))
+        if status in ("Taken", "Completed"):
+            taken_at = (shift or {}).get("actualStartTime") or decided_at
+            steps.append(("JobTaken", taken_at, {"status": "Taken"}))
+        if status == "Completed":
+            steps.append(("JobCompleted", job["updatedAt"], {"status": "Completed"}))
+        chain(job["id"], steps, job.get("updatedAt"))
+
+        for application in applications:
+            submitted = {**application, "status": "Pending"}
+            steps = [("ApplicationSubmitted", application["appliedAt"], submitted)]
+            if application["status"] in ("Approved", "Rejected"):
+                event_type = "ApplicationApproved" if application["status"] == "Approved" else "ApplicationRejected"
+                steps.append((event_type, decided_at or application["appliedAt"], {"status": application["status"]}))
+            chain(application["id"], steps)
+
+    for shift in seed_data.get("shifts", []):
+        status = shift["status"]
+        scheduled = {**shift, "status": "Scheduled", "actualStartTime": None, "actualEndTime": None,
+                     "checkIn": None, "checkOut": None, "proofOfCompletion": None, "updatedAt": shift["createdAt"]}
+        steps = [("ShiftScheduled", shift["createdAt"], scheduled)]
+        if status in ("Started", "Exit Pending", "Completed"):
+            steps.append(("ShiftStarted", shift["actualStartTime"],
+                          {"status": "Started", "actualStartTime": shift["actualStartTime"], "checkIn": shift["checkIn"]}))
+        if status in ("Exit Pending", "Completed"):
+            exit_at = shift.get("actualEndTime") or shift["updatedAt"]
+            steps.append(("ShiftExitPending", exit_at, {"status": "Exit Pending"}))
+        if status == "Completed":
+            steps.append(("ShiftCompleted", max(shift.get("actualEndTime") or "", shift["updatedAt"]),
+                          {"status": "Completed", "actualEndTime": shift["actualEndTime"], "checkOut": shift["checkOut"],
+                           "proofOfCompletion": shift["proofOfCompletion"]}))
+        chain(shift["id"], steps, shift.get("updatedAt"))
+
+    for payment in seed_data.get("payments", []):
+        status = payment["status"]
+        created = {**payment, "status": "Pending", "paidDate": None, "updatedAt": payment["createdAt"]}
+        steps = [("PaymentCreated", payment["createdAt"], created)]
+        if status in ("Processing", "Paid"):
+            processing_at = min(payment["dueDate"], payment.get("paidDate") or payment["updatedAt"])
+            steps.append(("PaymentProcessing", processing_at, {"status": "Processing"}))
+        if status == "Paid":
+            steps.append(("PaymentPaid", payment["paidDate"],
+                          {"status": "Paid", "paidDate": payment["paidDate"]}))
+        chain(payment["id"], steps, payment.get("updatedAt"))
+
+    # Same-timestamp ties keep creation before transitions, then table order (jobs before their applications)
+    raw.sort(key=lambda e: (e[0], e[1], EVENT_CODES[e[2]]))
+    return [
+        {"seq": seq, "ts": _iso(micros), "type": event_type, "id": entity_id, "data": data}
+        for seq, (micros, _, event_type, entity_id, data) in enumerate(raw)
+    ]
+
+
+# ============================================================================
+# SEGMENTS
+# ============================================================================
+
+class EventLogWriter:
+    """
+    Appends events to numbered segment files plus a manifest.json.
+
+    NDJSON segments hold one compact JSON event per line. Binary segments hold
+    a fixed header (timestamp µs, event code, entity UUID, payload length)
+    followed by the compact JSON payload.
+    """
+
+    def __init__(self, directory: str, fmt: str = "ndjson", compression: Optional[str] = None,
+                 segment_events: int = 100000):
+        if (fmt, compression) not in SEGMENT_EXTENSIONS:
+            raise ValueError(f"Unsupported segment format: {fmt} / {compression}")
+        self.directory = directory
+        self.fmt = fmt
+        self.compression = compression
+        self.segment_events = segment_events
+        self.segments: List[Dict[str, Any]] = []
+        self.file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _roll(self):
+        if self.file is not None:
+            self.file.close()
+        name = f"events-{len(self.segments) + 1:06d}{SEGMENT_EXTENSIONS[(self.fmt, self.compression)]}"
+        path = os.path.join(self.directory, name)
+        self.file = gzip.open(path, "wb", compresslevel=6) if self.compression == "gzip" else open(path, "wb")
+        self.segments.append({"file": name, "events": 0, "firstSeq": None, "lastSeq": None,
+                              "firstTs": None, "lastTs": None})
+
+    def _encode(self, event: Dict[str, Any]) -> bytes:
+        payload = json.dumps(event["data"], separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        if self.fmt == "ndjson":
+            return (json.dumps({k: event[k] for k in ("seq", "ts", "type", "id")}, separators=(",", ":"))[:-1]
+                    + ',"data":').encode("utf-8") + payload + b"}\n"
+        header = _HEADER.pack(_micros(event["ts"]), EVENT_CODES[event["type"]], uuid.UUID(event["id"]).bytes,
+                              len(payload))
+        return header + payload
+
+    def write(self, event: Dict[str, Any]):
+        if self.file is None or self.segments[-1]["events"] >= self.segment_events:
+            self._roll()
+        self.file.write(self._encode(event))
+        segment = self.segments[-1]
+        if segment["events"] == 0:
+            segment["firstSeq"], segment["firstTs"] = event["seq"], event["ts"]
+        segment["lastSeq"], segment["lastTs"] = event["seq"], event["ts"]
+        segment["events"] += 1
+
+    def write_all(self, events: Iterable[Dict[str, Any]]) -> "EventLogWriter":
+        for event in events:
+            self.write(event)
+        return self
+
+    def close(self) -> Dict[str, Any]:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        manifest = {"format": self.fmt, "compression": self.compression, "segments": self.segments,
+                    "events": sum(s["events"] for s in self.segments)}
+        with open(os.path.join(self.directory, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+
+def read_events(directory: str) -> Iterator[Dict[str, Any]]:
+    """Stream events back from a log directory, segment by segment"""
+    with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    for segment in manifest["segments"]:
+        path = os.path.join(directory, segment["file"])
+        with (gzip.open(path, "rb") if manifest["compression"] == "gzip" else open(path, "rb")) as f:
+            if manifest["format"] == "ndjson":
+                for line in f:
+                    yield json.loads(line)
+                continue
+            seq = segment["firstSeq"]
+            while True:
+                header = f.read(_HEADER.size)
+                if not header:
+                    break
+                micros, code, entity, length = _HEADER.unpack(header)
+                yield {"seq": seq, "ts": _iso(micros), "type": EVENT_NAMES[code],
+                       "id": str(uuid.UUID(bytes=entity)), "data": json.loads(f.read(length))}
+                seq += 1
+
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+class ReadModelSink:
+    """Applies events to dashboard read models, as the read-model service would"""
+
+    def __init__(self):
+        self.models = ReadModels()
+        self.records: Dict[str, Dict[str, Any]] = {}
+
+    def apply(self, event: Dict[str, Any]):
+        table, new_status = EVENT_TYPES[event["type"]]
+        if event["type"] in CREATED_EVENTS:
+            old_status = None
+            record = self.records[event["id"]] = dict(event["data"])
+        else:
+            record = self.records[event["id"]]
+            old_status = record["status"]
+            record.update(event["data"])
+        self.models.apply_status_change(table, record, old_status, new_status)
+
+
+class SQLiteReplaySink:
+    """
+    Upserts created entities and updates changed fields, committing every
+    `commit_every` events. Tables are created from the first created event's
+    fields when missing, so an empty database file is enough; on an already
+    seeded database (tables keyed by id, as seed_cli.py and seed_sql.py create
+    them) created events overwrite the existing rows, so replays can be repeated.
+    """
+
+    def __init__(self, conn, commit_every: int = 1000):
+        self.conn = conn
+        self.commit_every = commit_every
+        self.pending = 0
+        self.tables: set = set()
+
+    @staticmethod
+    def _value(value: Any) -> Any:
+        if isinstance(value, bool):
+            return int(value)
+        return str(value) if isinstance(value, (list, dict)) else value
+
+    def apply(self, event: Dict[str, Any]):
+        table = EVENT_TYPES[event["type"]][0]
+        data = event["data"]
+        columns = list(data)
+        if event["type"] in CREATED_EVENTS:
+            if table not in self.tables:
+                column_defs = ", ".join(f"{c} PRIMARY KEY" if c == "id" else c for c in columns)
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({column_defs})")
+                self.tables.add(table)
+            updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "id")
+            self.conn.execute(
+                f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" for _ in columns)}) '
+                f'ON CONFLICT (id) DO ' + (f'UPDATE SET {updates}' if updates else 'NOTHING'),
+                [self._value(data[c]) for c in columns],
+            )
+        else:
+            self.conn.execute(
+                f'UPDATE {table} SET {", ".join(c + " = ?" for c in columns)} WHERE id = ?',
+                [self._value(data[c]) for c in columns] + [event["id"]],
+            )
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.conn.commit()
+            self.pending = 0
+
+    def close(self):
+        self.conn.commit()
+
+
+def replay(events: Iterable[Dict[str, Any]], apply: Callable[[Dict[str, Any]], None],
+           rate: Optional[float] = None, window_seconds: float = 1.0) -> Dict[str, Any]:
+    """
+    Apply events in order, paced to `rate` events/sec or as fast as possible
+
+    Pacing is against the schedule start + i / rate, so short stalls are
+    caught up rather than lowering the sustained rate.
+
+    Returns:
+        Summary with events, elapsed seconds, overall events/sec and the
+        min / median / max rate over full windows of window_seconds
+    """
+    started = time.perf_counter()
+    window_start = started
+    window_events = 0
+    window_rates: List[float] = []
+    count = 0
+    for event in events:
+        if rate:
+            due = started + count / rate
+            now = time.perf_counter()
+            if due > now:
+                time.sleep(due - now)
+        apply(event)
+        count += 1
+        window_events += 1
+        if window_events >= 256:
+            now = time.perf_counter()
+            if now - window_start >= window_seconds:
+                window_rates.append(window_events / (now - window_start))
+                window_start, window_events = now, 0
+    elapsed = time.perf_counter() - started
+    window_rates.sort()
+    return {
+        "events": count,
+        "seconds": elapsed,
+        "eventsPerSecond": count / max(elapsed, 1e-9),
+        "windowMin": window_rates[0] if window_rates else None,
+        "windowMedian": window_rates[len(window_rates) // 2] if window_rates else None,
+        "windowMax": window_rates[-1] if window_rates else None,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from seed import generate_skewed_seed_data
+
+    parser = argparse.ArgumentParser(description='Write the seed data as an event log and replay it')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Use a skewed dataset with this many jobs (default: small seed data)')
+    parser.add_argument('--log-dir', type=str, default='event_log', help='Event log directory (default: event_log)')
+    parser.add_argument('--format', type=str, choices=['ndjson', 'binary'], default='ndjson',
+                       help='Segment format (default: ndjson)')
+    parser.add_argument('--compress', action='store_true', help='gzip the segments')
+    parser.add_argument('--segment-events', type=int, default=100000, help='Events per segment (default: 100000)')
+    parser.add_argument('--replay', type=str, choices=['read-models', 'sqlite', 'none'], default='read-models',
+                       help='Replay target (default: read-models)')
+    parser.add_argument('--sqlite', type=str,
+                       help='SQLite database for --replay sqlite: empty (tables are created) or seeded with tables '
+                            'keyed by id (created entities are upserted)')
+    parser.add_argument('--rate', type=float, help='Target events/sec (default: as fast as possible)')
+
+    args = parser.parse_args()
+    if args.replay == "sqlite" and not args.sqlite:
+        print("[ERROR] --replay sqlite requires --sqlite")
+        sys.exit(1)
+
+    seed_data = generate_skewed_seed_data(num_jobs=args.jobs) if args.jobs else generate_all_seed_data()
+    started = time.perf_counter()
+    events = derive_events(seed_data)
+    writer = EventLogWriter(args.log_dir, args.format, "gzip" if args.compress else None, args.segment_events)
+    manifest = writer.write_all(events).close()
+    size = sum(os.path.getsize(os.path.join(args.log_dir, s["file"])) for s in manifest["segments"])
+    print(f"[OK] Wrote {manifest['events']} events in {len(manifest['segments'])} segment(s), "
+          f"{size / 1024 / 1024:.1f} MB, in {time.perf_counter() - started:.2f}s")
+
+    if args.replay == "none":
+        sys.exit(0)
+    if args.replay == "sqlite":
+        import sqlite3
+        sink = SQLiteReplaySink(sqlite3.connect(args.sqlite))
+    else:
+        sink = ReadModelSink()
+
+    summary = replay(read_events(args.log_dir), sink.apply, args.rate)
+    if hasattr(sink, "close"):
+        sink.close()
+    print(f"[OK] Replayed {summary['events']} events in {summary['seconds']:.2f}s "
+          f"({summary['eventsPerSecond']:.0f} events/s sustained)")
+    if summary["windowMedian"] is not None:
+        print(f"  Per-second rate: min {summary['windowMin']:.0f}, median {summary['windowMedian']:.0f}, "
+              f"max {summary['windowMax']:.0f}")
@@ -0,0 +1,270 @@
+"""
+Notification Fan-Out
+Resolves the doctor audience of published jobs from publishTo, specificDoctors
+and hr_doctor_pool, and streams notification rows in batches through backend
+bulk writes with bounded concurrency, reporting per-job fan-out latency
+"""
+
+from seed import generate_all_seed_data, get_current_timestamp
+from sinks import NullSink, SQLiteSink, NDJSONSink, MongoSink
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence, Tuple
+import threading
+import time
+import uuid
+
+
+# ============================================================================
+# AUDIENCES
+# ============================================================================
+
+class AudienceIndex:
+    """
+    Precomputed membership lists of doctor user IDs.
+
+    Built once per dataset: every doctor, each HR user's pool and the
+    doctor -> user mapping, so resolving a job's audience is a lookup rather
+    than a scan of doctors or hr_doctor_pool.
+    """
+
+    def __init__(self, doctors: List[Dict[str, Any]], pool_entries: List[Dict[str, Any]]):
+        self.user_by_doctor: Dict[str, str] = {d["id"]: d["userId"] for d in doctors}
+        self.all_doctors: Tuple[str, ...] = tuple(self.user_by_doctor.values())
+        pools: Dict[str, Dict[str, bool]] = {}
+        for entry in pool_entries:
+            user_id = self.user_by_doctor.get(entry["doctorId"])
+            if user_id is not None:
+                pools.setdefault(entry["hrId"], {})[user_id] = True
+        self.pool_by_hr: Dict[str, Tuple[str, ...]] = {hr_id: tuple(users) for hr_id, users in pools.items()}
+
+    @classmethod
+    def from_seed_data(cls, seed_data: Dict[str, List[Dict[str, Any]]]) -> "AudienceIndex":
+        return cls(seed_data.get("doctors", []), seed_data.get("hr_doctor_pool", []))
+
+    def audience(self, job: Dict[str, Any]) -> Sequence[str]:
+        """User IDs of the doctors a job is published to"""
+        publish_to = job.get("publishTo") or "all"
+        if publish_to == "pool":
+            return self.pool_by_hr.get(job.get("createdBy"), ())
+        if publish_to == "specific":
+            user_ids = (self.user_by_doctor.get(d) for d in job.get("specificDoctors") or [])
+            return tuple(dict.fromkeys(u for u in user_ids if u is not None))
+        return self.all_doctors
+
+
+def job_notifications(job: Dict[str, Any], user_ids: Iterable[str],
+                      timestamp: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Notification rows announcing a job, one per audience member"""
+    timestamp = timestamp or get_current_timestamp()
+    title = "Urgent Job Posted" if job.get("urgent") else "New Job Posted"
+    message = f"{job['role']} at {job['hospitalName']} on {job['startDate'][:10]}."
+    action_url = f"/jobs/{job['id']}"
+    for user_id in user_ids:
+        yield {
+            "id": str(uuid.uuid4()),
+            "userId": user_id,
+            "type": "job",
+            "title": title,
+            "message": message,
+            "timestamp": timestamp,
+            "read": False,
+            "actionUrl": action_url,
+            "relatedEntityId": job["id"],
+            "relatedEntityType": "job",
+        }
+
+
+def notification_batches(jobs: Iterable[Dict[str, Any]], index: AudienceIndex,
+                         batch_size: int = 500) -> Iterator[Tuple[List[Dict[str, Any]], List[str]]]:
+    """
+    Stream (batch, finished_job_ids) pairs
+
+    Batches are filled across job boundaries; finished_job_ids lists the jobs
+    whose last notification is in the batch. Only one batch is held at a time.
+    """
+    batch: List[Dict[str, Any]] = []
+    finished: List[str] = []
+    for job in jobs:
+        for notification in job_notifications(job, index.audience(job)):
+            batch.append(notification)
+            if len(batch) >= batch_size:
+                yield batch, finished
+                batch, finished = [], []
+        finished.append(job["id"])
+    if batch or finished:
+        yield batch, finished
+
+
+def fanout_records(seed_data: Dict[str, List[Dict[str, Any]]],
+                   statuses: Sequence[str] = ("Open",)) -> List[Dict[str, Any]]:
+    """All job-posted notifications for jobs in the given statuses, for seeding"""
+    index = AudienceIndex.from_seed_data(seed_data)
+    jobs = [job for job in seed_data.get("jobs", []) if job.get("status") in statuses]
+    return [n for batch, _ in notification_batches(jobs, index) for n in batch]
+
+
+# ============================================================================
+# FAN-OUT
+# ============================================================================
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def fan_out(jobs: Iterable[Dict[str, Any]], index: AudienceIndex, sink, batch_size: int = 500,
+            workers: int = 4, max_in_flight: Optional[int] = None, table: str = "notifications") -> Dict[str, Any]:
+    """
+    Publish jobs: write one notification per audience member through a sink
+
+    Batches are generated lazily and handed to `workers` writer threads; at
+    most `max_in_flight` batches (default 2 x workers) are queued or being
+    written, so memory stays bounded however large the audiences are.
+
+    Args:
+        jobs: Jobs being published
+        index: AudienceIndex for the dataset
+        sink: A sinks.py sink (write(table, records) / close(), safe across threads)
+        batch_size: Notifications per bulk write
+        workers: Concurrent writers
+        max_in_flight: Bound on outstanding batches
+        table: Table / collection the notifications are written to
+
+    Returns:
+        Summary with notifications, batches, elapsed seconds, throughput and
+        per-job latency percentiles (publish start to last write acknowledged)
+    """
+    slots = threading.BoundedSemaphore(max_in_flight or 2 * workers)
+    lock = threading.Lock()
+    job_started: Dict[str, float] = {}
+    pending_batches: Dict[str, int] = {}
+    finished_jobs: set = set()
+    latencies: List[float] = []
+    errors: List[BaseException] = []
+    totals = {"notifications": 0, "batches": 0}
+
+    def complete(job_ids: Iterable[str], now: float):
+        for job_id in job_ids:
+            if pending_batches.get(job_id, 0) == 0 and job_id in finished_jobs:
+                latencies.append(now - job_started.pop(job_id))
+                finished_jobs.discard(job_id)
+                pending_batches.pop(job_id, None)
+
+    def write(batch: List[Dict[str, Any]], job_ids: List[str]):
+        try:
+            sink.write(table, batch)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            now = time.perf_counter()
+            with lock:
+                for job_id in job_ids:
+                    pending_batches[job_id] -= 1
+                complete(job_ids, now)
+            slots.release()
+
+    def tracked_jobs() -> Iterator[Dict[str, Any]]:
+        for job in jobs:
+            with lock:
+                job_started[job["id"]] = time.perf_counter()
+                pending_batches[job["id"]] = 0
+            yield job
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch, finished in notification_batches(tracked_jobs(), index, batch_size):
+            if errors:
+                break
+            job_ids = list(dict.fromkeys(n["relatedEntityId"] for n in batch))
+            if batch:
+                slots.acquire()
+            with lock:
+                # Count this batch against its jobs before marking any of them finished
+                for job_id in job_ids:
+                    pending_batches[job_id] += 1
+                finished_jobs.update(finished)
+                complete(finished, time.perf_counter())
+            if batch:
+                totals["notifications"] += len(batch)
+                totals["batches"] += 1
+                pool.submit(write, batch, job_ids)
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+
+    latencies.sort()
+    return {
+        "jobs": len(latencies),
+        "notifications": totals["notifications"],
+        "batches": totals["batches"],
+        "seconds": elapsed,
+        "notificationsPerSecond": totals["notifications"] / max(elapsed, 1e-9),
+        "latencyP50": _percentile(latencies, 0.50),
+        "latencyP95": _percentile(latencies, 0.95),
+        "latencyP99": _percentile(latencies, 0.99),
+        "latencyMax": latencies[-1] if latencies else 0.0,
+    }
+
+
+def publish_storm(seed_data: Dict[str, List[Dict[str, Any]]], num_jobs: int = 10) -> List[Dict[str, Any]]:
+    """Worst case: copies of the first jobs as urgent, published to all doctors"""
+    return [
+        {**job, "id": str(uuid.uuid4()), "urgent": True, "publishTo": "all", "specificDoctors": None}
+        for job in seed_data.get("jobs", [])[:num_jobs]
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from seed import generate_skewed_seed_data
+
+    parser = argparse.ArgumentParser(description='Fan out job-posted notifications to eligible doctors')
+    parser.add_argument('--doctors', type=int, default=0,
+                       help='Use a skewed dataset with this many doctors (default: small seed data)')
+    parser.add_argument('--storm', type=int, default=0,
+                       help='Publish this many urgent jobs to all doctors instead of the open jobs')
+    parser.add_argument('--sqlite', type=str, help='Write to this SQLite database')
+    parser.add_argument('--ndjson-dir', type=str, help='Append to notifications.ndjson in this directory')
+    parser.add_argument('--mongodb', type=str, help='MongoDB connection string (use with --database)')
+    parser.add_argument('--database', type=str, help='MongoDB database name')
+    parser.add_argument('--batch-size', type=int, default=500, help='Notifications per bulk write (default: 500)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent writers (default: 4)')
+
+    args = parser.parse_args()
+
+    if args.doctors:
+        seed_data = generate_skewed_seed_data(num_doctors=args.doctors, num_jobs=max(1000, args.storm))
+    else:
+        seed_data = generate_all_seed_data()
+    index = AudienceIndex.from_seed_data(seed_data)
+    if args.storm:
+        jobs = publish_storm(seed_data, args.storm)
+    else:
+        jobs = [job for job in seed_data["jobs"] if job["status"] == "Open"]
+
+    if args.sqlite:
+        sink = SQLiteSink(args.sqlite, wal=True)
+    elif args.ndjson_dir:
+        sink = NDJSONSink(args.ndjson_dir, append=True)
+    elif args.mongodb:
+        sink = MongoSink(args.mongodb, args.database or "drlocum")
+    else:
+        sink = NullSink()
+
+    try:
+        summary = fan_out(jobs, index, sink, args.batch_size, args.workers)
+    except Exception as e:
+        print(f"[ERROR] Fan-out failed: {e}")
+        sys.exit(1)
+    finally:
+        sink.close()
+
+    print("\n" + "="*60)
+    print(f"[OK] {summary['notifications']} notifications for {summary['jobs']} jobs "
+          f"in {summary['batches']} batches, {summary['seconds']:.2f}s "
+          f"({summary['notificationsPerSecond']:.0f}/s)")
+    print(f"  Fan-out latency p50 {summary['latencyP50'] * 1000:.1f} ms, p95 {summary['latencyP95'] * 1000:.1f} ms, "
+          f"p99 {summary['latencyP99'] * 1000:.1f} ms, max {summary['latencyMax'] * 1000:.1f} ms")
+    print("="*60)
@@ -0,0 +1,304 @@
+"""
+Geospatial Index
+Derives geohash / GeoJSON fields for jobs from their hospital coordinates and
+serves radius and k-nearest job searches from a uniform grid index
+"""
+
+from seed import generate_all_seed_data
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+import heapq
+import math
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+
+# Most geohash cells a radius query may expand to before falling back to a coarser precision
+GEOHASH_MAX_QUERY_CELLS = 16
+
+# MongoDB indexes for $near / $geoWithin on the GeoJSON field and geohash range scans
+MONGO_GEO_INDEXES = {
+    "jobs": [[("geo", "2dsphere")], [("status", 1), ("geohash", 1)]],
+    "hospitals": [[("geo", "2dsphere")]],
+}
+
+
+# ============================================================================
+# GEOHASH AND DISTANCE
+# ============================================================================
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode a coordinate as a base32 geohash"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits <<= 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in km"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(0.01, math.cos(math.radians(latitude)))
+    d_lng = min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return (max(-90.0, latitude - d_lat), min(90.0, latitude + d_lat),
+            max(-180.0, longitude - d_lng), min(180.0, longitude + d_lng))
+
+
+def geohash_cell_degrees(precision: int) -> Tuple[float, float]:
+    """(height, width) in degrees of a geohash cell; longitude takes the odd bit"""
+    bits = 5 * precision
+    return 180.0 / (1 << (bits // 2)), 360.0 / (1 << ((bits + 1) // 2))
+
+
+def _longitude_spans(longitude: float, d_lng: float) -> List[Tuple[float, float]]:
+    """Longitude intervals of a box, split in two where it crosses the antimeridian"""
+    if d_lng >= 180.0:
+        return [(-180.0, 180.0)]
+    low, high = longitude - d_lng, longitude + d_lng
+    if low < -180.0:
+        return [(low + 360.0, 180.0), (-180.0, high)]
+    if high > 180.0:
+        return [(low, 180.0), (-180.0, high - 360.0)]
+    return [(low, high)]
+
+
+def geohash_query_bounds(latitude: float, longitude: float, radius_km: float,
+                         max_cells: int = GEOHASH_MAX_QUERY_CELLS) -> List[Tuple[str, str]]:
+    """
+    Geohash [start, end] ranges covering a circle, for Firestore / Mongo range queries.
+
+    Picks the finest precision whose cells cover the circle's bounding box in at
+    most max_cells cells, then walks the box cell by cell. Boxes crossing the
+    antimeridian are split, and boxes reaching a pole span every longitude.
+
+    Run one query per range, e.g. where status == "Open" and orderBy("geohash")
+    .startAt(start).endAt(end), then drop results outside the radius.
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = max(-90.0, latitude - d_lat), min(90.0, latitude + d_lat)
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        spans = [(-180.0, 180.0)]
+    else:
+        # Widest point of the circle is at the box edge nearest a pole
+        cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+        spans = _longitude_spans(longitude, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+
+    def cell_ranges(precision: int) -> Tuple[range, List[range]]:
+        height, width = geohash_cell_degrees(precision)
+        last_row, last_col = int(round(180.0 / height)) - 1, int(round(360.0 / width)) - 1
+        rows = range(int((min_lat + 90.0) // height), min(last_row, int((max_lat + 90.0) // height)) + 1)
+        cols = [range(int((low + 180.0) // width), min(last_col, int((high + 180.0) // width)) + 1)
+                for low, high in spans]
+        return rows, cols
+
+    precision = 1
+    for p in range(GEOHASH_PRECISION, 0, -1):
+        rows, cols = cell_ranges(p)
+        if len(rows) * sum(len(c) for c in cols) <= max_cells:
+            precision = p
+            break
+    rows, cols = cell_ranges(precision)
+    height, width = geohash_cell_degrees(precision)
+
+    # Encode each cell's centre so float edges never land in the neighbouring cell
+    hashes = {
+        encode_geohash(-90.0 + (row + 0.5) * height, -180.0 + (col + 0.5) * width, precision)
+        for row in rows
+        for col_range in cols
+        for col in col_range
+    }
+    return [(h, h + "~") for h in sorted(hashes)]
+
+
+def geo_fields(latitude: float, longitude: float) -> Dict[str, Any]:
+    """Fields for geohash range queries (Firestore/Mongo), 2dsphere (Mongo) and R-tree (SQL) indexes"""
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "geohash": encode_geohash(latitude, longitude),
+        "geo": {"type": "Point", "coordinates": [longitude, latitude]},
+    }
+
+
+def add_geo_fields(seed_data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Add geo fields to every hospital and to every job from its hospital (in place)"""
+    hospitals_by_id = {}
+    for hospital in seed_data.get("hospitals", []):
+        if hospital.get("latitude") is None or hospital.get("longitude") is None:
+            continue
+        hospital.update(geo_fields(hospital["latitude"], hospital["longitude"]))
+        hospitals_by_id[hospital["id"]] = hospital
+
+    for job in seed_data.get("jobs", []):
+        hospital = hospitals_by_id.get(job["hospitalId"])
+        if hospital is not None:
+            job.update(geo_fields(hospital["latitude"], hospital["longitude"]))
+    return seed_data
+
+
+# ============================================================================
+# GRID INDEX
+# ============================================================================
+
+class GridIndex:
+    """
+    Uniform latitude/longitude grid of point records.
+
+    Queries only visit the cells overlapping the search area, so cost depends
+    on local density rather than on the total number of records.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]], cell_degrees: float = 0.05):
+        self.cell_degrees = cell_degrees
+        self.cells: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+        self.size = 0
+        for record in records:
+            self.add(record)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (int(math.floor(latitude / self.cell_degrees)), int(math.floor(longitude / self.cell_degrees)))
+
+    def add(self, record: Dict[str, Any]):
+        if record.get("latitude") is None or record.get("longitude") is None:
+            return
+        self.cells.setdefault(self._cell(record["latitude"], record["longitude"]), []).append(record)
+        self.size += 1
+
+    def remove(self, record: Dict[str, Any]):
+        cell = self.cells.get(self._cell(record["latitude"], record["longitude"]))
+        if cell is None:
+            return
+        for i, candidate in enumerate(cell):
+            if candidate["id"] == record["id"]:
+                del cell[i]
+                self.size -= 1
+                return
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float,
+                      status: Optional[str] = "Open") -> List[Tuple[float, Dict[str, Any]]]:
+        """Records within radius_km, nearest first, as (distance_km, record) pairs"""
+        min_lat, max_lat, min_lng, max_lng = _bounding_box(latitude, longitude, radius_km)
+        row_min, col_min = self._cell(min_lat, min_lng)
+        row_max, col_max = self._cell(max_lat, max_lng)
+
+        results = []
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                for record in self.cells.get((row, col), ()):
+                    if status is not None and record.get("status") != status:
+                        continue
+                    distance = haversine_km(latitude, longitude, record["latitude"], record["longitude"])
+                    if distance <= radius_km:
+                        results.append((distance, record))
+        results.sort(key=lambda pair: pair[0])
+        return results
+
+    def nearest(self, latitude: float, longitude: float, k: int = 10, status: Optional[str] = "Open",
+                max_radius_km: float = 500.0) -> List[Tuple[float, Dict[str, Any]]]:
+        """k nearest records, searching outward ring by ring until the k-th distance is settled"""
+        center_row, center_col = self._cell(latitude, longitude)
+        cell_km = math.radians(self.cell_degrees) * EARTH_RADIUS_KM
+        cell_km_lng = cell_km * max(0.01, math.cos(math.radians(latitude)))
+        max_ring = int(max_radius_km / min(cell_km, cell_km_lng)) + 1
+
+        heap: List[Tuple[float, str, Dict[str, Any]]] = []  # max-heap via negated distance
+        for ring in range(max_ring + 1):
+            for row in range(center_row - ring, center_row + ring + 1):
+                on_edge_row = row in (center_row - ring, center_row + ring)
+                step = 1 if on_edge_row else 2 * ring
+                for col in range(center_col - ring, center_col + ring + 1, max(1, step)):
+                    for record in self.cells.get((row, col), ()):
+                        if status is not None and record.get("status") != status:
+                            continue
+                        distance = haversine_km(latitude, longitude, record["latitude"], record["longitude"])
+                        if distance > max_radius_km:
+                            continue
+                        item = (-distance, record["id"], record)
+                        if len(heap) < k:
+                            heapq.heappush(heap, item)
+                        elif distance < -heap[0][0]:
+                            heapq.heapreplace(heap, item)
+            # Anything in a further ring is at least ring * cell size away
+            if len(heap) == k and -heap[0][0] <= ring * min(cell_km, cell_km_lng):
+                break
+
+        return sorted(((-d, record) for d, _, record in heap), key=lambda pair: pair[0])
+
+
+def create_mongo_geo_indexes(db):
+    """Create the 2dsphere and status + geohash indexes on a pymongo database"""
+    for collection_name, indexes in MONGO_GEO_INDEXES.items():
+        for keys in indexes:
+            db[collection_name].create_index(keys)
+
+
+def build_job_index(seed_data: Dict[str, List[Dict[str, Any]]], cell_degrees: float = 0.05) -> GridIndex:
+    """Add geo fields to the seed data and index every job by location"""
+    add_geo_fields(seed_data)
+    return GridIndex(seed_data.get("jobs", []), cell_degrees)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Find open jobs near a location')
+    parser.add_argument('--lat', type=float, default=40.7306, help='Latitude (default: 40.7306)')
+    parser.add_argument('--lng', type=float, default=-73.9866, help='Longitude (default: -73.9866)')
+    parser.add_argument('--radius', type=float, default=5.0, help='Search radius in km (default: 5)')
+    parser.add_argument('-k', type=int, default=5, help='Number of nearest jobs (default: 5)')
+
+    args = parser.parse_args()
+
+    seed_data = generate_all_seed_data()
+    index = build_job_index(seed_data)
+
+    print("\n" + "="*50)
+    print(f"Open jobs within {args.radius} km of ({args.lat}, {args.lng})")
+    print("="*50)
+    for distance, job in index.within_radius(args.lat, args.lng, args.radius):
+        print(f"{distance:6.2f} km  {job['role']} at {job['hospitalName']}")
+
+    print(f"\nNearest {args.k} open jobs:")
+    for distance, job in index.nearest(args.lat, args.lng, args.k):
+        print(f"{distance:6.2f} km  {job['role']} at {job['hospitalName']}")
+
+    print("\nGeohash ranges for Firestore:")
+    for start, end in geohash_query_bounds(args.lat, args.lng, args.radius):
+        print(f"  {start} .. {end}")
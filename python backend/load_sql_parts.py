@@ -0,0 +1,146 @@
+"""
+Parallel SQL Part Loader
+Imports the part files written by `seed_sql.py --parts-dir` stage by stage,
+loading the parts of each stage over a pool of parallel connections
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional
+import gzip
+import json
+import os
+import shlex
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def open_part_reader(path: str, compression: Optional[str] = None):
+    """Open a part file as a binary stream, decompressing on the fly"""
+    if compression is None:
+        return open(path, "rb")
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise Exception("zstd parts require the zstandard package (pip install zstandard)")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def cli_loader(command: List[str]) -> Callable[[str, Optional[str]], None]:
+    """Loader that streams each part into a client CLI (psql / mysql), one process per connection"""
+    def load(path: str, compression: Optional[str]):
+        # stderr goes to a temp file: an undrained pipe would block the client
+        # once it fills, while we are still blocked writing its stdin
+        with open_part_reader(path, compression) as reader, tempfile.TemporaryFile() as errors:
+            proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=errors)
+            try:
+                shutil.copyfileobj(reader, proc.stdin, 1024 * 1024)
+            except BrokenPipeError:
+                pass  # client exited early; its exit code and stderr say why
+            finally:
+                try:
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+            returncode = proc.wait()
+            errors.seek(0)
+            stderr = errors.read().decode("utf-8", errors="replace")
+        if returncode != 0:
+            raise Exception(f"{command[0]} failed on {os.path.basename(path)}: {stderr.strip()}")
+    return load
+
+
+def postgres_loader(dsn: str) -> Callable[[str, Optional[str]], None]:
+    return cli_loader(["psql", dsn, "-q", "-v", "ON_ERROR_STOP=1", "-f", "-"])
+
+
+def mysql_loader(mysql_args: str) -> Callable[[str, Optional[str]], None]:
+    return cli_loader(["mysql"] + shlex.split(mysql_args))
+
+
+def sqlite_loader(db_path: str) -> Callable[[str, Optional[str]], None]:
+    """Loader for SQLite; SQLite has a single writer, so use it with --workers 1"""
+    def load(path: str, compression: Optional[str]):
+        with open_part_reader(path, compression) as reader:
+            sql = reader.read().decode("utf-8")
+        conn = sqlite3.connect(db_path, timeout=60)
+        try:
+            conn.executescript(sql)
+        finally:
+            conn.close()
+    return load
+
+
+def load_sql_parts(parts_dir: str, load_part: Callable[[str, Optional[str]], None], workers: int = 4) -> Dict[str, Any]:
+    """
+    Import all parts listed in manifest.json
+
+    Stages run in order (foreign keys); the parts within a stage run on up to
+    `workers` parallel connections.
+
+    Returns:
+        Summary with total rows, elapsed seconds and per-stage timings
+    """
+    with open(os.path.join(parts_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    compression = manifest.get("compression")
+
+    total_rows = 0
+    stage_timings = []
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for stage_number, stage in enumerate(manifest["stages"], start=1):
+            parts = [part for table in stage for part in table["parts"]]
+            rows = sum(part["rows"] for part in parts)
+            stage_started = time.perf_counter()
+            futures = [pool.submit(load_part, os.path.join(parts_dir, part["file"]), compression) for part in parts]
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - stage_started
+            tables = ", ".join(table["table"] for table in stage)
+            print(f"[OK] Stage {stage_number}: {rows} rows from {len(parts)} parts in {elapsed:.2f}s ({tables})")
+            total_rows += rows
+            stage_timings.append({"stage": stage_number, "rows": rows, "parts": len(parts), "seconds": elapsed})
+
+    elapsed = time.perf_counter() - started
+    print(f"\nImported {total_rows} rows in {elapsed:.2f}s ({total_rows / max(elapsed, 1e-9):.0f} rows/s)")
+    return {"rows": total_rows, "seconds": elapsed, "stages": stage_timings}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Import SQL part files in parallel')
+    parser.add_argument('parts_dir', type=str, help='Directory containing manifest.json and part files')
+    parser.add_argument('--postgres', type=str, help='PostgreSQL connection string for psql')
+    parser.add_argument('--mysql', type=str, help='Arguments for the mysql client, e.g. "-u user -pPASS dbname"')
+    parser.add_argument('--sqlite', type=str, help='Path to SQLite database file')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4,
+                       help='Parallel connections per stage (default: CPU count)')
+
+    args = parser.parse_args()
+
+    if args.postgres:
+        loader = postgres_loader(args.postgres)
+    elif args.mysql:
+        loader = mysql_loader(args.mysql)
+    elif args.sqlite:
+        loader = sqlite_loader(args.sqlite)
+        args.workers = 1
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+    try:
+        load_sql_parts(args.parts_dir, loader, args.workers)
+    except Exception as e:
+        print(f"[ERROR] Error importing SQL parts: {e}")
+        sys.exit(1)
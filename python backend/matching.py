@@ -0,0 +1,454 @@
+"""
+Doctor-Job Matching Engine
+Encodes doctors and open jobs as NumPy feature arrays and scores all pairs in
+batches to precompute "best jobs for this doctor" and "best doctors for this job"
+"""
+
+from seed import generate_all_seed_data, get_current_timestamp
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import os
+import threading
+import time
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Score weights; pairs that fail publishTo eligibility are never recommended
+DEFAULT_WEIGHTS = {
+    "specialty": 3.0,     # job specialty == doctor specialty
+    "skill": 1.0,         # job specialty listed in doctor skills
+    "qualification": 2.0,  # fraction of job requirements the doctor holds
+    "distance": 2.0,      # exp(-distance / distance_scale_km)
+    "rating": 1.0,        # doctor rating / 5
+    "pool": 1.5,          # doctor is in the posting HR's pool
+}
+
+
+class EncodedDoctors:
+    """
+    Column arrays for doctors (one row per doctor).
+
+    Categorical features (specialty, skills, qualifications) are reduced to a
+    profile code; the profile_* arrays hold the features of each distinct profile.
+    Skill and qualification sets are bitmasks of shape (profiles, words) uint64,
+    so vocabularies of any size fit.
+    """
+
+    def __init__(self, ids, profile, profile_specialty, profile_skill_mask, profile_qual_mask, rating, xyz, row_of):
+        self.ids = ids
+        self.profile = profile
+        self.profile_specialty = profile_specialty
+        self.profile_skill_mask = profile_skill_mask
+        self.profile_qual_mask = profile_qual_mask
+        self.rating = rating
+        self.xyz = xyz
+        self.row_of = row_of
+
+
+class EncodedJobs:
+    """
+    Column arrays for open jobs (one row per job), with profiles as for doctors.
+
+    publishTo == "specific" lists are flattened into parallel specific_jobs /
+    specific_doctors arrays (job row, doctor row), sorted by job row.
+    """
+
+    def __init__(self, ids, profile, profile_specialty, profile_req_mask, hr, publish, specific_jobs,
+                 specific_doctors, xyz):
+        self.ids = ids
+        self.profile = profile
+        self.profile_specialty = profile_specialty
+        self.profile_req_mask = profile_req_mask
+        self.hr = hr
+        self.publish = publish
+        self.specific_jobs = specific_jobs
+        self.specific_doctors = specific_doctors
+        self.xyz = xyz
+
+
+PUBLISH_ALL, PUBLISH_POOL, PUBLISH_SPECIFIC = 0, 1, 2
+_PUBLISH_CODES = {"all": PUBLISH_ALL, "pool": PUBLISH_POOL, "specific": PUBLISH_SPECIFIC}
+
+# popcount of every byte, for qualification coverage
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Lat/lng in degrees to float64 3D unit vectors; great-circle distance then
+    comes from a dot product (float32 would round 2 - 2*dot to ~2 km steps)
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lng = np.radians(np.asarray(longitudes, dtype=np.float64))
+    return np.stack([np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)], axis=1)
+
+
+def pair_distances_km(a_xyz: np.ndarray, b_xyz: np.ndarray) -> np.ndarray:
+    """Great-circle distances (rows of a x rows of b) between unit vectors from _unit_vectors"""
+    # Squared chord |a - b|^2 = 2 - 2 a.b, then arc = 2R asin(chord / 2); float64 keeps this within ~0.1 m
+    distance = a_xyz @ b_xyz.T
+    np.multiply(distance, -2.0, out=distance)
+    np.add(distance, 2.0, out=distance)
+    np.maximum(distance, 0.0, out=distance)
+    np.sqrt(distance, out=distance)
+    np.multiply(distance, 0.5, out=distance)
+    np.minimum(distance, 1.0, out=distance)
+    np.arcsin(distance, out=distance)
+    np.multiply(distance, 2.0 * EARTH_RADIUS_KM, out=distance)
+    return distance
+
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    """Set bits per mask, summed over the trailing uint64 word axis"""
+    masks = np.ascontiguousarray(masks, dtype=np.uint64)
+    return _POPCOUNT8[masks.view(np.uint8)].reshape(masks.shape[:-1] + (-1,)).sum(axis=-1, dtype=np.int32)
+
+
+def _mask_words(masks: List[int], bits: int) -> np.ndarray:
+    """Python int bitmasks as a (len(masks), words) uint64 array"""
+    words = max(1, -(-bits // 64))
+    return np.array([[(mask >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(words)] for mask in masks],
+                    dtype=np.uint64).reshape(len(masks), words)
+
+
+class _Vocabulary:
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        if value not in self.codes:
+            self.codes[value] = len(self.codes)
+        return self.codes[value]
+
+    def mask(self, values: Optional[List[str]]) -> int:
+        mask = 0
+        for value in values or []:
+            mask |= 1 << self.code(value)
+        return mask
+
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+
+def encode(seed_data: Dict[str, List[Dict[str, Any]]],
+           doctor_locations: Optional[Dict[str, Tuple[float, float]]] = None) -> Tuple[EncodedDoctors, EncodedJobs, np.ndarray]:
+    """
+    Encode doctors, open jobs and HR pools as arrays
+
+    Doctors carry a city name but no coordinates, so unless doctor_locations is
+    given, a doctor's home is the mean position of the hospitals they applied
+    to, falling back to the centroid of all hospitals.
+
+    Returns:
+        (doctors, jobs, pool_membership) where pool_membership[doctor_row, hr_code] is True
+        when the doctor is in that HR's pool
+    """
+    specialties = _Vocabulary()
+    qualifications = _Vocabulary()
+    hr_codes = _Vocabulary()
+
+    hospitals = {h["id"]: h for h in seed_data.get("hospitals", [])}
+    if hospitals:
+        center = (float(np.mean([h["latitude"] for h in hospitals.values()])),
+                  float(np.mean([h["longitude"] for h in hospitals.values()])))
+    else:
+        center = (0.0, 0.0)
+    jobs_by_id = {j["id"]: j for j in seed_data.get("jobs", [])}
+
+    if doctor_locations is None:
+        sums: Dict[str, List[float]] = {}
+        for application in seed_data.get("applications", []):
+            job = jobs_by_id.get(application["jobId"])
+            hospital = hospitals.get(job["hospitalId"]) if job else None
+            if hospital is None:
+                continue
+            acc = sums.setdefault(application["doctorId"], [0.0, 0.0, 0])
+            acc[0] += hospital["latitude"]
+            acc[1] += hospital["longitude"]
+            acc[2] += 1
+        doctor_locations = {doctor_id: (acc[0] / acc[2], acc[1] / acc[2]) for doctor_id, acc in sums.items()}
+
+    doctors = seed_data.get("doctors", [])
+    n = len(doctors)
+    doctor_ids = [d["id"] for d in doctors]
+    d_specialty = np.empty(n, dtype=np.int32)
+    d_qual: List[int] = []
+    d_rating = np.empty(n, dtype=np.float32)
+    d_lat = np.empty(n, dtype=np.float64)
+    d_lng = np.empty(n, dtype=np.float64)
+    for i, doctor in enumerate(doctors):
+        d_specialty[i] = specialties.code(doctor.get("specialty"))
+        d_qual.append(qualifications.mask(doctor.get("qualifications")))
+        d_rating[i] = doctor.get("rating") or 0.0
+        d_lat[i], d_lng[i] = doctor_locations.get(doctor["id"], center)
+
+    open_jobs = [j for j in seed_data.get("jobs", []) if j.get("status") == "Open" and j["hospitalId"] in hospitals]
+    m = len(open_jobs)
+    row_of = {doctor_id: i for i, doctor_id in enumerate(doctor_ids)}
+    j_specialty = np.empty(m, dtype=np.int32)
+    j_req: List[int] = []
+    j_hr = np.empty(m, dtype=np.int32)
+    j_publish = np.empty(m, dtype=np.int8)
+    j_lat = np.empty(m, dtype=np.float64)
+    j_lng = np.empty(m, dtype=np.float64)
+    specific_jobs: List[int] = []
+    specific_doctors: List[int] = []
+    for i, job in enumerate(open_jobs):
+        j_specialty[i] = specialties.code(job.get("specialty"))
+        j_req.append(qualifications.mask(job.get("requirements")))
+        j_hr[i] = hr_codes.code(job["createdBy"])
+        j_publish[i] = _PUBLISH_CODES.get(job.get("publishTo"), PUBLISH_ALL)
+        hospital = hospitals[job["hospitalId"]]
+        j_lat[i], j_lng[i] = hospital["latitude"], hospital["longitude"]
+        if j_publish[i] == PUBLISH_SPECIFIC:
+            rows = [row_of[d] for d in job.get("specificDoctors") or [] if d in row_of]
+            specific_jobs.extend([i] * len(rows))
+            specific_doctors.extend(rows)
+
+    # Skill masks last, once job specialties are in the vocabulary too
+    d_profiles: Dict[Tuple[int, int, int], int] = {}
+    d_profile = np.empty(n, dtype=np.int32)
+    for i, doctor in enumerate(doctors):
+        skill_mask = 0
+        for skill in doctor.get("skills") or []:
+            code = specialties.codes.get(skill)
+            if code is not None:
+                skill_mask |= 1 << code
+        key = (int(d_specialty[i]), skill_mask, d_qual[i])
+        d_profile[i] = d_profiles.setdefault(key, len(d_profiles))
+
+    j_profiles: Dict[Tuple[int, int], int] = {}
+    j_profile = np.empty(m, dtype=np.int32)
+    for i in range(m):
+        j_profile[i] = j_profiles.setdefault((int(j_specialty[i]), j_req[i]), len(j_profiles))
+
+    pool = np.zeros((n, max(1, len(hr_codes.codes))), dtype=bool)
+    for entry in seed_data.get("hr_doctor_pool", []):
+        hr_code = hr_codes.codes.get(entry["hrId"])
+        row = row_of.get(entry["doctorId"])
+        if hr_code is not None and row is not None:
+            pool[row, hr_code] = True
+
+    d_keys = list(d_profiles)
+    j_keys = list(j_profiles)
+    skill_bits = len(specialties.codes)
+    qual_bits = len(qualifications.codes)
+    encoded_doctors = EncodedDoctors(
+        doctor_ids, d_profile,
+        np.array([k[0] for k in d_keys], dtype=np.int32),
+        _mask_words([k[1] for k in d_keys], skill_bits),
+        _mask_words([k[2] for k in d_keys], qual_bits),
+        d_rating, _unit_vectors(d_lat, d_lng), row_of)
+    encoded_jobs = EncodedJobs(
+        [j["id"] for j in open_jobs], j_profile,
+        np.array([k[0] for k in j_keys], dtype=np.int32),
+        _mask_words([k[1] for k in j_keys], qual_bits),
+        j_hr, j_publish, np.array(specific_jobs, dtype=np.int64), np.array(specific_doctors, dtype=np.int64),
+        _unit_vectors(j_lat, j_lng))
+    return encoded_doctors, encoded_jobs, pool
+
+
+# ============================================================================
+# BATCH SCORING
+# ============================================================================
+
+def profile_tables(doctors: EncodedDoctors, jobs: EncodedJobs, weights: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Categorical part of the score for every (doctor profile, job profile) pair
+
+    Returns:
+        (scores, qualified): specialty + skill + qualification score, and whether
+        the doctor profile holds every requirement of the job profile
+    """
+    d_spec = doctors.profile_specialty[:, None]
+    j_spec = jobs.profile_specialty[None, :]
+    scores = weights["specialty"] * (d_spec == j_spec).astype(np.float32)
+
+    # Test bit (specialty % 64) of word (specialty // 64) of each doctor profile's skill mask
+    spec = jobs.profile_specialty.clip(0)
+    skill_words = doctors.profile_skill_mask[:, spec // 64]
+    has_skill = (skill_words >> (spec % 64).astype(np.uint64)[None, :]) & np.uint64(1)
+    scores += weights["skill"] * ((has_skill != 0) & (j_spec >= 0))
+
+    req = jobs.profile_req_mask[None, :, :]
+    covered = _popcount(doctors.profile_qual_mask[:, None, :] & req).astype(np.float32)
+    req_count = np.broadcast_to(_popcount(req).astype(np.float32), covered.shape)
+    coverage = np.divide(covered, req_count, out=np.ones_like(covered), where=req_count > 0)
+    scores += weights["qualification"] * coverage
+    return scores.astype(np.float32), coverage >= 1.0
+
+
+def score_block(doctors: EncodedDoctors, jobs: EncodedJobs, pool: np.ndarray, d_slice: slice, j_slice: slice,
+                weights: Dict[str, float], tables: Tuple[np.ndarray, np.ndarray], distance_scale_km: float = 15.0,
+                require_qualifications: bool = False) -> np.ndarray:
+    """Score a block of doctors x jobs; ineligible pairs get -inf"""
+    profile_scores, qualified = tables
+    d_profile = doctors.profile[d_slice][:, None]
+    j_profile = jobs.profile[j_slice][None, :]
+    scores = profile_scores[d_profile, j_profile]
+
+    distance = pair_distances_km(doctors.xyz[d_slice], jobs.xyz[j_slice])
+    np.multiply(distance, -1.0 / distance_scale_km, out=distance)
+    np.exp(distance, out=distance)
+    np.multiply(distance, weights["distance"], out=distance)
+    scores += distance
+
+    scores += weights["rating"] * (doctors.rating[d_slice][:, None] / 5.0)
+
+    in_pool = pool[d_slice][:, jobs.hr[j_slice]]
+    scores += weights["pool"] * in_pool
+
+    publish = jobs.publish[j_slice][None, :]
+    eligible = (publish == PUBLISH_ALL) | ((publish == PUBLISH_POOL) & in_pool)
+
+    # publishTo == "specific": only the listed doctors (entries are sorted by job row)
+    d_start = d_slice.start or 0
+    j_start = j_slice.start or 0
+    lo, hi = np.searchsorted(jobs.specific_jobs, [j_start, j_slice.stop])
+    rows = jobs.specific_doctors[lo:hi]
+    in_block = (rows >= d_start) & (rows < d_slice.stop)
+    eligible[rows[in_block] - d_start, jobs.specific_jobs[lo:hi][in_block] - j_start] = True
+
+    if require_qualifications:
+        eligible &= qualified[d_profile, j_profile]
+    np.putmask(scores, ~eligible, -np.inf)
+    return scores
+
+
+def _merge_top_k(best_scores: np.ndarray, best_index: np.ndarray, scores: np.ndarray, offset: int, k: int):
+    """Merge a block of candidate scores (rows x cols) into running per-row top-k arrays"""
+    cols = scores.shape[1]
+    if cols > k:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(cols), (scores.shape[0], cols))
+    cand_scores = np.concatenate([best_scores, np.take_along_axis(scores, part, axis=1)], axis=1)
+    cand_index = np.concatenate([best_index, part + offset], axis=1)
+    keep = np.argpartition(-cand_scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(cand_scores, keep, axis=1), np.take_along_axis(cand_index, keep, axis=1)
+
+
+def recommend(seed_data: Dict[str, List[Dict[str, Any]]], k: int = 10, doctor_block: int = 512,
+              job_block: int = 16384, weights: Optional[Dict[str, float]] = None, distance_scale_km: float = 15.0,
+              require_qualifications: bool = False, doctor_locations: Optional[Dict[str, Tuple[float, float]]] = None,
+              workers: Optional[int] = None) -> Dict[str, Dict[str, List[Tuple[str, float]]]]:
+    """
+    Top-k open jobs per doctor and top-k doctors per open job
+
+    Pairs are scored block by block (doctor_block x job_block float32 at a
+    time), keeping running top-k arrays for both sides, so memory stays
+    bounded for 50k doctors x 1M jobs. Doctor blocks run on `workers` threads
+    (NumPy releases the GIL); each job block's top-k has its own lock.
+
+    Returns:
+        {"jobs_for_doctor": {doctor_id: [(job_id, score), ...]},
+         "doctors_for_job": {job_id: [(doctor_id, score), ...]}}
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    doctors, jobs, pool = encode(seed_data, doctor_locations)
+    n, m = len(doctors.ids), len(jobs.ids)
+    if n == 0 or m == 0:
+        return {"jobs_for_doctor": {}, "doctors_for_job": {}}
+    tables = profile_tables(doctors, jobs, weights)
+    k_jobs = min(k, m)
+    k_doctors = min(k, n)
+
+    doc_best = np.full((n, k_jobs), -np.inf, dtype=np.float32)
+    doc_best_idx = np.zeros((n, k_jobs), dtype=np.int64)
+    job_best = np.full((m, k_doctors), -np.inf, dtype=np.float32)
+    job_best_idx = np.zeros((m, k_doctors), dtype=np.int64)
+
+    job_starts = list(range(0, m, job_block))
+    job_locks = [threading.Lock() for _ in job_starts]
+
+    def score_doctor_block(d_start: int):
+        d_slice = slice(d_start, min(n, d_start + doctor_block))
+        for j_start, lock in zip(job_starts, job_locks):
+            j_slice = slice(j_start, min(m, j_start + job_block))
+            scores = score_block(doctors, jobs, pool, d_slice, j_slice, weights, tables, distance_scale_km,
+                                 require_qualifications)
+            doc_best[d_slice], doc_best_idx[d_slice] = _merge_top_k(
+                doc_best[d_slice], doc_best_idx[d_slice], scores, j_start, k_jobs)
+            with lock:
+                job_best[j_slice], job_best_idx[j_slice] = _merge_top_k(
+                    job_best[j_slice], job_best_idx[j_slice], scores.T, d_start, k_doctors)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool_executor:
+        for future in [pool_executor.submit(score_doctor_block, d) for d in range(0, n, doctor_block)]:
+            future.result()
+
+    def to_lists(best, best_idx, ids):
+        order = np.argsort(-best, axis=1, kind="stable")
+        best = np.take_along_axis(best, order, axis=1)
+        best_idx = np.take_along_axis(best_idx, order, axis=1)
+        return [
+            [(ids[i], float(s)) for i, s in zip(row_idx, row) if np.isfinite(s)]
+            for row_idx, row in zip(best_idx, best)
+        ]
+
+    return {
+        "jobs_for_doctor": dict(zip(doctors.ids, to_lists(doc_best, doc_best_idx, jobs.ids))),
+        "doctors_for_job": dict(zip(jobs.ids, to_lists(job_best, job_best_idx, doctors.ids))),
+    }
+
+
+def recommendation_records(recommendations: Dict[str, Dict[str, List[Tuple[str, float]]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Recommendations as seed-data style collections (job_recommendations, doctor_recommendations)"""
+    generated_at = get_current_timestamp()
+    return {
+        "job_recommendations": [
+            {"id": doctor_id, "doctorId": doctor_id, "jobIds": [j for j, _ in ranked],
+             "scores": [round(s, 4) for _, s in ranked], "generatedAt": generated_at}
+            for doctor_id, ranked in recommendations["jobs_for_doctor"].items()
+        ],
+        "doctor_recommendations": [
+            {"id": job_id, "jobId": job_id, "doctorIds": [d for d, _ in ranked],
+             "scores": [round(s, 4) for _, s in ranked], "generatedAt": generated_at}
+            for job_id, ranked in recommendations["doctors_for_job"].items()
+        ],
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    from seed import generate_skewed_seed_data
+
+    parser = argparse.ArgumentParser(description='Precompute doctor-job recommendations')
+    parser.add_argument('-k', type=int, default=10, help='Recommendations per doctor / job (default: 10)')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Use a skewed dataset with this many jobs (default: small seed data)')
+    parser.add_argument('--doctors', type=int, default=2000, help='Doctors in the skewed dataset (default: 2000)')
+    parser.add_argument('--require-qualifications', action='store_true',
+                       help='Only match doctors holding every job requirement')
+    parser.add_argument('--workers', type=int, help='Scoring threads (default: CPU count)')
+
+    args = parser.parse_args()
+
+    if args.jobs:
+        seed_data = generate_skewed_seed_data(num_jobs=args.jobs, num_doctors=args.doctors)
+        # Treat every job as open so the benchmark scores the full matrix
+        for job in seed_data["jobs"]:
+            job["status"] = "Open"
+    else:
+        seed_data = generate_all_seed_data()
+
+    started = time.perf_counter()
+    recommendations = recommend(seed_data, args.k, require_qualifications=args.require_qualifications,
+                                workers=args.workers)
+    elapsed = time.perf_counter() - started
+    pairs = len(recommendations["jobs_for_doctor"]) * len(recommendations["doctors_for_job"])
+
+    print("\n" + "="*50)
+    print(f"Scored {pairs} doctor-job pairs in {elapsed:.2f}s ({pairs / max(elapsed, 1e-9):.0f} pairs/s)")
+    print("="*50)
+    doctors = {d["id"]: d for d in seed_data["doctors"]}
+    jobs = {j["id"]: j for j in seed_data["jobs"]}
+    for doctor_id, ranked in list(recommendations["jobs_for_doctor"].items())[:3]:
+        print(f"\n{doctors[doctor_id]['name']} ({doctors[doctor_id]['specialty']}):")
+        for job_id, score in ranked[:5]:
+            print(f"  {score:5.2f}  {jobs[job_id]['role']} - {jobs[job_id]['specialty']} at {jobs[job_id]['hospitalName']}")
@@ -0,0 +1,524 @@
+"""
+Backend Parity Verifier
+Hashes every record canonically and builds one Merkle tree per table (buckets
+by ID prefix) while streaming each backend, then compares roots and descends
+only into differing subtrees, so two backends are checked by exchanging hashes
+instead of dumping and diffing whole tables
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Set, Tuple
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import ast
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+
+
+DIGEST_SIZE = 16
+FANOUT = 16
+EMPTY_DIGEST = bytes(DIGEST_SIZE)
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+# ============================================================================
+# CANONICAL RECORDS
+# ============================================================================
+
+def infer_field_types(seed_data: Dict[str, List[Dict[str, Any]]],
+                      table_mapping: Dict[str, str]) -> Dict[str, Dict[str, Set[str]]]:
+    """Table name -> field -> Python type names seen in the generated data"""
+    types: Dict[str, Dict[str, Set[str]]] = {}
+    for seed_key, table in table_mapping.items():
+        fields = types.setdefault(table, {})
+        for record in seed_data.get(seed_key, []):
+            for field, value in record.items():
+                if value is not None:
+                    fields.setdefault(field, set()).add(type(value).__name__)
+    return types
+
+
+def schema_field_types(table_mapping: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Set[str]]]:
+    """
+    Field types of the seed schema, from a small run of both generators
+
+    The generators always emit the same types per field, so this stands in for
+    the schema when neither side of a comparison is typed (e.g. SQLite vs
+    PostgreSQL).
+    """
+    from seed import generate_all_seed_data, generate_skewed_seed_data, COLLECTION_NAMES
+    table_mapping = table_mapping or COLLECTION_NAMES
+    with contextlib.redirect_stdout(io.StringIO()):
+        samples = [generate_all_seed_data(),
+                   generate_skewed_seed_data(num_hr_users=5, num_hospitals=5, num_doctors=50, num_jobs=200)]
+    types: Dict[str, Dict[str, Set[str]]] = {}
+    for sample in samples:
+        for table, fields in infer_field_types(sample, table_mapping).items():
+            for field, names in fields.items():
+                types.setdefault(table, {}).setdefault(field, set()).update(names)
+    return types
+
+
+def _decode_text(text: str) -> Any:
+    """Parse a list/dict stored as Python repr or JSON text, only if it re-encodes to exactly the same text"""
+    for parse, encode in ((ast.literal_eval, str), (json.loads, json.dumps)):
+        try:
+            value = parse(text)
+        except (ValueError, SyntaxError):
+            continue
+        if isinstance(value, (list, dict)) and encode(value) == text:
+            return value
+    return text
+
+
+def normalize_value(value: Any, expected: Optional[Set[str]] = None) -> Any:
+    """
+    Logical value of a field as read back from any backend
+
+    Decimals, integral floats, datetimes and SQL 0/1 booleans are normalized.
+    Lists and dicts that a SQL backend stored as text (see
+    seed_sql.escape_sql_string) are parsed back when the field is never a
+    string; text that does not parse is kept, so mangled escaping still shows
+    up as a difference.
+    """
+    if isinstance(value, Decimal):
+        value = float(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat() + "Z"
+    if isinstance(value, date):
+        return value.isoformat()
+    if expected:
+        if isinstance(value, int) and not isinstance(value, bool) and expected == {"bool"}:
+            return bool(value)
+        if isinstance(value, str) and "str" not in expected and expected & {"list", "dict"}:
+            value = _decode_text(value)
+    if isinstance(value, list):
+        return [normalize_value(item) for item in value]
+    if isinstance(value, dict):
+        return {k: normalize_value(v) for k, v in value.items()}
+    return value
+
+
+def canonical_record(record: Dict[str, Any], types: Optional[Dict[str, Set[str]]] = None) -> bytes:
+    """Sorted-key compact JSON of the normalized record; NULL and missing fields are equivalent"""
+    types = types or {}
+    normalized = {
+        field: normalize_value(value, types.get(field))
+        for field, value in record.items()
+        if value is not None and field != "_id"
+    }
+    return json.dumps(normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def record_hash(record: Dict[str, Any], types: Optional[Dict[str, Set[str]]] = None) -> bytes:
+    return _digest(canonical_record(record, types))
+
+
+# ============================================================================
+# MERKLE TREES
+# ============================================================================
+
+class MerkleTree:
+    """
+    16-ary Merkle tree over 16^depth buckets, keyed by the first `depth` hex
+    digits of the record ID (IDs that are not hex are bucketed by their hash).
+
+    Leaves hash their bucket's (id, record hash) pairs in ID order, so the tree
+    does not depend on the order records were streamed in.
+    """
+
+    def __init__(self, depth: int = 3):
+        self.depth = depth
+        self.buckets: List[Dict[str, bytes]] = [{} for _ in range(FANOUT ** depth)]
+        self.levels: List[List[bytes]] = []
+        self.count = 0
+
+    def bucket_of(self, record_id: str) -> int:
+        try:
+            return int(record_id[:self.depth], 16) if len(record_id) >= self.depth else self._hashed(record_id)
+        except ValueError:
+            return self._hashed(record_id)
+
+    def _hashed(self, record_id: str) -> int:
+        return int.from_bytes(_digest(record_id.encode("utf-8"))[:4], "big") % len(self.buckets)
+
+    def add(self, record_id: str, digest: bytes):
+        self.buckets[self.bucket_of(record_id)][record_id] = digest
+        self.count += 1
+
+    def finalize(self) -> "MerkleTree":
+        """Hash the buckets and every level up to the root (levels[0] is the root)"""
+        leaves = []
+        for bucket in self.buckets:
+            if not bucket:
+                leaves.append(EMPTY_DIGEST)
+                continue
+            h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+            for record_id in sorted(bucket):
+                h.update(record_id.encode("utf-8"))
+                h.update(b"\0")
+                h.update(bucket[record_id])
+            leaves.append(h.digest())
+        levels = [leaves]
+        while len(levels[0]) > 1:
+            children = levels[0]
+            levels.insert(0, [_digest(b"".join(children[i:i + FANOUT])) for i in range(0, len(children), FANOUT)])
+        self.levels = levels
+        return self
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[0][0]
+
+
+def build_tree(records: Iterable[Dict[str, Any]], types: Optional[Dict[str, Set[str]]] = None,
+               depth: int = 3) -> MerkleTree:
+    """Stream records into a finalized tree; records without an ID are keyed by their own hash"""
+    tree = MerkleTree(depth)
+    for record in records:
+        digest = record_hash(record, types)
+        record_id = record.get("id")
+        tree.add(str(record_id) if record_id is not None else digest.hex(), digest)
+    return tree.finalize()
+
+
+TREE_FILE_VERSION = 1
+
+
+def save_trees(trees: Dict[str, MerkleTree], path: str, depth: int = 3):
+    """
+    Write per-table trees to a JSON file (gzip if the path ends in .gz)
+
+    Only the leaf entries (ID -> record hash) and each root are stored; the
+    inner levels are rebuilt on load. Keeping the entries lets a later
+    comparison against another backend list differing IDs, not just buckets.
+    """
+    document = {
+        "version": TREE_FILE_VERSION,
+        "depth": depth,
+        "tables": {
+            table: {
+                "count": tree.count,
+                "root": tree.root.hex(),
+                "entries": {record_id: digest.hex()
+                            for bucket in tree.buckets for record_id, digest in sorted(bucket.items())},
+            }
+            for table, tree in sorted(trees.items())
+        },
+    }
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        json.dump(document, f, separators=(",", ":"))
+
+
+def load_trees(path: str) -> Tuple[Dict[str, MerkleTree], int]:
+    """
+    Read trees written by save_trees
+
+    Returns:
+        (table name -> finalized tree, bucket depth the trees were built with)
+
+    Raises:
+        ValueError: unknown file version, or a rebuilt root that does not
+        match the stored one (the file was edited or truncated)
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        document = json.load(f)
+    if document.get("version") != TREE_FILE_VERSION:
+        raise ValueError(f"Unsupported tree file version: {document.get('version')}")
+    depth = document["depth"]
+    trees = {}
+    for table, saved in document["tables"].items():
+        tree = MerkleTree(depth)
+        for record_id, digest in saved["entries"].items():
+            tree.add(record_id, bytes.fromhex(digest))
+        tree.finalize()
+        if tree.root.hex() != saved["root"]:
+            raise ValueError(f"Tree file {path} is corrupt: {table} does not rebuild to its stored root")
+        tree.count = saved["count"]  # includes duplicate IDs, which share one entry
+        trees[table] = tree
+    return trees, depth
+
+
+def diff_trees(left: MerkleTree, right: MerkleTree) -> Tuple[List[int], int]:
+    """
+    Buckets whose hashes differ, found top-down from the root
+
+    Returns:
+        (differing bucket indexes, number of node hashes compared)
+    """
+    if left.depth != right.depth:
+        raise ValueError("Trees must have the same depth")
+    compared = 1
+    frontier = [0] if left.root != right.root else []
+    for level in range(1, len(left.levels)):
+        next_frontier = []
+        for node in frontier:
+            for child in range(node * FANOUT, node * FANOUT + FANOUT):
+                compared += 1
+                if left.levels[level][child] != right.levels[level][child]:
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return frontier, compared
+
+
+def diff_buckets(left: MerkleTree, right: MerkleTree, buckets: List[int]) -> Dict[str, List[str]]:
+    """Record IDs only on the left, only on the right, or with different hashes, within the given buckets"""
+    result: Dict[str, List[str]] = {"missing": [], "extra": [], "changed": []}
+    for index in buckets:
+        a, b = left.buckets[index], right.buckets[index]
+        result["missing"].extend(sorted(a.keys() - b.keys()))
+        result["extra"].extend(sorted(b.keys() - a.keys()))
+        result["changed"].extend(sorted(k for k in a.keys() & b.keys() if a[k] != b[k]))
+    return result
+
+
+def compare_tables(left: Dict[str, MerkleTree], right: Dict[str, MerkleTree],
+                   depth: int = 3) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare per-table trees from two backends
+
+    Returns:
+        Per table: match flag, record counts, differing IDs, and the hash bytes
+        that had to be exchanged (tree nodes plus leaf entries of differing buckets)
+    """
+    report = {}
+    for table in sorted(left.keys() | right.keys()):
+        a = left.get(table) or MerkleTree(depth).finalize()
+        b = right.get(table) or MerkleTree(depth).finalize()
+        buckets, compared = diff_trees(a, b)
+        differences = diff_buckets(a, b, buckets)
+        leaf_bytes = sum(
+            len(record_id) + DIGEST_SIZE
+            for index in buckets for tree in (a, b) for record_id in tree.buckets[index]
+        )
+        report[table] = {
+            "match": not buckets and a.count == b.count,
+            "leftCount": a.count,
+            "rightCount": b.count,
+            "differingBuckets": len(buckets),
+            "bytesExchanged": compared * DIGEST_SIZE * 2 + leaf_bytes,
+            **differences,
+        }
+    return report
+
+
+# ============================================================================
+# STREAMING READERS
+# ============================================================================
+
+def read_seed(seed_data: Dict[str, List[Dict[str, Any]]], seed_key: str) -> Iterator[Dict[str, Any]]:
+    return iter(seed_data.get(seed_key, []))
+
+
+def read_sql(conn, table: str, batch_size: int = 5000, server_side: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows as dicts through any DB-API connection
+
+    server_side uses a named cursor (psycopg2) so PostgreSQL does not send the
+    whole table at once; sqlite3 cursors already stream.
+    """
+    cursor = conn.cursor(name=f"parity_{table}") if server_side else conn.cursor()
+    if server_side:
+        cursor.itersize = batch_size
+    try:
+        cursor.execute(f"SELECT * FROM {table}")
+        columns = [d[0] for d in cursor.description]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+    finally:
+        cursor.close()
+
+
+def read_mongo(db, collection: str, batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+    return db[collection].find({}, {"_id": 0}, batch_size=batch_size)
+
+
+def read_firestore(db, collection: str) -> Iterator[Dict[str, Any]]:
+    for snapshot in db.collection(collection).stream():
+        record = snapshot.to_dict()
+        record.setdefault("id", snapshot.id)
+        yield record
+
+
+def _missing_table(exc: Exception) -> bool:
+    """True when a SQL read failed because the table does not exist"""
+    return "no such table" in str(exc) or "does not exist" in str(exc)
+
+
+def backend_trees(reader, tables: List[str], types: Dict[str, Dict[str, Set[str]]],
+                  depth: int = 3) -> Dict[str, MerkleTree]:
+    """
+    One tree per table from reader(table) -> record iterator
+
+    Tables the backend does not have are left out, which compare_tables
+    reports as every record missing.
+    """
+    trees = {}
+    for table in tables:
+        try:
+            trees[table] = build_tree(reader(table), types.get(table), depth)
+        except Exception as e:
+            if not _missing_table(e):
+                raise
+    return trees
+
+
+def open_backend(spec: str, database: str = "drlocum"):
+    """
+    Reader for a backend spec: json:<seed_data.json>, sqlite:<file>,
+    postgresql:<dsn>, mysql:<host/user/password/database>, mongodb:<uri>,
+    firestore[:<credentials.json>]
+
+    Returns:
+        (reader(table) -> records, close callable)
+    """
+    kind, _, target = spec.partition(":")
+    if kind == "json":
+        from seed import COLLECTION_NAMES
+        with open(target, "r", encoding="utf-8") as f:
+            seed_data = json.load(f)
+        by_table = {table: key for key, table in COLLECTION_NAMES.items()}
+        return (lambda table: read_seed(seed_data, by_table.get(table, table))), (lambda: None)
+    if kind == "sqlite":
+        import sqlite3
+        conn = sqlite3.connect(target)
+        return (lambda table: read_sql(conn, table)), conn.close
+    if kind == "postgresql":
+        import psycopg2
+
+        def reader(table):
+            # Named cursors need their own transaction; roll back after a missing table
+            try:
+                yield from read_sql(conn, table, server_side=True)
+            finally:
+                conn.rollback()
+        conn = psycopg2.connect(target)
+        return reader, conn.close
+    if kind == "mysql":
+        import pymysql
+        host, user, password, name = target.split("/")
+        conn = pymysql.connect(host=host, user=user, password=password, database=name,
+                               cursorclass=pymysql.cursors.SSCursor)
+        return (lambda table: read_sql(conn, table)), conn.close
+    if kind == "mongodb":
+        from pymongo import MongoClient
+        client = MongoClient(target)
+        db = client[database]
+        return (lambda table: read_mongo(db, table)), client.close
+    if kind == "firestore":
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+        if not firebase_admin._apps:
+            if target:
+                firebase_admin.initialize_app(credentials.Certificate(target))
+            else:
+                firebase_admin.initialize_app()
+        db = firestore.client()
+        return (lambda table: read_firestore(db, table)), (lambda: None)
+    raise ValueError(f"Unknown backend: {spec}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description='Check that two seeded backends hold the same data')
+    parser.add_argument('left', type=str,
+                       help='Backend spec: json:FILE, sqlite:FILE, postgresql:DSN, mysql:HOST/USER/PASSWORD/DB, '
+                            'mongodb:URI, firestore[:CREDENTIALS], or tree:FILE saved with --save-tree')
+    parser.add_argument('right', type=str, nargs='?',
+                       help='Backend spec to compare against (omit with --save-tree)')
+    parser.add_argument('--save-tree', type=str, metavar='FILE',
+                       help='Save the trees of the left backend to FILE (.json or .json.gz) instead of comparing, '
+                            'so another host can compare against it with tree:FILE')
+    parser.add_argument('--database', type=str, default='drlocum', help='MongoDB database name (default: drlocum)')
+    parser.add_argument('--tables', type=str, nargs='+', help='Tables to check (default: all seed tables)')
+    parser.add_argument('--depth', type=int, default=3,
+                       help='ID prefix digits per bucket; 16^depth buckets (default: 3, or the depth of a tree file)')
+    parser.add_argument('--show', type=int, default=5, help='Differing IDs to print per table (default: 5)')
+
+    args = parser.parse_args()
+
+    if args.save_tree and args.right:
+        parser.error('--save-tree takes a single backend')
+    if not args.save_tree and not args.right:
+        parser.error('a right backend spec is required unless --save-tree is given')
+    specs = [args.left] if args.save_tree else [args.left, args.right]
+
+    from seed import COLLECTION_NAMES
+    tables = args.tables or list(COLLECTION_NAMES.values())
+
+    # Load tree files first: backends must be hashed with the same bucket depth
+    loaded: Dict[str, Dict[str, MerkleTree]] = {}
+    depths = set()
+    for spec in specs:
+        if spec.startswith("tree:"):
+            try:
+                loaded[spec], saved_depth = load_trees(spec[len("tree:"):])
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[ERROR] Cannot load tree file: {e}")
+                sys.exit(1)
+            depths.add(saved_depth)
+    if len(depths) > 1:
+        print("[ERROR] Tree files were saved with different --depth values")
+        sys.exit(1)
+    depth = depths.pop() if depths else args.depth
+
+    types = schema_field_types() if len(loaded) < len(specs) else {}
+    trees = []
+    for spec in specs:
+        if spec in loaded:
+            trees.append({table: tree for table, tree in loaded[spec].items() if table in tables})
+            records = sum(t.count for t in trees[-1].values())
+            print(f"[OK] Loaded {records} record hashes from {spec[len('tree:'):]}")
+            continue
+        try:
+            reader, close = open_backend(spec, args.database)
+        except ImportError as e:
+            print(f"[ERROR] Missing backend library: {e}")
+            sys.exit(1)
+        started = time.perf_counter()
+        try:
+            trees.append(backend_trees(reader, tables, types, depth))
+        finally:
+            close()
+        records = sum(t.count for t in trees[-1].values())
+        print(f"[OK] Hashed {records} records from {spec.split(':')[0]} in {time.perf_counter() - started:.2f}s")
+
+    if args.save_tree:
+        save_trees(trees[0], args.save_tree, depth)
+        print(f"[OK] Saved {len(trees[0])} table tree(s) to {args.save_tree}")
+        sys.exit(0)
+
+    report = compare_tables(*trees, depth=depth)
+    print("\n" + "="*60)
+    mismatched = 0
+    for table, result in report.items():
+        if result["match"]:
+            print(f"[OK] {table}: {result['leftCount']} records match ({result['bytesExchanged']} hash bytes)")
+            continue
+        mismatched += 1
+        print(f"[ERROR] {table}: {result['differingBuckets']} differing bucket(s), "
+              f"{len(result['missing'])} missing, {len(result['extra'])} extra, {len(result['changed'])} changed "
+              f"({result['bytesExchanged']} hash bytes)")
+        for kind in ("missing", "extra", "changed"):
+            for record_id in result[kind][:args.show]:
+                print(f"  {kind}: {record_id}")
+    print("="*60)
+    sys.exit(1 if mismatched else 0)
@@ -0,0 +1,308 @@
+"""
+Payroll Rollups
+Computes payment amounts from actual shift times and job rates, and
+aggregates payments per doctor, hospital and period with columnar NumPy
+group-bys, exported as precomputed summary rows
+"""
+
+from seed import generate_all_seed_data, get_current_timestamp, COLLECTION_NAMES
+from read_models import PAYMENT_STATUSES, counter_field
+from scheduling import job_bounds
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable, Sequence, Tuple
+import numpy as np
+
+
+# Summary keys mapped to table / collection names
+PAYROLL_COLLECTIONS = {
+    "payroll_doctor_summaries": "payroll_doctor_summaries",
+    "payroll_hospital_summaries": "payroll_hospital_summaries",
+    "payroll_period_summaries": "payroll_period_summaries",
+}
+
+GROUP_FIELDS = {"doctor": "doctorId", "hospital": "hospitalId", "period": "period"}
+
+PERIODS = ("day", "week", "month", "year")
+
+_PAID = PAYMENT_STATUSES.index("Paid")
+
+
+def _timestamps(values: Sequence[Optional[str]]) -> np.ndarray:
+    """ISO "...Z" strings (or None) as datetime64[us], NaT where missing"""
+    return np.array([v[:-1] if v and v.endswith("Z") else (v or "NaT") for v in values], dtype="datetime64[us]")
+
+
+def _latest(records: Iterable[Dict[str, Any]]) -> Optional[datetime]:
+    """Latest createdAt / updatedAt of the records, or None if they have none"""
+    stamps = _timestamps([r.get(field) for r in records for field in ("createdAt", "updatedAt") if r.get(field)])
+    return stamps.max().astype(datetime) if len(stamps) else None
+
+
+def reference_time(seed_data: Dict[str, List[Dict[str, Any]]]) -> Optional[datetime]:
+    """
+    Time a dataset describes: its latest createdAt / updatedAt
+
+    For skewed datasets this is the generator's `now` (derived from --seed or
+    given with --now), so rollups do not change with the wall clock.
+    """
+    latest = [t for t in (_latest(seed_data.get(key, [])) for key in COLLECTION_NAMES) if t is not None]
+    return max(latest) if latest else None
+
+
+def _codes(values: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Dictionary-encode values as int32 codes plus the list of distinct values"""
+    labels: Dict[Any, int] = {}
+    codes = np.fromiter((labels.setdefault(v, len(labels)) for v in values), dtype=np.int32, count=len(values))
+    return codes, list(labels)
+
+
+# ============================================================================
+# AMOUNTS
+# ============================================================================
+
+def compute_amounts(shifts: List[Dict[str, Any]], jobs: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Payment amount per shift, vectorized (same rule as scheduling.shift_pay)
+
+    Paid hours are the actual span minus the scheduled off-hours between
+    working days, or the scheduled hours when the shift has no actual times;
+    the amount is paid hours x the job's hourly rate, rounded to cents.
+    """
+    jobs_by_id = {job["id"]: job for job in jobs}
+    # Scheduled (off-hours, hours) per job, computed once per job rather than per shift
+    bounds: Dict[str, tuple] = {}
+    for shift in shifts:
+        job_id = shift["jobId"]
+        if job_id not in bounds:
+            job = jobs_by_id[job_id]
+            first_start, last_end, scheduled = job_bounds(job)
+            bounds[job_id] = (last_end - first_start - scheduled, scheduled,
+                              job.get("paymentPerHour") or job.get("pay") or 0)
+
+    n = len(shifts)
+    off_hours = np.fromiter((bounds[s["jobId"]][0] for s in shifts), dtype=np.float64, count=n)
+    scheduled = np.fromiter((bounds[s["jobId"]][1] for s in shifts), dtype=np.float64, count=n)
+    rate = np.fromiter((bounds[s["jobId"]][2] for s in shifts), dtype=np.float64, count=n)
+    actual_start = _timestamps([s.get("actualStartTime") for s in shifts])
+    actual_end = _timestamps([s.get("actualEndTime") for s in shifts])
+
+    span = (actual_end - actual_start).astype("timedelta64[s]").astype(np.float64)
+    has_actual = ~(np.isnat(actual_start) | np.isnat(actual_end))
+    seconds = np.where(has_actual, np.maximum(0.0, span - off_hours), scheduled)
+    return np.round(seconds / 3600 * rate, 2)
+
+
+def recompute_payment_amounts(seed_data: Dict[str, List[Dict[str, Any]]]) -> int:
+    """Set every payment's amount from its shift (in place); returns the number updated"""
+    shifts_by_id = {shift["id"]: shift for shift in seed_data.get("shifts", [])}
+    payments = [p for p in seed_data.get("payments", []) if p.get("shiftId") in shifts_by_id]
+    amounts = compute_amounts([shifts_by_id[p["shiftId"]] for p in payments], seed_data.get("jobs", []))
+    for payment, amount in zip(payments, amounts.tolist()):
+        payment["amount"] = amount
+    return len(payments)
+
+
+# ============================================================================
+# COLUMNAR PAYMENTS
+# ============================================================================
+
+class PaymentColumns:
+    """
+    Payments as parallel NumPy arrays.
+
+    Doctors, hospitals and statuses are dictionary-encoded as integer codes,
+    timestamps as datetime64, so a rollup is a few bincount passes.
+    """
+
+    def __init__(self, payments: List[Dict[str, Any]], jobs: List[Dict[str, Any]],
+                 reference: Optional[datetime] = None):
+        # Default "now" for overdue checks: the dataset's time, not the wall clock
+        self.reference = reference or max(
+            (t for t in (_latest(payments), _latest(jobs)) if t is not None), default=None)
+        hospital_by_job = {job["id"]: job.get("hospitalId") for job in jobs}
+        n = len(payments)
+        self.doctor, self.doctor_ids = _codes([p["doctorId"] for p in payments])
+        self.hospital, self.hospital_ids = _codes([hospital_by_job.get(p["jobId"]) for p in payments])
+        status_codes = {status: i for i, status in enumerate(PAYMENT_STATUSES)}
+        self.status = np.fromiter((status_codes.get(p.get("status"), -1) for p in payments), dtype=np.int8, count=n)
+        self.amount = np.fromiter((p.get("amount") or 0 for p in payments), dtype=np.float64, count=n)
+        self.due = _timestamps([p.get("dueDate") for p in payments])
+        self.paid = _timestamps([p.get("paidDate") for p in payments])
+        self.created = _timestamps([p.get("createdAt") for p in payments])
+
+    @classmethod
+    def from_seed_data(cls, seed_data: Dict[str, List[Dict[str, Any]]]) -> "PaymentColumns":
+        return cls(seed_data.get("payments", []), seed_data.get("jobs", []), reference_time(seed_data))
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+
+def _period_codes(dates: np.ndarray, period: str) -> Tuple[np.ndarray, List[str]]:
+    """Bucket datetime64 values by period; weeks start on Monday and are labelled by that date"""
+    if period == "week":
+        days = dates.astype("datetime64[D]").astype(np.int64)
+        buckets = (days - (days + 3) % 7).astype("datetime64[D]")  # 1970-01-01 was a Thursday
+    else:
+        buckets = dates.astype({"day": "datetime64[D]", "month": "datetime64[M]", "year": "datetime64[Y]"}[period])
+    unique, codes = np.unique(buckets, return_inverse=True)
+    return codes.astype(np.int32).ravel(), [str(u) for u in unique]
+
+
+def rollup(columns: PaymentColumns, by: Sequence[str] = ("hospital",), period: str = "month",
+           start: Optional[str] = None, end: Optional[str] = None, statuses: Optional[Sequence[str]] = None,
+           hospital_ids: Optional[Sequence[str]] = None, date_field: str = "due",
+           now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Group payments and total them by status
+
+    Args:
+        columns: PaymentColumns to aggregate
+        by: Group dimensions, any of "doctor", "hospital", "period"
+        period: Period size for "period" grouping: day, week (from Monday), month or year
+        start: Include payments whose date_field is on or after this ISO date
+        end: Include payments whose date_field is before this ISO date
+        statuses: Only these payment statuses
+        hospital_ids: Only payments for jobs at these hospitals (e.g. one HR user's)
+        date_field: Column for period bucketing and the date range: due, paid or created
+        now: Reference time for overdue (unpaid and past dueDate); defaults to
+             columns.reference (the dataset's latest timestamp), falling back to
+             the current time only for data without timestamps
+
+    Returns:
+        One summary row per non-empty group with count and amount per status,
+        total amount, and overdue count and amount
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period: {period}")
+    dates = getattr(columns, date_field)
+    mask = columns.status >= 0
+    if start:
+        mask &= dates >= np.datetime64(start.rstrip("Z"))
+    if end:
+        mask &= dates < np.datetime64(end.rstrip("Z"))
+    if statuses is not None:
+        mask &= np.isin(columns.status, [PAYMENT_STATUSES.index(s) for s in statuses])
+    if hospital_ids is not None:
+        wanted = [i for i, h in enumerate(columns.hospital_ids) if h in set(hospital_ids)]
+        mask &= np.isin(columns.hospital, wanted)
+    if "period" in by:
+        mask &= ~np.isnat(dates)
+
+    # One code per group: mixed-radix combination of the per-dimension codes,
+    # then compacted to the groups actually present so the bincounts below are
+    # sized by non-empty groups rather than the full cross product
+    dimensions = []
+    for dimension in by:
+        if dimension == "doctor":
+            dimensions.append((columns.doctor[mask], columns.doctor_ids))
+        elif dimension == "hospital":
+            dimensions.append((columns.hospital[mask], columns.hospital_ids))
+        elif dimension == "period":
+            dimensions.append(_period_codes(dates[mask], period))
+        else:
+            raise ValueError(f"Unknown group dimension: {dimension}")
+    group = np.zeros(int(mask.sum()), dtype=np.int64)
+    for codes, labels in dimensions:
+        group = group * len(labels) + codes
+    group_codes, group = np.unique(group, return_inverse=True)
+    group = group.reshape(-1)
+    num_groups = len(group_codes)
+
+    status = columns.status[mask].astype(np.int64)
+    amount = columns.amount[mask]
+    num_statuses = len(PAYMENT_STATUSES)
+    key = group * num_statuses + status
+    counts = np.bincount(key, minlength=num_groups * num_statuses).reshape(num_groups, num_statuses)
+    amounts = np.bincount(key, weights=amount, minlength=num_groups * num_statuses).reshape(num_groups, num_statuses)
+
+    reference = np.datetime64((now or columns.reference or datetime.utcnow()).replace(tzinfo=None), "us")
+    overdue = (status != _PAID) & (columns.due[mask] < reference)
+    overdue_counts = np.bincount(group[overdue], minlength=num_groups)
+    overdue_amounts = np.bincount(group[overdue], weights=amount[overdue], minlength=num_groups)
+
+    updated_at = get_current_timestamp()
+    rows = []
+    for g, code in enumerate(group_codes.tolist()):
+        group_labels = []
+        remainder = code
+        for _, labels in reversed(dimensions):
+            group_labels.insert(0, labels[remainder % len(labels)])
+            remainder //= len(labels)
+        row: Dict[str, Any] = {"id": "_".join(str(label) for label in group_labels)}
+        row.update({GROUP_FIELDS[dimension]: label for dimension, label in zip(by, group_labels)})
+        if "period" in by:
+            row["periodType"] = period
+        for s, status_name in enumerate(PAYMENT_STATUSES):
+            row[counter_field("payments", status_name)] = int(counts[g, s])
+            row[counter_field("payments", status_name, "Amount")] = round(float(amounts[g, s]), 2)
+        row["paymentsTotal"] = int(counts[g].sum())
+        row["paymentsTotalAmount"] = round(float(amounts[g].sum()), 2)
+        row["paymentsOverdue"] = int(overdue_counts[g])
+        row["paymentsOverdueAmount"] = round(float(overdue_amounts[g]), 2)
+        row["updatedAt"] = updated_at
+        rows.append(row)
+    return rows
+
+
+def summary_records(seed_data: Dict[str, List[Dict[str, Any]]], period: str = "month",
+                    now: Optional[datetime] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Precomputed summary rows per doctor, per hospital and per hospital and period"""
+    columns = PaymentColumns.from_seed_data(seed_data)
+    return {
+        "payroll_doctor_summaries": rollup(columns, ("doctor",), now=now),
+        "payroll_hospital_summaries": rollup(columns, ("hospital",), now=now),
+        "payroll_period_summaries": rollup(columns, ("hospital", "period"), period, now=now),
+    }
+
+
+def add_payroll_summaries(seed_data: Dict[str, List[Dict[str, Any]]], period: str = "month",
+                          now: Optional[datetime] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Return seed data extended with the payroll summary tables"""
+    return {**seed_data, **summary_records(seed_data, period, now)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+    from seed import generate_skewed_seed_data
+
+    parser = argparse.ArgumentParser(description='Roll up payments per doctor, hospital and period')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Use a skewed dataset with this many jobs (default: small seed data)')
+    parser.add_argument('--by', type=str, default='hospital,period',
+                       help='Comma-separated group dimensions: doctor, hospital, period (default: hospital,period)')
+    parser.add_argument('--period', type=str, choices=PERIODS, default='month', help='Period size (default: month)')
+    parser.add_argument('--start', type=str, help='Only payments due on or after this date')
+    parser.add_argument('--end', type=str, help='Only payments due before this date')
+    parser.add_argument('--status', type=str, action='append', choices=PAYMENT_STATUSES,
+                       help='Only this status (repeatable)')
+    parser.add_argument('--output', type=str, help='Write all summary tables to this JSON file')
+    parser.add_argument('--now', type=str,
+                       help='Reference time for --jobs data and overdue checks, e.g. 2025-06-01T00:00:00 '
+                            '(default: the dataset\'s latest createdAt/updatedAt)')
+
+    args = parser.parse_args()
+
+    now = datetime.fromisoformat(args.now) if args.now else None
+    seed_data = generate_skewed_seed_data(num_jobs=args.jobs, now=now) if args.jobs else generate_all_seed_data()
+
+    started = time.perf_counter()
+    columns = PaymentColumns.from_seed_data(seed_data)
+    loaded = time.perf_counter()
+    rows = rollup(columns, tuple(args.by.split(",")), args.period, args.start, args.end, args.status, now=now)
+    elapsed = time.perf_counter() - loaded
+
+    print("\n" + "="*60)
+    print(f"{len(rows)} groups from {len(columns)} payments "
+          f"(columns {loaded - started:.3f}s, rollup {elapsed:.3f}s)")
+    print("="*60)
+    for row in rows[:20]:
+        print(f"{row['id'][:45]:<45} paid {row['paymentsPaidAmount']:>10.2f}  "
+              f"pending {row['paymentsPendingAmount']:>9.2f}  overdue {row['paymentsOverdueAmount']:>9.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary_records(seed_data, args.period, now), f, indent=2, ensure_ascii=False)
+        print(f"\n[OK] Summary tables written to {args.output}")
@@ -0,0 +1,386 @@
+"""
+Denormalized Field Propagation
+Rewrites the fields that dependent records copy from a hospital or doctor
+(job hospitalName / hospitalImage / location and geo fields, feedback
+doctorName / doctorAvatar) in bounded, resumable batches on SQL, MongoDB and
+Firestore
+"""
+
+from geo_index import geo_fields
+from typing import List, Dict, Any, Optional, Tuple, Callable
+import json
+import os
+import sys
+import time
+
+
+class Denormalization:
+    """
+    Fields that `target` records copy from the `source` record they reference.
+
+    `fields` maps target field -> source field; `foreign_key` is the target
+    field holding the source record's ID. `derived` computes further target
+    fields from the source record (only those it returns are propagated).
+    """
+
+    def __init__(self, source: str, target: str, foreign_key: str, fields: Dict[str, str],
+                 derived: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+        self.source = source
+        self.target = target
+        self.foreign_key = foreign_key
+        self.fields = fields
+        self.derived = derived
+
+    def values(self, source_record: Dict[str, Any]) -> Dict[str, Any]:
+        """Target field values for a source record"""
+        values = {target_field: source_record.get(source_field) for target_field, source_field in self.fields.items()}
+        if self.derived is not None:
+            values.update(self.derived(source_record))
+        return values
+
+
+def hospital_geo_fields(hospital: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    latitude / longitude / geohash / geo as geo_index.add_geo_fields copies them
+    onto jobs, recomputed from the hospital's coordinates. Empty unless the data
+    was seeded with geo fields (the hospital carries a geohash), so tables
+    without those columns are left alone.
+    """
+    if hospital.get("geohash") is None or hospital.get("latitude") is None or hospital.get("longitude") is None:
+        return {}
+    return geo_fields(float(hospital["latitude"]), float(hospital["longitude"]))
+
+
+def source_updates(source: str, record: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Field updates for a source record plus the fields derived from them on the
+    record itself (a moved hospital's geohash / geo), so both stay consistent
+    """
+    updates = dict(updates)
+    if source == "hospitals" and ("latitude" in updates or "longitude" in updates):
+        for field in ("latitude", "longitude"):
+            if field in updates:
+                updates[field] = float(updates[field])
+        updates.update(hospital_geo_fields({**record, **updates}))
+    return updates
+
+
+# Copies made by seed_jobs / seed_feedback (and the skewed generator); table names as in COLLECTION_NAMES
+DENORMALIZATIONS = [
+    Denormalization("hospitals", "jobs", "hospitalId",
+                    {"hospitalName": "name", "hospitalImage": "image", "location": "location"},
+                    derived=hospital_geo_fields),
+    Denormalization("doctors", "feedback", "doctorId", {"doctorName": "name", "doctorAvatar": "avatar"}),
+]
+
+Cursor = Any
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class SQLPropagationBackend:
+    """
+    DB-API connection (sqlite3, psycopg, mysql-connector).
+
+    Finds stale dependents with WHERE fk = ? AND id > ? AND (any copied field
+    differs) ORDER BY id LIMIT n, served by an (fk, id) index, and rewrites
+    each batch with one UPDATE ... WHERE id IN (...) in its own transaction.
+    """
+
+    def __init__(self, conn, paramstyle: str = "?"):
+        self.conn = conn
+        self.p = paramstyle
+
+    @staticmethod
+    def _value(value: Any) -> Any:
+        # Same representation as seed_sql.escape_sql_string: lists and dicts (e.g. GeoJSON) as text
+        return str(value) if isinstance(value, (list, dict)) else value
+
+    def get(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT * FROM {table} WHERE id = {self.p}", [record_id])
+        row = cursor.fetchone()
+        return dict(zip([d[0] for d in cursor.description], row)) if row else None
+
+    def update_record(self, table: str, record_id: str, values: Dict[str, Any]):
+        cursor = self.conn.cursor()
+        cursor.execute(f"UPDATE {table} SET {', '.join(f'{k} = {self.p}' for k in values)} WHERE id = {self.p}",
+                       [self._value(v) for v in values.values()] + [record_id])
+        self.conn.commit()
+
+    def fetch_stale(self, spec: Denormalization, source_id: str, values: Dict[str, Any],
+                    after: Optional[Cursor], limit: int) -> Tuple[List[str], Optional[Cursor]]:
+        where = [f"{spec.foreign_key} = {self.p}"]
+        params: List[Any] = [source_id]
+        if after is not None:
+            where.append(f"id > {self.p}")
+            params.append(after)
+        differs = []
+        for field, value in values.items():
+            if value is None:
+                differs.append(f"{field} IS NOT NULL")
+            else:
+                differs.append(f"({field} IS NULL OR {field} <> {self.p})")
+                params.append(self._value(value))
+        where.append(f"({' OR '.join(differs)})")
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT id FROM {spec.target} WHERE {' AND '.join(where)} ORDER BY id LIMIT {int(limit)}",
+                       params)
+        ids = [row[0] for row in cursor.fetchall()]
+        return ids, (ids[-1] if ids else None)
+
+    def update(self, spec: Denormalization, source_id: str, ids: List[str], values: Dict[str, Any]):
+        assignments = ", ".join(f"{field} = {self.p}" for field in values)
+        placeholders = ", ".join(self.p for _ in ids)
+        cursor = self.conn.cursor()
+        # Re-check the foreign key so a dependent re-pointed since the fetch is left alone
+        cursor.execute(
+            f"UPDATE {spec.target} SET {assignments} WHERE id IN ({placeholders}) AND {spec.foreign_key} = {self.p}",
+            [self._value(v) for v in values.values()] + ids + [source_id],
+        )
+        self.conn.commit()
+
+    def resume_cursor(self, spec: Denormalization, last_id: str) -> Optional[Cursor]:
+        return last_id
+
+    def create_indexes(self, specs: List[Denormalization]):
+        """(foreign key, id) index per dependent table (SQLite / PostgreSQL syntax)"""
+        for spec in specs:
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{spec.target}_{spec.foreign_key}_id "
+                              f"ON {spec.target} ({spec.foreign_key}, id)")
+        self.conn.commit()
+
+
+class MongoPropagationBackend:
+    """pymongo (or mongomock) database; pages stale IDs on an (fk, id) index and rewrites them with update_many"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
+        return self.db[table].find_one({"id": record_id}, {"_id": 0})
+
+    def update_record(self, table: str, record_id: str, values: Dict[str, Any]):
+        self.db[table].update_one({"id": record_id}, {"$set": values})
+
+    @staticmethod
+    def _stale_filter(spec: Denormalization, source_id: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        return {spec.foreign_key: source_id, "$or": [{field: {"$ne": value}} for field, value in values.items()]}
+
+    def fetch_stale(self, spec: Denormalization, source_id: str, values: Dict[str, Any],
+                    after: Optional[Cursor], limit: int) -> Tuple[List[str], Optional[Cursor]]:
+        query = self._stale_filter(spec, source_id, values)
+        if after is not None:
+            query["id"] = {"$gt": after}
+        ids = [d["id"] for d in self.db[spec.target].find(query, {"_id": 0, "id": 1}).sort("id", 1).limit(limit)]
+        return ids, (ids[-1] if ids else None)
+
+    def update(self, spec: Denormalization, source_id: str, ids: List[str], values: Dict[str, Any]):
+        query = self._stale_filter(spec, source_id, values)
+        query["id"] = {"$in": ids}
+        self.db[spec.target].update_many(query, {"$set": values})
+
+    def resume_cursor(self, spec: Denormalization, last_id: str) -> Optional[Cursor]:
+        return last_id
+
+    def create_indexes(self, specs: List[Denormalization]):
+        for spec in specs:
+            self.db[spec.target].create_index([(spec.foreign_key, 1), ("id", 1)])
+
+
+class FirestorePropagationBackend:
+    """
+    Firestore client; pages dependents with where(fk == id) ordered by document
+    ID and start_after(snapshot), skips up-to-date ones in Python (Firestore
+    cannot OR inequalities across fields) and writes batches of up to 500 updates.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
+        snapshot = self.db.collection(table).document(record_id).get()
+        return {**snapshot.to_dict(), "id": snapshot.id} if snapshot.exists else None
+
+    def update_record(self, table: str, record_id: str, values: Dict[str, Any]):
+        self.db.collection(table).document(record_id).update(values)
+
+    def fetch_stale(self, spec: Denormalization, source_id: str, values: Dict[str, Any],
+                    after: Optional[Cursor], limit: int) -> Tuple[List[str], Optional[Cursor]]:
+        query = self.db.collection(spec.target).where(spec.foreign_key, "==", source_id).order_by("__name__")
+        if after is not None:
+            query = query.start_after(after)
+        snapshots = list(query.limit(limit).stream())
+        self._refs = {}
+        for snapshot in snapshots:
+            data = snapshot.to_dict()
+            if any(data.get(field) != value for field, value in values.items()):
+                self._refs[snapshot.id] = snapshot.reference
+        # The cursor covers the whole page, stale or not; an empty ID list with a cursor means "keep going"
+        return list(self._refs), (snapshots[-1] if snapshots else None)
+
+    def update(self, spec: Denormalization, source_id: str, ids: List[str], values: Dict[str, Any]):
+        for start in range(0, len(ids), 500):
+            batch = self.db.batch()
+            for record_id in ids[start:start + 500]:
+                batch.update(self._refs[record_id], values)
+            batch.commit()
+
+    def resume_cursor(self, spec: Denormalization, last_id: str) -> Optional[Cursor]:
+        snapshot = self.db.collection(spec.target).document(last_id).get()
+        return snapshot if snapshot.exists else None
+
+    def create_indexes(self, specs: List[Denormalization]):
+        pass  # Single-field equality plus document ID order needs no composite index
+
+
+# ============================================================================
+# PROPAGATION
+# ============================================================================
+
+def _cursor_id(cursor: Cursor) -> str:
+    return getattr(cursor, "id", cursor)
+
+
+def _load_checkpoint(path: Optional[str]) -> Dict[str, Any]:
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def _save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def propagate(backend, spec: Denormalization, source_record: Dict[str, Any], batch_size: int = 500,
+              checkpoint_path: Optional[str] = None, max_rows_per_second: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Bring every dependent of one source record up to date, batch by batch
+
+    Only dependents whose copied fields differ are rewritten, so re-running is
+    a no-op. With checkpoint_path, the last committed dependent ID is saved
+    after every batch and an interrupted run resumes from it (as long as the
+    values being propagated are the same); the entry is removed when done.
+
+    Args:
+        backend: SQL, Mongo or Firestore propagation backend
+        spec: Denormalization describing the copied fields
+        source_record: Current hospital / doctor record
+        batch_size: Maximum dependents fetched and rewritten per batch
+        checkpoint_path: JSON file holding resume positions
+        max_rows_per_second: Throttle; sleeps between batches to stay under this rate
+
+    Returns:
+        Summary with updated count, batches, whether it resumed, and elapsed seconds
+    """
+    source_id = source_record["id"]
+    values = spec.values(source_record)
+    key = f"{spec.target}:{spec.foreign_key}:{source_id}"
+    checkpoint = _load_checkpoint(checkpoint_path)
+    saved = checkpoint.get(key)
+    after = None
+    if saved and saved.get("values") == values:
+        after = backend.resume_cursor(spec, saved["after"])
+
+    summary = {"target": spec.target, "sourceId": source_id, "updated": 0, "batches": 0,
+               "resumed": after is not None, "seconds": 0.0}
+    started = time.perf_counter()
+    while True:
+        batch_started = time.perf_counter()
+        ids, cursor = backend.fetch_stale(spec, source_id, values, after, batch_size)
+        if cursor is None:
+            break
+        if ids:
+            backend.update(spec, source_id, ids, values)
+            summary["updated"] += len(ids)
+        summary["batches"] += 1
+        after = cursor
+        if checkpoint_path:
+            checkpoint[key] = {"after": _cursor_id(cursor), "values": values}
+            _save_checkpoint(checkpoint_path, checkpoint)
+        if max_rows_per_second:
+            elapsed = time.perf_counter() - batch_started
+            min_seconds = len(ids) / max_rows_per_second
+            if elapsed < min_seconds:
+                time.sleep(min_seconds - elapsed)
+
+    if checkpoint_path and key in checkpoint:
+        del checkpoint[key]
+        _save_checkpoint(checkpoint_path, checkpoint)
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+
+def propagate_source(backend, source: str, source_id: str, specs: Optional[List[Denormalization]] = None,
+                     **options) -> List[Dict[str, Any]]:
+    """Propagate one hospital / doctor to every table that copies from it; options go to propagate()"""
+    source_record = backend.get(source, source_id)
+    if source_record is None:
+        raise KeyError(f"{source} record not found: {source_id}")
+    results = []
+    for spec in specs or DENORMALIZATIONS:
+        if spec.source != source:
+            continue
+        result = propagate(backend, spec, source_record, **options)
+        print(f"[OK] Updated {result['updated']} {spec.target} record(s) for {source} {source_id} "
+              f"in {result['batches']} batch(es), {result['seconds']:.2f}s"
+              + (" (resumed)" if result["resumed"] else ""))
+        results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Update a hospital or doctor and propagate its copied fields')
+    parser.add_argument('source', type=str, choices=sorted({s.source for s in DENORMALIZATIONS}),
+                       help='Table of the record that changed')
+    parser.add_argument('id', type=str, help='ID of the record that changed')
+    parser.add_argument('--set', type=str, nargs='+', default=[], metavar='FIELD=VALUE',
+                       help='Update these fields on the record first (e.g. name="City Hospital")')
+    parser.add_argument('--sqlite', type=str, help='SQLite database file')
+    parser.add_argument('--mongodb', type=str, help='MongoDB connection string')
+    parser.add_argument('--database', type=str, default='drlocum', help='MongoDB database name (default: drlocum)')
+    parser.add_argument('--firestore', action='store_true', help='Use Firestore (default credentials)')
+    parser.add_argument('--batch-size', type=int, default=500, help='Dependents per batch (default: 500)')
+    parser.add_argument('--checkpoint', type=str, default='propagation_checkpoint.json',
+                       help='Resume file (default: propagation_checkpoint.json)')
+    parser.add_argument('--max-rows-per-second', type=float, help='Throttle the update rate')
+    parser.add_argument('--create-indexes', action='store_true', help='Create (foreign key, id) indexes first')
+
+    args = parser.parse_args()
+
+    if args.sqlite:
+        import sqlite3
+        backend = SQLPropagationBackend(sqlite3.connect(args.sqlite))
+    elif args.mongodb:
+        from pymongo import MongoClient
+        backend = MongoPropagationBackend(MongoClient(args.mongodb)[args.database])
+    elif args.firestore:
+        import firebase_admin
+        from firebase_admin import firestore
+        firebase_admin.initialize_app()
+        backend = FirestorePropagationBackend(firestore.client())
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+    if args.create_indexes:
+        backend.create_indexes(DENORMALIZATIONS)
+
+    try:
+        if args.set:
+            record = backend.get(args.source, args.id) or {}
+            updates = source_updates(args.source, record, dict(item.split("=", 1) for item in args.set))
+            backend.update_record(args.source, args.id, updates)
+        propagate_source(backend, args.source, args.id, batch_size=args.batch_size,
+                         checkpoint_path=args.checkpoint, max_rows_per_second=args.max_rows_per_second)
+    except Exception as e:
+        print(f"[ERROR] Propagation failed: {e}")
+        sys.exit(1)
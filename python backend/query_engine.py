@@ -0,0 +1,389 @@
+"""
+Local Firestore Query Engine
+In-memory document store that mirrors the composite indexes declared in
+firestore.indexes.json, so service queries can be checked without the emulator
+"""
+
+from seed import generate_all_seed_data, COLLECTION_NAMES
+from bisect import bisect_left, bisect_right, insort
+from functools import total_ordering
+from typing import List, Dict, Any, Optional, Tuple
+import json
+import os
+
+
+DEFAULT_INDEXES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "firestore.indexes.json")
+
+ASCENDING = "ASCENDING"
+DESCENDING = "DESCENDING"
+
+
+class MissingIndexError(Exception):
+    """Raised when no index can serve a query (Firestore FAILED_PRECONDITION)"""
+
+
+# ============================================================================
+# KEY ENCODING
+# ============================================================================
+
+def _value_key(value: Any) -> Tuple[int, Any]:
+    """Encode a value so mixed types sort in Firestore order (null < bool < number < string < other)"""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, str):
+        return (3, value)
+    return (4, json.dumps(value, sort_keys=True, default=str))
+
+
+@total_ordering
+class _Descending:
+    """Wrapper that reverses the ordering of an encoded key component"""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any):
+        self.key = key
+
+    def __eq__(self, other):
+        if not isinstance(other, _Descending):
+            return NotImplemented
+        return self.key == other.key
+
+    def __lt__(self, other):
+        if not isinstance(other, _Descending):
+            return NotImplemented
+        return other.key < self.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+
+class _Max:
+    """Sentinel that sorts after every key component (upper bound for prefix scans)"""
+
+    def __eq__(self, other):
+        return other is self
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return other is not self
+
+    def __hash__(self):
+        return id(self)
+
+
+_MAX = _Max()
+
+
+def _encode(value: Any, order: str) -> Any:
+    key = _value_key(value)
+    return _Descending(key) if order == DESCENDING else key
+
+
+# ============================================================================
+# INDEXES
+# ============================================================================
+
+class SortedIndex:
+    """
+    Sorted list of (encoded field values..., encoded doc id) tuples.
+
+    Documents that are missing any indexed field are not indexed, as in Firestore.
+    """
+
+    def __init__(self, fields: List[Tuple[str, str]]):
+        self.fields = fields
+        # Ties are broken by document ID in the direction of the last field
+        self.id_order = fields[-1][1] if fields else ASCENDING
+        self.keys: List[tuple] = []
+
+    def key_for(self, doc_id: str, doc: Dict[str, Any]) -> Optional[tuple]:
+        parts = []
+        for field_path, order in self.fields:
+            if field_path not in doc:
+                return None
+            parts.append(_encode(doc[field_path], order))
+        parts.append(_encode(doc_id, self.id_order))
+        return tuple(parts)
+
+    def add(self, doc_id: str, doc: Dict[str, Any]):
+        key = self.key_for(doc_id, doc)
+        if key is not None:
+            insort(self.keys, key)
+
+    def remove(self, doc_id: str, doc: Dict[str, Any]):
+        key = self.key_for(doc_id, doc)
+        if key is None:
+            return
+        pos = bisect_left(self.keys, key)
+        if pos < len(self.keys) and self.keys[pos] == key:
+            del self.keys[pos]
+
+    def build(self, docs: Dict[str, Dict[str, Any]]):
+        keys = (self.key_for(doc_id, doc) for doc_id, doc in docs.items())
+        self.keys = sorted(k for k in keys if k is not None)
+
+    def prefix_range(self, values: List[Any]) -> Tuple[int, int]:
+        """Return the [start, end) slice of keys whose leading fields equal values"""
+        prefix = tuple(_encode(v, order) for v, (_, order) in zip(values, self.fields))
+        start = bisect_left(self.keys, prefix)
+        end = bisect_right(self.keys, prefix + (_MAX,), lo=start)
+        return start, end
+
+    @staticmethod
+    def doc_id(key: tuple) -> str:
+        last = key[-1]
+        if isinstance(last, _Descending):
+            last = last.key
+        return last[1]
+
+
+def load_index_definitions(indexes_path: str = DEFAULT_INDEXES_PATH) -> Dict[str, List[List[Tuple[str, str]]]]:
+    """
+    Load composite index definitions from firestore.indexes.json
+
+    Returns:
+        Mapping of collection name to a list of index field lists
+    """
+    with open(indexes_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    definitions: Dict[str, List[List[Tuple[str, str]]]] = {}
+    for index in config.get("indexes", []):
+        fields = [(field["fieldPath"], field.get("order", ASCENDING)) for field in index["fields"]]
+        definitions.setdefault(index["collectionGroup"], []).append(fields)
+    return definitions
+
+
+# ============================================================================
+# COLLECTIONS AND QUERIES
+# ============================================================================
+
+class Collection:
+    """Documents of one collection plus their composite and single-field indexes"""
+
+    def __init__(self, name: str, composite_indexes: List[List[Tuple[str, str]]]):
+        self.name = name
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.composite_indexes = [SortedIndex(fields) for fields in composite_indexes]
+        # Firestore indexes every field automatically; built lazily on first use
+        self.single_field_indexes: Dict[str, SortedIndex] = {}
+
+    def load(self, records: List[Dict[str, Any]]):
+        for record in records:
+            self.docs[record["id"]] = record
+        for index in self.composite_indexes:
+            index.build(self.docs)
+        self.single_field_indexes.clear()
+
+    def _single_field_index(self, field_path: str) -> SortedIndex:
+        index = self.single_field_indexes.get(field_path)
+        if index is None:
+            index = SortedIndex([(field_path, ASCENDING)])
+            index.build(self.docs)
+            self.single_field_indexes[field_path] = index
+        return index
+
+    def _all_indexes(self) -> List[SortedIndex]:
+        return self.composite_indexes + list(self.single_field_indexes.values())
+
+    def set(self, doc_id: str, data: Dict[str, Any]):
+        """Create or replace a document, keeping every index in sync"""
+        self.delete(doc_id)
+        doc = {**data, "id": doc_id}
+        self.docs[doc_id] = doc
+        for index in self._all_indexes():
+            index.add(doc_id, doc)
+
+    def update(self, doc_id: str, changes: Dict[str, Any]):
+        """Merge changes into an existing document"""
+        if doc_id not in self.docs:
+            raise KeyError(f"No document '{doc_id}' in '{self.name}'")
+        self.set(doc_id, {**self.docs[doc_id], **changes})
+
+    def delete(self, doc_id: str):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for index in self._all_indexes():
+            index.remove(doc_id, doc)
+
+    def document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        return self.docs.get(doc_id)
+
+    def where(self, field_path: str, op: str, value: Any) -> "Query":
+        return Query(self).where(field_path, op, value)
+
+    def order_by(self, field_path: str, direction: str = ASCENDING) -> "Query":
+        return Query(self).order_by(field_path, direction)
+
+    def limit(self, count: int) -> "Query":
+        return Query(self).limit(count)
+
+
+class Query:
+    """
+    Immutable equality + orderBy + limit query.
+
+    Served from a sorted index in O(log n + limit); raises MissingIndexError
+    whenever Firestore itself would require a composite index.
+    """
+
+    def __init__(self, collection: Collection, filters: Tuple = (), order: Optional[Tuple[str, str]] = None,
+                 limit_count: Optional[int] = None):
+        self.collection = collection
+        self.filters = filters
+        self.order = order
+        self.limit_count = limit_count
+
+    def where(self, field_path: str, op: str, value: Any) -> "Query":
+        if op != "==":
+            raise ValueError(f"Only equality filters are supported, got '{op}'")
+        return Query(self.collection, self.filters + ((field_path, value),), self.order, self.limit_count)
+
+    def order_by(self, field_path: str, direction: str = ASCENDING) -> "Query":
+        direction = direction.upper()
+        if direction not in (ASCENDING, DESCENDING):
+            raise ValueError(f"Invalid direction '{direction}'")
+        return Query(self.collection, self.filters, (field_path, direction), self.limit_count)
+
+    def limit(self, count: int) -> "Query":
+        return Query(self.collection, self.filters, self.order, count)
+
+    def _find_composite(self) -> Optional[SortedIndex]:
+        eq_fields = {field_path for field_path, _ in self.filters}
+        for index in self.collection.composite_indexes:
+            fields = index.fields
+            if len(fields) != len(eq_fields) + 1:
+                continue
+            if {f for f, _ in fields[:-1]} == eq_fields and fields[-1] == self.order:
+                return index
+        return None
+
+    def _missing_index_error(self) -> MissingIndexError:
+        fields = [{"fieldPath": f, "order": ASCENDING} for f, _ in self.filters]
+        fields.append({"fieldPath": self.order[0], "order": self.order[1]})
+        definition = {"collectionGroup": self.collection.name, "queryScope": "COLLECTION", "fields": fields}
+        return MissingIndexError(
+            f"The query requires an index. Add to firestore.indexes.json: {json.dumps(definition)}"
+        )
+
+    def explain(self) -> str:
+        """Describe which index serves the query"""
+        if self.order is None or (not self.filters) or (
+                len(self.filters) == 1 and self.filters[0][0] == self.order[0]):
+            return "single-field index"
+        index = self._find_composite()
+        if index is None:
+            raise self._missing_index_error()
+        return "composite index (" + ", ".join(f"{f} {o}" for f, o in index.fields) + ")"
+
+    def get(self) -> List[Dict[str, Any]]:
+        """Execute the query and return matching documents"""
+        docs = self.collection.docs
+
+        if self.order is None:
+            if not self.filters:
+                ids = sorted(docs)
+            else:
+                # Equality-only: merge single-field indexes, driven by the most selective one
+                ranges = []
+                for field_path, value in self.filters:
+                    index = self.collection._single_field_index(field_path)
+                    start, end = index.prefix_range([value])
+                    ranges.append((end - start, index, start, end))
+                _, index, start, end = min(ranges, key=lambda r: r[0])
+                candidates = (SortedIndex.doc_id(key) for key in index.keys[start:end])
+                ids = sorted(
+                    doc_id for doc_id in candidates
+                    if all(f in docs[doc_id] and _value_key(docs[doc_id][f]) == _value_key(v) for f, v in self.filters)
+                )
+            if self.limit_count is not None:
+                ids = ids[:self.limit_count]
+            return [docs[doc_id] for doc_id in ids]
+
+        order_field, direction = self.order
+        if not self.filters or (len(self.filters) == 1 and self.filters[0][0] == order_field):
+            index = self.collection._single_field_index(order_field)
+            start, end = index.prefix_range([v for _, v in self.filters])
+            reverse = direction == DESCENDING
+        else:
+            index = self._find_composite()
+            if index is None:
+                raise self._missing_index_error()
+            by_field = dict(self.filters)
+            start, end = index.prefix_range([by_field[f] for f, _ in index.fields[:-1]])
+            reverse = False
+
+        count = end - start if self.limit_count is None else min(self.limit_count, end - start)
+        if reverse:
+            keys = index.keys[end - count:end][::-1]
+        else:
+            keys = index.keys[start:start + count]
+        return [docs[SortedIndex.doc_id(key)] for key in keys]
+
+
+class InMemoryFirestore:
+    """Collection registry with indexes taken from firestore.indexes.json"""
+
+    def __init__(self, indexes_path: str = DEFAULT_INDEXES_PATH):
+        self.index_definitions = load_index_definitions(indexes_path)
+        self.collections: Dict[str, Collection] = {}
+
+    def collection(self, name: str) -> Collection:
+        if name not in self.collections:
+            self.collections[name] = Collection(name, self.index_definitions.get(name, []))
+        return self.collections[name]
+
+    @classmethod
+    def from_seed_data(cls, seed_data: Dict[str, List[Dict[str, Any]]],
+                       indexes_path: str = DEFAULT_INDEXES_PATH) -> "InMemoryFirestore":
+        """Load generate_all_seed_data() output and build all composite indexes"""
+        store = cls(indexes_path)
+        for seed_key, collection_name in COLLECTION_NAMES.items():
+            store.collection(collection_name).load(seed_data.get(seed_key, []))
+        return store
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run service queries against an in-memory Firestore')
+    parser.add_argument('--indexes', type=str, default=DEFAULT_INDEXES_PATH,
+                       help='Path to firestore.indexes.json')
+
+    args = parser.parse_args()
+
+    seed_data = generate_all_seed_data()
+    store = InMemoryFirestore.from_seed_data(seed_data, args.indexes)
+
+    hr_id = seed_data["hospitals"][0]["managedBy"]
+    doctor_id = seed_data["doctors"][0]["id"]
+    user_id = seed_data["users"][0]["id"]
+
+    queries = {
+        "jobs by status": store.collection("jobs").where("status", "==", "Open")
+            .order_by("createdAt", DESCENDING),
+        "jobs by status + createdBy": store.collection("jobs").where("status", "==", "Open")
+            .where("createdBy", "==", hr_id).order_by("createdAt", DESCENDING),
+        "shifts by doctor": store.collection("shifts").where("doctorId", "==", doctor_id)
+            .order_by("date"),
+        "notifications by user": store.collection("notifications").where("userId", "==", user_id)
+            .order_by("timestamp", DESCENDING).limit(50),
+        "unindexed: jobs by hospital + date": store.collection("jobs").where("hospitalId", "==", "x")
+            .order_by("date"),
+    }
+
+    print("\n" + "="*60)
+    for name, query in queries.items():
+        try:
+            results = query.get()
+            print(f"[OK] {name}: {len(results)} results via {query.explain()}")
+        except MissingIndexError as e:
+            print(f"[ERROR] {name}: {e}")
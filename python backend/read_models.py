@@ -0,0 +1,290 @@
+"""
+Dashboard Read Models
+Precomputed aggregate documents for the HR dashboard, doctor views and hospital
+job stats, plus O(1) incremental maintenance on status changes
+"""
+
+from seed import generate_all_seed_data, get_current_timestamp
+from typing import List, Dict, Any, Optional
+
+
+# Read model keys mapped to table / collection names
+READ_MODEL_COLLECTIONS = {
+    "hr_dashboards": "hr_dashboards",
+    "doctor_summaries": "doctor_summaries",
+    "hospital_job_stats": "hospital_job_stats",
+}
+
+JOB_STATUSES = ["Open", "Applied", "Approved", "Taken", "Completed", "Cancelled"]
+APPLICATION_STATUSES = ["Pending", "Approved", "Rejected"]
+SHIFT_STATUSES = ["Scheduled", "Started", "Exit Pending", "Completed"]
+PAYMENT_STATUSES = ["Pending", "Processing", "Paid"]
+
+ACTIVE_JOB_STATUSES = {"Open", "Applied", "Approved", "Taken"}
+
+
+def counter_field(prefix: str, status: str, suffix: str = "") -> str:
+    """Flat counter name, e.g. ("shifts", "Exit Pending") -> "shiftsExitPending" """
+    return prefix + status.replace(" ", "") + suffix
+
+
+def _money(value: float) -> float:
+    """
+    Round an amount counter to cents after every change, so any order of adds
+    and subtracts (incremental updates, full rebuilds, event replay) lands on
+    the same value instead of accumulating float error (+ 0.0 turns -0.0 into 0.0)
+    """
+    return round(value, 2) + 0.0
+
+
+def _empty_counters(prefix: str, statuses: List[str], with_amount: bool = False) -> Dict[str, Any]:
+    counters = {}
+    for status in statuses:
+        counters[counter_field(prefix, status)] = 0
+        if with_amount:
+            counters[counter_field(prefix, status, "Amount")] = 0
+    return counters
+
+
+def empty_hr_dashboard(hr_id: str) -> Dict[str, Any]:
+    return {
+        "id": hr_id,
+        "hrId": hr_id,
+        "totalJobs": 0,
+        "activeJobs": 0,
+        "pendingApprovals": 0,
+        **_empty_counters("jobs", JOB_STATUSES),
+        **_empty_counters("payments", PAYMENT_STATUSES, with_amount=True),
+        "updatedAt": get_current_timestamp(),
+    }
+
+
+def empty_doctor_summary(doctor_id: str) -> Dict[str, Any]:
+    # Application tabs: All, Pending, Approved, Completed (approved on a completed job)
+    return {
+        "id": doctor_id,
+        "doctorId": doctor_id,
+        "applicationsAll": 0,
+        **_empty_counters("applications", APPLICATION_STATUSES),
+        "applicationsCompleted": 0,
+        **_empty_counters("shifts", SHIFT_STATUSES),
+        **_empty_counters("payments", PAYMENT_STATUSES, with_amount=True),
+        "updatedAt": get_current_timestamp(),
+    }
+
+
+def empty_hospital_job_stats(hospital_id: str, hr_id: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "id": hospital_id,
+        "hospitalId": hospital_id,
+        "managedBy": hr_id,
+        "totalJobs": 0,
+        "activeJobs": 0,
+        "urgentActiveJobs": 0,
+        "totalApplicants": 0,
+        **_empty_counters("jobs", JOB_STATUSES),
+        "updatedAt": get_current_timestamp(),
+    }
+
+
+class ReadModels:
+    """
+    Aggregate documents keyed by entity ID, with O(1) updates per status change.
+
+    Each apply_* method takes the record plus its old and new status; pass
+    old_status=None for an insert and new_status=None for a delete.
+    """
+
+    def __init__(self):
+        self.hr_dashboards: Dict[str, Dict[str, Any]] = {}
+        self.doctor_summaries: Dict[str, Dict[str, Any]] = {}
+        self.hospital_job_stats: Dict[str, Dict[str, Any]] = {}
+        # job ID -> (createdBy, hospitalId, approvedDoctorId, status), enough to route
+        # application and payment changes without reading the job again
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    # ------------------------------------------------------------------
+    # Document access
+    # ------------------------------------------------------------------
+
+    def _hr(self, hr_id: str) -> Dict[str, Any]:
+        doc = self.hr_dashboards.get(hr_id)
+        if doc is None:
+            doc = self.hr_dashboards[hr_id] = empty_hr_dashboard(hr_id)
+        return doc
+
+    def _doctor(self, doctor_id: str) -> Dict[str, Any]:
+        doc = self.doctor_summaries.get(doctor_id)
+        if doc is None:
+            doc = self.doctor_summaries[doctor_id] = empty_doctor_summary(doctor_id)
+        return doc
+
+    def _hospital(self, hospital_id: str, hr_id: Optional[str] = None) -> Dict[str, Any]:
+        doc = self.hospital_job_stats.get(hospital_id)
+        if doc is None:
+            doc = self.hospital_job_stats[hospital_id] = empty_hospital_job_stats(hospital_id, hr_id)
+        return doc
+
+    @staticmethod
+    def _move(doc: Dict[str, Any], prefix: str, old_status: Optional[str], new_status: Optional[str],
+              amount: float = None):
+        if old_status is not None:
+            doc[counter_field(prefix, old_status)] = doc.get(counter_field(prefix, old_status), 0) - 1
+            if amount is not None:
+                key = counter_field(prefix, old_status, "Amount")
+                doc[key] = _money(doc.get(key, 0) - amount)
+        if new_status is not None:
+            doc[counter_field(prefix, new_status)] = doc.get(counter_field(prefix, new_status), 0) + 1
+            if amount is not None:
+                key = counter_field(prefix, new_status, "Amount")
+                doc[key] = _money(doc.get(key, 0) + amount)
+        doc["updatedAt"] = get_current_timestamp()
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    def apply_job(self, job: Dict[str, Any], old_status: Optional[str], new_status: Optional[str]):
+        """Job posted (old_status=None), moved between statuses, or deleted (new_status=None)"""
+        if old_status == new_status:
+            return
+        hr = self._hr(job["createdBy"])
+        hospital = self._hospital(job["hospitalId"], job["createdBy"])
+        delta_total = (old_status is None) - (new_status is None)
+        was_active = old_status in ACTIVE_JOB_STATUSES
+        is_active = new_status in ACTIVE_JOB_STATUSES
+
+        self._move(hr, "jobs", old_status, new_status)
+        hr["totalJobs"] += delta_total
+        hr["activeJobs"] += is_active - was_active
+
+        self._move(hospital, "jobs", old_status, new_status)
+        hospital["totalJobs"] += delta_total
+        hospital["activeJobs"] += is_active - was_active
+        if job.get("urgent"):
+            hospital["urgentActiveJobs"] += is_active - was_active
+
+        cached = self._jobs.get(job["id"], {})
+        doctor_id = job.get("approvedDoctorId") or cached.get("approvedDoctorId")
+        if doctor_id:
+            summary = self._doctor(doctor_id)
+            summary["applicationsCompleted"] += (new_status == "Completed") - (old_status == "Completed")
+
+        if new_status is None:
+            self._jobs.pop(job["id"], None)
+        else:
+            self._jobs[job["id"]] = {"createdBy": job["createdBy"], "hospitalId": job["hospitalId"],
+                                     "approvedDoctorId": doctor_id, "status": new_status}
+
+    def apply_application(self, application: Dict[str, Any], old_status: Optional[str], new_status: Optional[str]):
+        """Application submitted, approved/rejected, or withdrawn"""
+        if old_status == new_status:
+            return
+        summary = self._doctor(application["doctorId"])
+        self._move(summary, "applications", old_status, new_status)
+        summary["applicationsAll"] += (old_status is None) - (new_status is None)
+
+        job = self._jobs.get(application["jobId"])
+        if job is None:
+            return
+        hr = self._hr(job["createdBy"])
+        hr["pendingApprovals"] += (new_status == "Pending") - (old_status == "Pending")
+        hospital = self._hospital(job["hospitalId"], job["createdBy"])
+        hospital["totalApplicants"] += (old_status is None) - (new_status is None)
+        hospital["updatedAt"] = hr["updatedAt"] = summary["updatedAt"]
+
+        if new_status == "Approved":
+            job["approvedDoctorId"] = application["doctorId"]
+            if job["status"] == "Completed":
+                summary["applicationsCompleted"] += 1
+        elif old_status == "Approved":
+            if job["status"] == "Completed":
+                summary["applicationsCompleted"] -= 1
+            # A later move to Completed must not credit a doctor who is no longer approved
+            if job.get("approvedDoctorId") == application["doctorId"]:
+                job["approvedDoctorId"] = None
+
+    def apply_shift(self, shift: Dict[str, Any], old_status: Optional[str], new_status: Optional[str]):
+        """Shift scheduled, started, exit pending, completed, or removed"""
+        if old_status == new_status:
+            return
+        self._move(self._doctor(shift["doctorId"]), "shifts", old_status, new_status)
+
+    def apply_payment(self, payment: Dict[str, Any], old_status: Optional[str], new_status: Optional[str]):
+        """Payment created, moved to Processing/Paid, or removed"""
+        if old_status == new_status:
+            return
+        amount = payment.get("amount") or 0
+        self._move(self._doctor(payment["doctorId"]), "payments", old_status, new_status, amount)
+        job = self._jobs.get(payment["jobId"])
+        if job is not None:
+            self._move(self._hr(job["createdBy"]), "payments", old_status, new_status, amount)
+
+    def apply_status_change(self, table: str, record: Dict[str, Any], old_status: Optional[str],
+                            new_status: Optional[str]):
+        """Dispatch a status change by seed data key ("jobs", "applications", "shifts", "payments")"""
+        handlers = {
+            "jobs": self.apply_job,
+            "applications": self.apply_application,
+            "shifts": self.apply_shift,
+            "payments": self.apply_payment,
+        }
+        if table in handlers:
+            handlers[table](record, old_status, new_status)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def to_seed_data(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            "hr_dashboards": list(self.hr_dashboards.values()),
+            "doctor_summaries": list(self.doctor_summaries.values()),
+            "hospital_job_stats": list(self.hospital_job_stats.values()),
+        }
+
+
+def build_read_models(seed_data: Dict[str, List[Dict[str, Any]]]) -> ReadModels:
+    """Build all read models in one pass over jobs, applications, shifts and payments"""
+    models = ReadModels()
+
+    for user in seed_data.get("users", []):
+        if user["userType"] == "hr":
+            models._hr(user["id"])
+    for doctor in seed_data.get("doctors", []):
+        models._doctor(doctor["id"])
+    for hospital in seed_data.get("hospitals", []):
+        models._hospital(hospital["id"], hospital["managedBy"])
+
+    for job in seed_data.get("jobs", []):
+        # The approved doctor is attributed from the application rows below
+        models.apply_job({**job, "approvedDoctorId": None}, None, job["status"])
+    for application in seed_data.get("applications", []):
+        models.apply_application(application, None, application["status"])
+    for shift in seed_data.get("shifts", []):
+        models.apply_shift(shift, None, shift["status"])
+    for payment in seed_data.get("payments", []):
+        models.apply_payment(payment, None, payment["status"])
+
+    return models
+
+
+def add_read_models(seed_data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Return seed_data with the read model collections added"""
+    read_models = build_read_models(seed_data).to_seed_data()
+    for key, records in read_models.items():
+        print(f"Generated {len(records)} {key.replace('_', ' ')}")
+    return {**seed_data, **read_models}
+
+
+if __name__ == "__main__":
+    """Example usage - print dashboard read models as JSON"""
+    import json
+
+    seed_data = add_read_models(generate_all_seed_data())
+
+    hr_id = seed_data["hr_dashboards"][0]["hrId"]
+    print("\n" + "="*50)
+    print(f"HR DASHBOARD ({hr_id})")
+    print("="*50)
+    print(json.dumps(seed_data["hr_dashboards"][0], indent=2))
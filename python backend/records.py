@@ -0,0 +1,268 @@
+"""
+Compact Record Storage
+Column-ordered tuple rows with a shared per-table schema, interned repeated
+strings and aliased duplicate fields; dicts are only built at the sink boundary
+"""
+
+from seed import generate_all_seed_data
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Iterator
+import sys
+import uuid
+
+
+# Columns whose values repeat across rows (enums, names, FKs to small tables)
+INTERNED_COLUMNS = {
+    "status", "role", "specialty", "shift", "duration", "dutyType", "publishTo", "time", "startTime", "endTime",
+    "hospitalName", "hospitalLogo", "hospitalImage", "location",
+    "userType", "type", "title", "issueType", "from", "relatedEntityType", "doctorName", "doctorAvatar",
+    "jobTitle", "description", "coverNote", "comment", "message", "actionUrl", "about", "name",
+}
+
+# UUID columns, stored as 16 shared bytes instead of a 36-char string
+ID_COLUMNS = {
+    "id", "userId", "doctorId", "hospitalId", "jobId", "shiftId", "hrId", "createdBy", "managedBy",
+    "approvedDoctorId", "relatedEntityId",
+}
+
+# Columns holding lists of UUIDs
+ID_LIST_COLUMNS = {"appliedJobs", "approvedJobs", "specificDoctors", "hospitals"}
+
+# ISO timestamp columns, stored as integer microseconds since the epoch
+TIMESTAMP_COLUMNS = {
+    "createdAt", "updatedAt", "date", "startDate", "endDate", "appliedAt", "timestamp", "uploadedAt",
+    "addedAt", "dueDate", "paidDate", "actualStartTime", "actualEndTime", "checkIn", "checkOut",
+}
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Duplicate fields: alias column -> canonical column it mirrors
+COLUMN_ALIASES = {
+    "jobs": {
+        "applicantsCount": "applicants",
+        "qualifications": "requirements",
+        "paymentPerHour": "pay",
+        "date": "startDate",
+    },
+}
+
+_MISSING = object()
+
+
+def _encode_id(value: str) -> Any:
+    try:
+        encoded = uuid.UUID(value)
+    except (ValueError, AttributeError, TypeError):
+        return value
+    # Only compact canonical lowercase UUIDs so decoding is exact
+    return encoded.bytes if str(encoded) == value else value
+
+
+def _decode_id(value: bytes) -> str:
+    return str(uuid.UUID(bytes=value))
+
+
+def _encode_timestamp(value: str) -> Any:
+    if not value.endswith("Z"):
+        return value
+    try:
+        dt = datetime.fromisoformat(value[:-1])
+    except ValueError:
+        return value
+    if dt.tzinfo is not None or dt.isoformat() + "Z" != value:
+        return value
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _decode_timestamp(value: int) -> str:
+    return (_EPOCH + timedelta(microseconds=value)).isoformat() + "Z"
+
+
+class CompactTable:
+    """
+    Rows of one table as tuples in schema column order.
+
+    Alias columns are not stored; they are read from their canonical column,
+    with per-row overrides for the rare rows where the two differ.
+    """
+
+    def __init__(self, name: str, columns: List[str], aliases: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.columns = list(columns)
+        self.aliases = {a: c for a, c in (aliases or {}).items() if a in columns and c in columns}
+        self.stored_columns = [c for c in self.columns if c not in self.aliases]
+        self.positions = {c: i for i, c in enumerate(self.stored_columns)}
+        self.codecs = [
+            "id" if c == "id" else "fk" if c in ID_COLUMNS or c in ID_LIST_COLUMNS else "timestamp" if c in TIMESTAMP_COLUMNS else "intern" if c in INTERNED_COLUMNS
+            else None
+            for c in self.stored_columns
+        ]
+        self.rows: List[tuple] = []
+        self.overrides: Dict[int, Dict[str, Any]] = {}
+        # Shared immutable copies of list values (e.g. ("MBBS", "MD")) and of encoded foreign keys
+        self._tuples: Dict[tuple, tuple] = {}
+        self._ids: Dict[bytes, bytes] = {}
+
+    def _compact_value(self, value: Any, codec: Optional[str]) -> Any:
+        if isinstance(value, str):
+            if codec == "id":
+                return _encode_id(value)
+            if codec == "fk":
+                # Foreign keys repeat across rows, so share one bytes object per value
+                encoded = _encode_id(value)
+                return self._ids.setdefault(encoded, encoded) if isinstance(encoded, bytes) else value
+            if codec == "timestamp":
+                return _encode_timestamp(value)
+            return sys.intern(value) if codec == "intern" else value
+        if isinstance(value, list):
+            if codec == "fk":
+                # ID lists are mostly unique per row; share the IDs, not the tuple
+                return tuple(self._compact_value(v, codec) for v in value)
+            items = tuple(sys.intern(v) if isinstance(v, str) else v for v in value)
+            try:
+                return self._tuples.setdefault(items, items)
+            except TypeError:
+                return value
+        return value
+
+    def append(self, record: Dict[str, Any]):
+        row = tuple(
+            self._compact_value(record.get(column, _MISSING), codec)
+            for column, codec in zip(self.stored_columns, self.codecs)
+        )
+        index = len(self.rows)
+        self.rows.append(row)
+        for alias, canonical in self.aliases.items():
+            value = record.get(alias, _MISSING)
+            if value != record.get(canonical, _MISSING):
+                self.overrides.setdefault(index, {})[alias] = value
+        extra = set(record) - set(self.columns)
+        if extra:
+            self.overrides.setdefault(index, {}).update({c: record[c] for c in extra})
+
+    @staticmethod
+    def _expand(value: Any, codec: Optional[str]) -> Any:
+        if isinstance(value, tuple):
+            return [CompactTable._expand(v, codec) for v in value]
+        if codec in ("id", "fk") and isinstance(value, bytes):
+            return _decode_id(value)
+        if codec == "timestamp" and isinstance(value, int):
+            return _decode_timestamp(value)
+        return value
+
+    def get(self, index: int, column: str) -> Any:
+        override = self.overrides.get(index)
+        if override is not None and column in override:
+            value = override[column]
+        else:
+            position = self.positions[self.aliases.get(column, column)]
+            value = self._expand(self.rows[index][position], self.codecs[position])
+        return None if value is _MISSING else value
+
+    def row_dict(self, index: int) -> Dict[str, Any]:
+        """Materialize one row as a plain dict (original strings and lists restored) for a backend sink"""
+        row = self.rows[index]
+        record = {}
+        for column in self.columns:
+            position = self.positions[self.aliases.get(column, column)]
+            record[column] = self._expand(row[position], self.codecs[position])
+        override = self.overrides.get(index)
+        if override:
+            record.update(override)
+        return {k: v for k, v in record.items() if v is not _MISSING}
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self.rows)):
+            yield self.row_dict(index)
+
+    def column(self, column: str) -> Iterator[Any]:
+        """Iterate one (decoded) column without building dicts"""
+        return (self.get(i, column) for i in range(len(self.rows)))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class CompactDataset:
+    """All seed tables in compact form, keyed like generate_all_seed_data() output"""
+
+    def __init__(self):
+        self.tables: Dict[str, CompactTable] = {}
+
+    @classmethod
+    def from_seed_data(cls, seed_data: Dict[str, List[Dict[str, Any]]], release: bool = False) -> "CompactDataset":
+        """
+        Convert seed data table by table
+
+        Args:
+            seed_data: generate_all_seed_data() style dict of record lists
+            release: Empty each source list once converted, so peak memory is
+                     one table of dicts rather than the whole dataset
+        """
+        dataset = cls()
+        for key in list(seed_data):
+            records = seed_data[key]
+            columns = list(dict.fromkeys(c for record in records[:100] for c in record))
+            table = CompactTable(key, columns, COLUMN_ALIASES.get(key))
+            for record in records:
+                table.append(record)
+            dataset.tables[key] = table
+            if release:
+                records.clear()
+        return dataset
+
+    def iter_table(self, key: str) -> Iterator[Dict[str, Any]]:
+        table = self.tables.get(key)
+        return table.iter_dicts() if table is not None else iter(())
+
+    def to_seed_data(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {key: list(table.iter_dicts()) for key, table in self.tables.items()}
+
+    def __getitem__(self, key: str) -> CompactTable:
+        return self.tables[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.tables
+
+
+def estimate_bytes(obj: Any, seen: Optional[set] = None) -> int:
+    """Deep memory estimate; shared (interned / deduplicated) objects are counted once"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_bytes(k, seen) + estimate_bytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(estimate_bytes(item, seen) for item in obj)
+    elif isinstance(obj, CompactTable):
+        size += estimate_bytes(obj.rows, seen) + estimate_bytes(obj.overrides, seen) + estimate_bytes(obj._ids, seen)
+    elif isinstance(obj, CompactDataset):
+        size += estimate_bytes(list(obj.tables.values()), seen)
+    return size
+
+
+if __name__ == "__main__":
+    import argparse
+    from seed import generate_skewed_seed_data
+
+    parser = argparse.ArgumentParser(description='Compare dict and compact record memory use')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Use a skewed dataset with this many jobs (default: small seed data)')
+
+    args = parser.parse_args()
+
+    seed_data = generate_skewed_seed_data(num_jobs=args.jobs) if args.jobs else generate_all_seed_data()
+    dict_bytes = {key: estimate_bytes(records) for key, records in seed_data.items()}
+    dataset = CompactDataset.from_seed_data(seed_data)
+
+    print("\n" + "="*60)
+    print(f"{'table':<20}{'rows':>10}{'dict KB':>12}{'compact KB':>12}{'ratio':>6}")
+    print("="*60)
+    for key, table in dataset.tables.items():
+        compact = estimate_bytes(table)
+        ratio = dict_bytes[key] / compact if compact else 0
+        print(f"{key:<20}{len(table):>10}{dict_bytes[key] // 1024:>12}{compact // 1024:>12}{ratio:>6.1f}")
@@ -0,0 +1,330 @@
+"""
+Retention Pruning
+Archives expired rows of high-churn tables (notifications, admin messages) to
+compressed NDJSON and deletes them in throttled, keyset-paginated chunks on
+SQL, MongoDB and Firestore
+"""
+
+from seed_sql import open_part_writer
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Callable, Tuple
+import json
+import os
+import sys
+import time
+
+
+class RetentionPolicy:
+    """
+    Which rows of a table expire.
+
+    A row expires when its timestamp_field is older than max_age_days and it
+    equals every value in `conditions` (evaluated by the backend, so it can
+    use an index). An optional `predicate` is checked in Python afterwards;
+    rows it rejects are kept.
+    """
+
+    def __init__(self, table: str, timestamp_field: str, max_age_days: float,
+                 conditions: Optional[Dict[str, Any]] = None,
+                 predicate: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        self.table = table
+        self.timestamp_field = timestamp_field
+        self.max_age_days = max_age_days
+        self.conditions = conditions or {}
+        self.predicate = predicate
+
+    def index_fields(self) -> List[str]:
+        """Equality fields, then timestamp and id: one index serves the filter, the range and the keyset order"""
+        return list(self.conditions) + [self.timestamp_field, "id"]
+
+    def cutoff(self, now: Optional[datetime] = None) -> str:
+        """ISO timestamp before which rows expire"""
+        return ((now or datetime.utcnow()) - timedelta(days=self.max_age_days)).isoformat() + "Z"
+
+
+DEFAULT_POLICIES = [
+    RetentionPolicy("notifications", "timestamp", 90, {"read": True}),
+    RetentionPolicy("admin_messages", "timestamp", 365, {"read": True}),
+]
+
+ARCHIVE_EXTENSIONS = {None: ".ndjson", "gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+Cursor = Any
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class SQLRetentionBackend:
+    """
+    DB-API connection (sqlite3, psycopg, mysql-connector).
+
+    Pages with WHERE cond = ? AND (ts, id) > (last_ts, last_id) ORDER BY ts, id
+    LIMIT n, which an index on (cond, ts, id) serves without OFFSET or a full scan.
+    """
+
+    def __init__(self, conn, paramstyle: str = "?"):
+        self.conn = conn
+        self.p = paramstyle
+
+    def fetch_chunk(self, policy: RetentionPolicy, cutoff: str, after: Optional[Cursor],
+                    limit: int) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        ts = policy.timestamp_field
+        where = [f"{ts} < {self.p}"]
+        params: List[Any] = [cutoff]
+        for field, value in policy.conditions.items():
+            where.append(f"{field} = {self.p}")
+            params.append(value)
+        if after is not None:
+            # Row-value comparison, so the planner seeks the (ts, id) index instead of OR-ing two scans
+            where.append(f"({ts}, id) > ({self.p}, {self.p})")
+            params.extend(after)
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"SELECT * FROM {policy.table} WHERE {' AND '.join(where)} ORDER BY {ts}, id LIMIT {int(limit)}",
+            params,
+        )
+        columns = [d[0] for d in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return rows, ((rows[-1][ts], rows[-1]["id"]) if rows else None)
+
+    def delete(self, policy: RetentionPolicy, rows: List[Dict[str, Any]]):
+        placeholders = ", ".join(self.p for _ in rows)
+        cursor = self.conn.cursor()
+        cursor.execute(f"DELETE FROM {policy.table} WHERE id IN ({placeholders})", [r["id"] for r in rows])
+        self.conn.commit()
+
+    def create_indexes(self, policies: List[RetentionPolicy]):
+        """(conditions..., timestamp, id) index per policy (SQLite / PostgreSQL syntax)"""
+        cursor = self.conn.cursor()
+        for policy in policies:
+            fields = policy.index_fields()
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{policy.table}_{'_'.join(fields)} "
+                           f"ON {policy.table} ({', '.join(fields)})")
+        self.conn.commit()
+
+
+class MongoRetentionBackend:
+    """pymongo (or mongomock) database; pages on a (conditions, ts, id) index and deletes with delete_many"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def fetch_chunk(self, policy: RetentionPolicy, cutoff: str, after: Optional[Cursor],
+                    limit: int) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        ts = policy.timestamp_field
+        query: Dict[str, Any] = {ts: {"$lt": cutoff}, **policy.conditions}
+        if after is not None:
+            query["$or"] = [{ts: {"$gt": after[0]}}, {ts: after[0], "id": {"$gt": after[1]}}]
+        rows = list(self.db[policy.table].find(query, {"_id": 0}).sort([(ts, 1), ("id", 1)]).limit(limit))
+        return rows, ((rows[-1][ts], rows[-1]["id"]) if rows else None)
+
+    def delete(self, policy: RetentionPolicy, rows: List[Dict[str, Any]]):
+        self.db[policy.table].delete_many({"id": {"$in": [r["id"] for r in rows]}})
+
+    def create_indexes(self, policies: List[RetentionPolicy]):
+        for policy in policies:
+            self.db[policy.table].create_index([(field, 1) for field in policy.index_fields()])
+
+
+class FirestoreRetentionBackend:
+    """
+    Firestore client; orders by the timestamp and pages with start_after(snapshot).
+
+    Equality conditions plus the timestamp range use the composite indexes in
+    firestore.indexes.json (e.g. notifications: read, timestamp).
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def fetch_chunk(self, policy: RetentionPolicy, cutoff: str, after: Optional[Cursor],
+                    limit: int) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        query = self.db.collection(policy.table)
+        for field, value in policy.conditions.items():
+            query = query.where(field, "==", value)
+        query = query.where(policy.timestamp_field, "<", cutoff).order_by(policy.timestamp_field)
+        if after is not None:
+            query = query.start_after(after)
+        snapshots = list(query.limit(limit).stream())
+        self._refs = {s.id: s.reference for s in snapshots}
+        return [{**s.to_dict(), "id": s.id} for s in snapshots], (snapshots[-1] if snapshots else None)
+
+    def delete(self, policy: RetentionPolicy, rows: List[Dict[str, Any]]):
+        for start in range(0, len(rows), 500):
+            batch = self.db.batch()
+            for row in rows[start:start + 500]:
+                batch.delete(self._refs[row["id"]])
+            batch.commit()
+
+    def create_indexes(self, policies: List[RetentionPolicy]):
+        pass  # Deployed from firestore.indexes.json
+
+
+# ============================================================================
+# PRUNING
+# ============================================================================
+
+def _open_archive(base: str, compression: Optional[str]) -> Tuple[Any, str]:
+    """Create a new archive file, numbering it when runs in the same second (or --now) collide"""
+    extension = ARCHIVE_EXTENSIONS[compression]
+    attempt = 0
+    while True:
+        path = f"{base}{f'-{attempt}' if attempt else ''}{extension}"
+        try:
+            return open_part_writer(path, compression, exclusive=True), path
+        except FileExistsError:
+            attempt += 1
+
+
+def prune(backend, policy: RetentionPolicy, now: Optional[datetime] = None, chunk_size: int = 500,
+          archive_dir: Optional[str] = None, compression: Optional[str] = "gzip",
+          max_rows_per_second: Optional[float] = None, target_chunk_seconds: Optional[float] = 0.05,
+          dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Archive and delete one table's expired rows in chunks
+
+    Each chunk is fetched by keyset pagination, appended to the archive (and
+    flushed) before it is deleted, so an interrupted run loses nothing and can
+    simply be restarted. The chunk size adapts: it halves (down to 1/16 of
+    chunk_size) when a delete takes longer than target_chunk_seconds and grows
+    back when deletes are fast.
+    max_rows_per_second caps the overall delete rate.
+
+    Args:
+        backend: SQL, Mongo or Firestore retention backend
+        policy: RetentionPolicy for the table
+        now: Reference time (default: current UTC time)
+        chunk_size: Maximum rows per chunk
+        archive_dir: Write expired rows to <table>-<run time>[-n].ndjson[.gz|.zst] here before deleting;
+                     -n is added when a file of that name exists, which is never overwritten
+        compression: None, 'gzip' or 'zstd'
+        max_rows_per_second: Throttle; sleeps between chunks to stay under this rate
+        target_chunk_seconds: Latency budget for one chunk's delete (None disables adaptive sizing)
+        dry_run: Count expired rows without archiving or deleting
+
+    Returns:
+        Summary with scanned, archived and deleted counts, chunks and elapsed seconds
+    """
+    cutoff = policy.cutoff(now)
+    summary = {"table": policy.table, "cutoff": cutoff, "scanned": 0, "archived": 0, "deleted": 0,
+               "chunks": 0, "seconds": 0.0, "archive": None}
+    archive = None
+    archive_base = None
+    if archive_dir and not dry_run:
+        os.makedirs(archive_dir, exist_ok=True)
+        run_stamp = (now or datetime.utcnow()).strftime("%Y%m%dT%H%M%S")
+        archive_base = os.path.join(archive_dir, f"{policy.table}-{run_stamp}")
+
+    started = time.perf_counter()
+    limit = chunk_size
+    min_limit = max(1, chunk_size // 16)
+    after = None
+    try:
+        while True:
+            chunk_started = time.perf_counter()
+            rows, cursor = backend.fetch_chunk(policy, cutoff, after, limit)
+            if not rows:
+                break
+            # Resume after the last row seen, whether it was deleted or kept
+            after = cursor
+            summary["scanned"] += len(rows)
+            expired = [r for r in rows if policy.predicate is None or policy.predicate(r)]
+            if dry_run:
+                summary["deleted"] += len(expired)
+                continue
+            delete_seconds = 0.0
+            if expired:
+                if archive_base:
+                    if archive is None:
+                        archive, summary["archive"] = _open_archive(archive_base, compression)
+                    archive.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in expired))
+                    archive.flush()
+                    summary["archived"] += len(expired)
+                delete_started = time.perf_counter()
+                backend.delete(policy, expired)
+                delete_seconds = time.perf_counter() - delete_started
+                summary["deleted"] += len(expired)
+            summary["chunks"] += 1
+
+            if target_chunk_seconds:
+                # Size chunks by delete latency: that is what holds locks and competes with production writes
+                if delete_seconds > target_chunk_seconds:
+                    limit = max(min_limit, limit // 2)
+                elif delete_seconds < target_chunk_seconds / 2:
+                    limit = min(chunk_size, int(limit * 1.5) + 1)
+            elapsed = time.perf_counter() - chunk_started
+            if max_rows_per_second:
+                min_seconds = len(rows) / max_rows_per_second
+                if elapsed < min_seconds:
+                    time.sleep(min_seconds - elapsed)
+    finally:
+        if archive is not None:
+            archive.close()
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+
+def prune_all(backend, policies: Optional[List[RetentionPolicy]] = None, **options) -> List[Dict[str, Any]]:
+    """Run prune() for every policy; options are passed through"""
+    results = []
+    for policy in policies or DEFAULT_POLICIES:
+        result = prune(backend, policy, **options)
+        verb = "Would delete" if options.get("dry_run") else "Deleted"
+        print(f"[OK] {verb} {result['deleted']} of {result['scanned']} scanned rows from {policy.table} "
+              f"older than {result['cutoff']} in {result['seconds']:.2f}s"
+              + (f" (archived to {result['archive']})" if result["archived"] else ""))
+        results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Archive and delete expired notifications and admin messages')
+    parser.add_argument('--sqlite', type=str, help='SQLite database file')
+    parser.add_argument('--mongodb', type=str, help='MongoDB connection string')
+    parser.add_argument('--database', type=str, default='drlocum', help='MongoDB database name (default: drlocum)')
+    parser.add_argument('--firestore', action='store_true', help='Prune Firestore (default credentials)')
+    parser.add_argument('--days', type=float, help='Override the retention window of every policy')
+    parser.add_argument('--archive-dir', type=str, help='Archive expired rows here before deleting')
+    parser.add_argument('--compress', type=str, choices=['gzip', 'zstd', 'none'], default='gzip',
+                       help='Archive compression (default: gzip)')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Maximum rows per chunk (default: 500)')
+    parser.add_argument('--max-rows-per-second', type=float, help='Throttle the delete rate')
+    parser.add_argument('--create-indexes', action='store_true',
+                       help='Create (conditions, timestamp, id) indexes first, e.g. notifications (read, timestamp, id)')
+    parser.add_argument('--dry-run', action='store_true', help='Only count expired rows')
+
+    args = parser.parse_args()
+
+    if args.sqlite:
+        import sqlite3
+        backend = SQLRetentionBackend(sqlite3.connect(args.sqlite))
+    elif args.mongodb:
+        from pymongo import MongoClient
+        backend = MongoRetentionBackend(MongoClient(args.mongodb)[args.database])
+    elif args.firestore:
+        import firebase_admin
+        from firebase_admin import firestore
+        firebase_admin.initialize_app()
+        backend = FirestoreRetentionBackend(firestore.client())
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+    policies = DEFAULT_POLICIES
+    if args.days is not None:
+        policies = [RetentionPolicy(p.table, p.timestamp_field, args.days, p.conditions, p.predicate)
+                    for p in DEFAULT_POLICIES]
+    if args.create_indexes:
+        backend.create_indexes(policies)
+
+    try:
+        prune_all(backend, policies, chunk_size=args.chunk_size, archive_dir=args.archive_dir,
+                  compression=None if args.compress == 'none' else args.compress,
+                  max_rows_per_second=args.max_rows_per_second, dry_run=args.dry_run)
+    except Exception as e:
+        print(f"[ERROR] Pruning failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,383 @@
+"""
+Shift Scheduling
+Expands jobs and shifts into per-day time windows and keeps per-doctor sorted
+interval indexes for double-booking detection and fast availability checks
+"""
+
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+import heapq
+
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Job statuses that commit the approved doctor to the job's windows
+BOOKED_JOB_STATUSES = {"Approved", "Taken", "Completed"}
+
+# Shift statuses that commit the doctor (Cancelled shifts free the slot)
+BOOKED_SHIFT_STATUSES = {"Scheduled", "Started", "Exit Pending", "Completed"}
+
+_EPOCH = datetime(1970, 1, 1)
+
+Window = Tuple[int, int]
+
+
+# ============================================================================
+# TIME WINDOWS
+# ============================================================================
+
+def _parse_timestamp(value: str) -> datetime:
+    """ISO timestamp (with or without Z) as a naive UTC datetime"""
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt.replace(tzinfo=None) - (dt.utcoffset() or timedelta(0))
+
+
+def _parse_clock(value: str) -> timedelta:
+    """"HH:MM" as an offset from midnight; hours past 24 roll into the next day"""
+    hours, _, minutes = value.partition(":")
+    return timedelta(hours=int(hours), minutes=int(minutes or 0))
+
+
+def _epoch_seconds(dt: datetime) -> int:
+    delta = dt - _EPOCH
+    return delta.days * 86400 + delta.seconds
+
+
+def _daily_window(day: datetime, start_time: str, end_time: str) -> Window:
+    start = day + _parse_clock(start_time)
+    end = day + _parse_clock(end_time)
+    if end <= start:
+        # Overnight shift, e.g. 22:00 to 06:00
+        end += timedelta(days=1)
+    return _epoch_seconds(start), _epoch_seconds(end)
+
+
+def _job_clock(job: Dict[str, Any]) -> Tuple[datetime, str, str]:
+    """(first day at midnight, startTime, endTime) of a job"""
+    start_date = _parse_timestamp(job.get("startDate") or job["date"])
+    first_day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    start_time = job.get("startTime") or f"{start_date.hour:02d}:{start_date.minute:02d}"
+    return first_day, start_time, job.get("endTime") or start_time
+
+
+def job_start(job: Dict[str, Any]) -> int:
+    """Epoch seconds of a job's first day at its startTime"""
+    first_day, start_time, _ = _job_clock(job)
+    return _epoch_seconds(first_day + _parse_clock(start_time))
+
+
+def job_windows(job: Dict[str, Any]) -> List[Window]:
+    """
+    Working windows of a job as (start, end) epoch seconds, sorted
+
+    Single-day jobs get one window on their start date. Multi-day jobs get one
+    window per day from startDate up to (excluding) endDate, restricted to
+    `selectedDays` when set. Each window runs startTime to endTime.
+    """
+    first_day, start_time, end_time = _job_clock(job)
+
+    if job.get("dutyType") != "multiple" or not job.get("endDate"):
+        return [_daily_window(first_day, start_time, end_time)]
+
+    last_day = _parse_timestamp(job["endDate"]).replace(hour=0, minute=0, second=0, microsecond=0)
+    selected = {WEEKDAYS.index(d) for d in job.get("selectedDays") or [] if d in WEEKDAYS}
+    windows = []
+    day = first_day
+    while day < last_day or day == first_day:
+        if not selected or day.weekday() in selected:
+            windows.append(_daily_window(day, start_time, end_time))
+        day += timedelta(days=1)
+    return windows
+
+
+def shift_windows(shift: Dict[str, Any], job: Optional[Dict[str, Any]] = None) -> List[Window]:
+    """Windows of a shift: its job's windows, or the shift's own date and times when the job is unknown"""
+    if job is not None:
+        return job_windows(job)
+    day = _parse_timestamp(shift["date"]).replace(hour=0, minute=0, second=0, microsecond=0)
+    return [_daily_window(day, shift["startTime"], shift["endTime"])]
+
+
+def from_epoch_seconds(seconds: int) -> datetime:
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+def scheduled_bounds(windows: List[Window], total_hours: Optional[float] = None,
+                     start: Optional[int] = None) -> Tuple[int, int, int]:
+    """
+    (first start, last end, scheduled seconds) of a set of windows
+
+    A job whose selectedDays match none of its dates has no windows; it falls
+    back to a single block of total_hours from `start` (see job_bounds).
+    """
+    if not windows:
+        if start is None:
+            raise ValueError("No windows to bound; pass the job start for the total_hours fallback")
+        scheduled = int((total_hours or 0) * 3600)
+        return start, start + scheduled, scheduled
+    return windows[0][0], windows[-1][1], sum(end - start for start, end in windows)
+
+
+def job_bounds(job: Dict[str, Any], total_hours: Optional[float] = None) -> Tuple[int, int, int]:
+    """scheduled_bounds of a job's windows, falling back to total_hours from its start date and time"""
+    if total_hours is None:
+        total_hours = job.get("totalHours")
+    return scheduled_bounds(job_windows(job), total_hours, job_start(job))
+
+
+def paid_hours(shift: Dict[str, Any], job: Optional[Dict[str, Any]] = None) -> float:
+    """
+    Hours to pay for a shift
+
+    With both actualStartTime and actualEndTime, the actual span minus the
+    scheduled off-hours between working days (late starts and overruns count);
+    otherwise the scheduled hours.
+    """
+    if job is not None:
+        first_start, last_end, scheduled = job_bounds(job)
+    else:
+        first_start, last_end, scheduled = scheduled_bounds(shift_windows(shift))
+    if not shift.get("actualStartTime") or not shift.get("actualEndTime"):
+        return scheduled / 3600
+    worked = (_epoch_seconds(_parse_timestamp(shift["actualEndTime"]))
+              - _epoch_seconds(_parse_timestamp(shift["actualStartTime"]))
+              - (last_end - first_start - scheduled))
+    return max(0, worked) / 3600
+
+
+def shift_pay(shift: Dict[str, Any], job: Dict[str, Any]) -> float:
+    """Payment amount for a shift: paid hours at the job's hourly rate"""
+    rate = job.get("paymentPerHour") or job.get("pay") or 0
+    return round(paid_hours(shift, job) * rate, 2)
+
+
+# ============================================================================
+# INTERVAL INDEX
+# ============================================================================
+
+class DoctorIntervals:
+    """
+    One doctor's booked windows, sorted by start, with a running maximum of
+    end times.
+
+    An overlap query bisects to the last window starting before the query
+    ends and walks back only while the running maximum still reaches past the
+    query start, so a check costs O(log n + conflicts). An insert is a bisect
+    plus list inserts (O(n) memmoves) and a running-maximum update that stops
+    at the first later window whose maximum already reaches the new end;
+    from_windows builds a whole index with one sort and one pass instead.
+    """
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.job_ids: List[str] = []
+        self.max_ends: List[int] = []
+
+    @classmethod
+    def from_windows(cls, windows: Iterable[Tuple[int, int, str]]) -> "DoctorIntervals":
+        """Index (start, end, job_id) windows in bulk"""
+        intervals = cls()
+        ordered = sorted(windows, key=lambda w: w[0])
+        intervals.starts = [w[0] for w in ordered]
+        intervals.ends = [w[1] for w in ordered]
+        intervals.job_ids = [w[2] for w in ordered]
+        intervals.max_ends = [0] * len(ordered)
+        intervals._refresh_max_ends(0)
+        return intervals
+
+    def _refresh_max_ends(self, position: int):
+        running = self.max_ends[position - 1] if position > 0 else float("-inf")
+        for i in range(position, len(self.ends)):
+            running = max(running, self.ends[i])
+            self.max_ends[i] = running
+
+    def add(self, start: int, end: int, job_id: str):
+        position = bisect_left(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.job_ids.insert(position, job_id)
+        previous = self.max_ends[position - 1] if position > 0 else end
+        self.max_ends.insert(position, max(previous, end))
+        # Later maxima are non-decreasing: once one reaches `end`, the rest do too
+        for i in range(position + 1, len(self.max_ends)):
+            if self.max_ends[i] >= end:
+                break
+            self.max_ends[i] = end
+
+    def remove_job(self, job_id: str):
+        keep = [i for i, j in enumerate(self.job_ids) if j != job_id]
+        if len(keep) == len(self.job_ids):
+            return
+        self.starts = [self.starts[i] for i in keep]
+        self.ends = [self.ends[i] for i in keep]
+        self.job_ids = [self.job_ids[i] for i in keep]
+        self.max_ends = [0] * len(keep)
+        self._refresh_max_ends(0)
+
+    def overlapping(self, start: int, end: int) -> List[str]:
+        """Job IDs with a window overlapping [start, end)"""
+        found = []
+        i = bisect_left(self.starts, end) - 1
+        while i >= 0 and self.max_ends[i] > start:
+            if self.ends[i] > start:
+                found.append(self.job_ids[i])
+            i -= 1
+        return found
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class Schedule:
+    """Per-doctor interval indexes over approved jobs and shifts"""
+
+    def __init__(self):
+        self.doctors: Dict[str, DoctorIntervals] = {}
+        self.booked: Dict[str, set] = {}
+
+    def add(self, doctor_id: str, job_id: str, windows: Iterable[Window]):
+        """Book a job's windows for a doctor (a job is only booked once per doctor)"""
+        booked = self.booked.setdefault(doctor_id, set())
+        if job_id in booked:
+            return
+        booked.add(job_id)
+        intervals = self.doctors.setdefault(doctor_id, DoctorIntervals())
+        for start, end in windows:
+            intervals.add(start, end, job_id)
+
+    def remove(self, doctor_id: str, job_id: str):
+        """Release a booking, e.g. when a job or shift is cancelled"""
+        if job_id in self.booked.get(doctor_id, ()):
+            self.booked[doctor_id].discard(job_id)
+            self.doctors[doctor_id].remove_job(job_id)
+
+    def conflicts(self, doctor_id: str, windows: Iterable[Window], ignore_job_id: Optional[str] = None) -> List[str]:
+        """IDs of the doctor's booked jobs overlapping any of the windows"""
+        intervals = self.doctors.get(doctor_id)
+        if intervals is None:
+            return []
+        found = {}
+        for start, end in windows:
+            for job_id in intervals.overlapping(start, end):
+                if job_id != ignore_job_id:
+                    found[job_id] = True
+        return list(found)
+
+    def is_free(self, doctor_id: str, job: Dict[str, Any]) -> bool:
+        """Whether the doctor can be approved for the job without double booking"""
+        return not self.conflicts(doctor_id, job_windows(job), ignore_job_id=job["id"])
+
+    def book(self, doctor_id: str, job: Dict[str, Any]) -> bool:
+        """Approval path: book the job if the doctor is free; returns whether it was booked"""
+        windows = job_windows(job)
+        if self.conflicts(doctor_id, windows, ignore_job_id=job["id"]):
+            return False
+        self.add(doctor_id, job["id"], windows)
+        return True
+
+
+def _bookings(seed_data: Dict[str, List[Dict[str, Any]]]) -> Iterable[Tuple[str, str, List[Window]]]:
+    """(doctor_id, job_id, windows) for every approved job and active shift, once per doctor and job"""
+    jobs_by_id = {job["id"]: job for job in seed_data.get("jobs", [])}
+    seen = set()
+    for job in seed_data.get("jobs", []):
+        doctor_id = job.get("approvedDoctorId")
+        if doctor_id and job.get("status") in BOOKED_JOB_STATUSES:
+            seen.add((doctor_id, job["id"]))
+            yield doctor_id, job["id"], job_windows(job)
+    for shift in seed_data.get("shifts", []):
+        key = (shift["doctorId"], shift.get("jobId") or shift["id"])
+        if shift.get("status") not in BOOKED_SHIFT_STATUSES or key in seen:
+            continue
+        seen.add(key)
+        yield key[0], key[1], shift_windows(shift, jobs_by_id.get(shift.get("jobId")))
+
+
+def build_schedule(seed_data: Dict[str, List[Dict[str, Any]]]) -> Schedule:
+    """Index every approved job and active shift per doctor, one bulk build per doctor"""
+    schedule = Schedule()
+    windows_by_doctor: Dict[str, List[Tuple[int, int, str]]] = {}
+    for doctor_id, job_id, windows in _bookings(seed_data):
+        schedule.booked.setdefault(doctor_id, set()).add(job_id)
+        windows_by_doctor.setdefault(doctor_id, []).extend((start, end, job_id) for start, end in windows)
+    for doctor_id, windows in windows_by_doctor.items():
+        schedule.doctors[doctor_id] = DoctorIntervals.from_windows(windows)
+    return schedule
+
+
+def find_conflicts(seed_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Every double booking in the dataset
+
+    Sorts all booked windows by (doctor, start) and sweeps them with a heap of
+    active windows, so the cost is O(n log n) plus the number of conflicts.
+
+    Returns:
+        One record per overlapping pair of jobs for a doctor
+    """
+    windows = [
+        (doctor_id, start, end, job_id)
+        for doctor_id, job_id, job_windows_ in _bookings(seed_data)
+        for start, end in job_windows_
+    ]
+    windows.sort()
+
+    conflicts: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    active: List[Tuple[int, str]] = []
+    current_doctor = None
+    for doctor_id, start, end, job_id in windows:
+        if doctor_id != current_doctor:
+            current_doctor = doctor_id
+            active = []
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for active_end, other_job_id in active:
+            if other_job_id == job_id:
+                continue
+            first, second = sorted((job_id, other_job_id))
+            key = (doctor_id, first, second)
+            if key not in conflicts:
+                conflicts[key] = {
+                    "doctorId": doctor_id,
+                    "jobId": first,
+                    "conflictingJobId": second,
+                    "overlapStart": from_epoch_seconds(start).isoformat() + "Z",
+                    "overlapEnd": from_epoch_seconds(min(end, active_end)).isoformat() + "Z",
+                }
+        heapq.heappush(active, (end, job_id))
+    return list(conflicts.values())
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from seed import generate_all_seed_data, generate_skewed_seed_data
+
+    parser = argparse.ArgumentParser(description='Detect double-booked doctors in the seed data')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Use a skewed dataset with this many jobs (default: small seed data)')
+
+    args = parser.parse_args()
+
+    seed_data = generate_skewed_seed_data(num_jobs=args.jobs) if args.jobs else generate_all_seed_data()
+
+    started = time.perf_counter()
+    conflicts = find_conflicts(seed_data)
+    elapsed = time.perf_counter() - started
+    print("\n" + "="*50)
+    print(f"Found {len(conflicts)} conflicts in {elapsed:.3f}s")
+    print("="*50)
+    for conflict in conflicts[:10]:
+        print(f"  Doctor {conflict['doctorId']}: {conflict['jobId']} overlaps {conflict['conflictingJobId']}"
+              f" from {conflict['overlapStart']}")
+
+    schedule = build_schedule(seed_data)
+    open_jobs = [job for job in seed_data["jobs"] if job["status"] == "Open"]
+    doctor_ids = [doctor["id"] for doctor in seed_data["doctors"]]
+    started = time.perf_counter()
+    free = sum(schedule.is_free(doctor_id, job) for job in open_jobs[:1000] for doctor_id in doctor_ids[:100])
+    checks = min(len(open_jobs), 1000) * min(len(doctor_ids), 100)
+    elapsed = time.perf_counter() - started
+    print(f"\n{checks} availability checks in {elapsed:.3f}s ({free} free)")
@@ -0,0 +1,364 @@
+"""
+Full-Text Search Index
+Tokenized inverted index over jobs and doctors with BM25-ranked top-k search,
+plus exports as keyword-array fields (Firestore/MongoDB) and SQLite FTS5 tables
+"""
+
+from seed import generate_all_seed_data
+from array import array
+from bisect import bisect_left
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+import heapq
+import math
+import re
+
+
+# Searchable fields and their weights (term frequency multiplier)
+SEARCH_FIELDS = {
+    "jobs": {"role": 3, "specialty": 2, "location": 1, "description": 1},
+    "doctors": {"name": 3, "specialty": 2, "skills": 2, "about": 1},
+}
+
+STOPWORDS = {
+    "a", "an", "and", "at", "by", "for", "in", "of", "on", "or", "the", "to", "with", "years", "year",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# MongoDB multikey indexes for array-contains style keyword queries
+MONGO_SEARCH_INDEXES = {
+    "jobs": [[("searchKeywords", 1)]],
+    "doctors": [[("searchKeywords", 1)]],
+}
+
+
+def tokenize(text: Any) -> List[str]:
+    """Lowercase alphanumeric tokens without stopwords; lists are tokenized item by item"""
+    if text is None:
+        return []
+    if isinstance(text, (list, tuple)):
+        return [token for item in text for token in tokenize(item)]
+    return [token for token in _TOKEN_RE.findall(str(text).lower()) if token not in STOPWORDS]
+
+
+def record_terms(record: Dict[str, Any], fields: Dict[str, int]) -> Dict[str, int]:
+    """Weighted term frequencies for one record"""
+    terms: Dict[str, int] = {}
+    for field, weight in fields.items():
+        for token in tokenize(record.get(field)):
+            terms[token] = terms.get(token, 0) + weight
+    return terms
+
+
+# ============================================================================
+# INVERTED INDEX
+# ============================================================================
+
+class InvertedIndex:
+    """
+    Term -> postings list of (sorted doc ordinals, term frequencies).
+
+    Postings are compact typed arrays; queries touch only the postings of
+    their own terms, so search cost follows posting lengths, not corpus size.
+    Each term also keeps its largest frequency and shortest document, which
+    bound its BM25 impact for MaxScore pruning.
+    """
+
+    def __init__(self, fields: Dict[str, int], k1: float = 1.2, b: float = 0.75):
+        self.fields = fields
+        self.k1 = k1
+        self.b = b
+        self.doc_ids: List[str] = []
+        self.ordinals: Dict[str, int] = {}
+        self.doc_lengths = array("I")
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.max_tf: Dict[str, int] = {}
+        self.min_length: Dict[str, int] = {}
+        self.total_length = 0
+
+    def add(self, record: Dict[str, Any]):
+        """Index a record; records must be added in one pass, ordinals are append-only"""
+        ordinal = len(self.doc_ids)
+        terms = record_terms(record, self.fields)
+        self.doc_ids.append(record["id"])
+        self.ordinals[record["id"]] = ordinal
+        length = sum(terms.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+        for term, tf in terms.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array("I"), array("H"))
+                self.max_tf[term] = 0
+                self.min_length[term] = length
+            tf = min(tf, 65535)
+            posting[0].append(ordinal)
+            posting[1].append(tf)
+            self.max_tf[term] = max(self.max_tf[term], tf)
+            self.min_length[term] = min(self.min_length[term], length)
+
+    def add_all(self, records: Iterable[Dict[str, Any]]) -> "InvertedIndex":
+        for record in records:
+            self.add(record)
+        return self
+
+    def _idf(self, term: str) -> float:
+        df = len(self.postings[term][0])
+        n = len(self.doc_ids)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 10, match_all: bool = True,
+               allowed_ids: Optional[set] = None) -> List[Tuple[float, str]]:
+        """
+        BM25-ranked top-k search
+
+        Documents are visited in ordinal order and skipped as soon as their
+        partial score plus the impact bounds of the remaining terms cannot beat
+        the current k-th best score (MaxScore). allowed_ids is intersected with
+        the postings before any scoring.
+
+        Args:
+            query: Free-text query
+            k: Number of results
+            match_all: Require every query term (AND); otherwise any term (OR)
+            allowed_ids: Optional set of record IDs to restrict results to
+
+        Returns:
+            List of (score, record_id), best first
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        known = [t for t in terms if t in self.postings]
+        if k <= 0 or not known or (match_all and len(known) < len(terms)):
+            return []
+
+        allowed = None
+        if allowed_ids is not None:
+            allowed = sorted(self.ordinals[i] for i in allowed_ids if i in self.ordinals)
+            if not allowed:
+                return []
+
+        avg_length = self.total_length / max(1, len(self.doc_ids))
+        k1, b = self.k1, self.b
+        lengths = self.doc_lengths
+        idf = {t: self._idf(t) for t in known}
+
+        def term_score(tf: int, length: int, term: str) -> float:
+            return idf[term] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_length))
+
+        # BM25 grows with tf and shrinks with length, so this bounds every posting
+        # (the factor absorbs float rounding when bounds are summed in another order)
+        bound = {t: term_score(self.max_tf[t], self.min_length[t], t) * (1 + 1e-9) for t in known}
+
+        top: List[Tuple[float, int]] = []  # min-heap of (score, -ordinal)
+
+        def offer(score: float, ordinal: int) -> float:
+            """Keep the k best (ties go to the lower ordinal); returns the new threshold"""
+            if len(top) < k:
+                heapq.heappush(top, (score, -ordinal))
+            elif score > top[0][0]:
+                heapq.heapreplace(top, (score, -ordinal))
+            return top[0][0] if len(top) == k else 0.0
+
+        if match_all:
+            # Rarest term first so misses are found early
+            known.sort(key=lambda t: len(self.postings[t][0]))
+            candidates = self.postings[known[0]][0]
+            if allowed is not None and len(allowed) < len(candidates):
+                candidates = allowed
+            elif allowed is not None:
+                allowed_set = set(allowed)
+                candidates = [o for o in candidates if o in allowed_set]
+            self._score_candidates(candidates, known, bound, term_score, offer, require_all=True)
+        elif allowed is not None and len(allowed) < sum(len(self.postings[t][0]) for t in known):
+            # Highest impact first so the remaining bound drops fastest
+            known.sort(key=lambda t: -bound[t])
+            self._score_candidates(allowed, known, bound, term_score, offer, require_all=False)
+        else:
+            self._max_score(known, bound, term_score, offer, None if allowed is None else set(allowed))
+
+        doc_ids = self.doc_ids
+        return [(score, doc_ids[-neg]) for score, neg in sorted(top, key=lambda e: (-e[0], -e[1]))]
+
+    def _score_candidates(self, candidates: Iterable[int], terms: List[str], bound: Dict[str, float],
+                          term_score, offer, require_all: bool):
+        """Score ascending candidate ordinals by binary search into every term's postings"""
+        postings = [self.postings[t] for t in terms]
+        remaining = [0.0] * (len(terms) + 1)  # remaining[i] = sum of bounds of terms[i:]
+        for i in range(len(terms) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + bound[terms[i]]
+        cursors = [0] * len(terms)
+        lengths = self.doc_lengths
+        threshold = 0.0
+
+        for ordinal in candidates:
+            score = 0.0
+            matched = False
+            for i, (ordinals, tfs) in enumerate(postings):
+                if score + remaining[i] <= threshold:
+                    break
+                pos = bisect_left(ordinals, ordinal, cursors[i])
+                cursors[i] = pos
+                if pos < len(ordinals) and ordinals[pos] == ordinal:
+                    score += term_score(tfs[pos], lengths[ordinal], terms[i])
+                    matched = True
+                elif require_all:
+                    break
+            else:
+                if matched:
+                    threshold = offer(score, ordinal)
+
+    def _max_score(self, terms: List[str], bound: Dict[str, float], term_score, offer,
+                   allowed: Optional[set]):
+        """
+        Document-at-a-time OR search with MaxScore
+
+        Terms are ordered by impact bound; once the cumulative bound of the
+        weakest terms cannot reach the threshold they stop generating
+        candidates and are only probed for documents found by stronger terms.
+        """
+        terms = sorted(terms, key=lambda t: bound[t])
+        postings = [self.postings[t] for t in terms]
+        prefix = []  # prefix[i] = sum of bounds of terms[:i + 1]
+        total = 0.0
+        for term in terms:
+            total += bound[term]
+            prefix.append(total)
+        cursors = [0] * len(terms)
+        lengths = self.doc_lengths
+        threshold = 0.0
+        first_essential = 0
+
+        while first_essential < len(terms):
+            ordinal = min(
+                (postings[i][0][cursors[i]] for i in range(first_essential, len(terms))
+                 if cursors[i] < len(postings[i][0])),
+                default=None,
+            )
+            if ordinal is None:
+                break
+
+            score = 0.0
+            for i in range(first_essential, len(terms)):
+                ordinals, tfs = postings[i]
+                pos = cursors[i]
+                if pos < len(ordinals) and ordinals[pos] == ordinal:
+                    if allowed is None or ordinal in allowed:
+                        score += term_score(tfs[pos], lengths[ordinal], terms[i])
+                    cursors[i] = pos + 1
+            if allowed is not None and ordinal not in allowed:
+                continue
+
+            for i in range(first_essential - 1, -1, -1):
+                if score + prefix[i] <= threshold:
+                    break
+                ordinals, tfs = postings[i]
+                pos = bisect_left(ordinals, ordinal, cursors[i])
+                cursors[i] = pos
+                if pos < len(ordinals) and ordinals[pos] == ordinal:
+                    score += term_score(tfs[pos], lengths[ordinal], terms[i])
+            else:
+                threshold = offer(score, ordinal)
+                while first_essential < len(terms) and prefix[first_essential] <= threshold:
+                    first_essential += 1
+
+
+def build_search_indexes(seed_data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, InvertedIndex]:
+    """Build one inverted index per searchable table"""
+    return {
+        table: InvertedIndex(fields).add_all(seed_data.get(table, []))
+        for table, fields in SEARCH_FIELDS.items()
+    }
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+
+def keyword_fields(record: Dict[str, Any], fields: Dict[str, int], min_prefix: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Keyword-array field for Firestore array-contains / MongoDB multikey queries
+
+    Args:
+        record: Job or doctor record
+        fields: Searchable fields (see SEARCH_FIELDS)
+        min_prefix: Also add prefixes of this length and up, for search-as-you-type
+    """
+    keywords = set(record_terms(record, fields))
+    if min_prefix:
+        keywords |= {token[:n] for token in list(keywords) for n in range(min_prefix, len(token))}
+    return {"searchKeywords": sorted(keywords)}
+
+
+def add_keyword_fields(seed_data: Dict[str, List[Dict[str, Any]]],
+                       min_prefix: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Add searchKeywords to every job and doctor (in place)"""
+    for table, fields in SEARCH_FIELDS.items():
+        for record in seed_data.get(table, []):
+            record.update(keyword_fields(record, fields, min_prefix))
+    return seed_data
+
+
+def create_mongo_search_indexes(db):
+    """Create the searchKeywords multikey indexes on a pymongo database"""
+    for collection_name, indexes in MONGO_SEARCH_INDEXES.items():
+        for keys in indexes:
+            db[collection_name].create_index(keys)
+
+
+def _fts_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+
+def export_fts5(conn, seed_data: Dict[str, List[Dict[str, Any]]]):
+    """
+    Create and fill SQLite FTS5 tables (jobs_fts, doctors_fts)
+
+    Query with e.g. SELECT id FROM jobs_fts WHERE jobs_fts MATCH 'icu' ORDER BY bm25(jobs_fts) LIMIT 10
+    """
+    cursor = conn.cursor()
+    for table, fields in SEARCH_FIELDS.items():
+        fts_table = f"{table}_fts"
+        columns = list(fields)
+        cursor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+        cursor.execute(f"CREATE VIRTUAL TABLE {fts_table} USING fts5(id UNINDEXED, {', '.join(columns)})")
+        placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+        cursor.executemany(
+            f"INSERT INTO {fts_table} (id, {', '.join(columns)}) VALUES ({placeholders})",
+            ([record["id"]] + [_fts_text(record.get(c)) for c in columns] for record in seed_data.get(table, [])),
+        )
+        print(f"Indexed {len(seed_data.get(table, []))} records into {fts_table}")
+    conn.commit()
+
+
+if __name__ == "__main__":
+    import argparse
+    import sqlite3
+
+    parser = argparse.ArgumentParser(description='Search jobs and doctors in the seed data')
+    parser.add_argument('query', type=str, help='Search text')
+    parser.add_argument('--kind', type=str, choices=['jobs', 'doctors'], default='jobs',
+                       help='What to search (default: jobs)')
+    parser.add_argument('-k', type=int, default=10, help='Number of results (default: 10)')
+    parser.add_argument('--any', action='store_true', help='Match any term instead of all terms')
+    parser.add_argument('--fts5', type=str, help='Also write FTS5 tables to this SQLite database')
+
+    args = parser.parse_args()
+
+    seed_data = generate_all_seed_data()
+    indexes = build_search_indexes(seed_data)
+    records = {r["id"]: r for r in seed_data[args.kind]}
+    label = "role" if args.kind == "jobs" else "name"
+
+    print("\n" + "="*50)
+    print(f"Top {args.k} {args.kind} for '{args.query}'")
+    print("="*50)
+    for score, record_id in indexes[args.kind].search(args.query, args.k, match_all=not args.any):
+        record = records[record_id]
+        print(f"{score:6.2f}  {record[label]} - {record['specialty']}")
+
+    if args.fts5:
+        conn = sqlite3.connect(args.fts5)
+        export_fts5(conn, seed_data)
+        conn.close()
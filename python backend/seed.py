@@ -4,8 +4,10 @@ Generates sample data for all tables based on schema.md
 """
 
 import uuid
+import math
+import random
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import hashlib
 
 
@@ -36,6 +38,23 @@ def get_past_timestamp(days: int = 0, hours: int = 0) -> str:
     return dt.isoformat() + "Z"
 
 
+# Seed data keys mapped to database table / collection names
+COLLECTION_NAMES = {
+    "users": "users",
+    "doctors": "doctors",
+    "documents": "documents",
+    "hospitals": "hospitals",
+    "jobs": "jobs",
+    "applications": "applications",
+    "shifts": "shifts",
+    "payments": "payments",
+    "notifications": "notifications",
+    "feedbacks": "feedback",
+    "admin_messages": "admin_messages",
+    "hr_doctor_pool": "hr_doctor_pool",
+}
+
+
 # ============================================================================
 # SEED DATA GENERATORS
 # ============================================================================
@@ -331,7 +350,9 @@ def seed_jobs(hospitals: List[Dict[str, Any]], users: List[Dict[str, Any]]) -> L
 
 def seed_applications(jobs: List[Dict[str, Any]], doctors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Generate seed data for Applications table"""
+    from scheduling import Schedule
     applications = []
+    schedule = Schedule()
     
     statuses = ["Pending", "Approved", "Rejected"]
     
@@ -341,6 +362,8 @@ def seed_applications(jobs: List[Dict[str, Any]], doctors: List[Dict[str, Any]])
     for i, job in enumerate(open_jobs[:10]):  # Limit to 10 applications
         doctor = doctors[i % len(doctors)]
         status = statuses[i % len(statuses)]
+        if status == "Approved" and not schedule.book(doctor["id"], job):
+            status = "Rejected"  # Already booked for an overlapping shift
         
         application = {
             "id": generate_id(),
@@ -362,6 +385,7 @@ def seed_applications(jobs: List[Dict[str, Any]], doctors: List[Dict[str, Any]])
 
 def seed_shifts(jobs: List[Dict[str, Any]], doctors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Generate seed data for Shifts table"""
+    from scheduling import job_bounds, from_epoch_seconds
     shifts = []
     
     # Get approved/taken jobs
@@ -373,8 +397,9 @@ def seed_shifts(jobs: List[Dict[str, Any]], doctors: List[Dict[str, Any]]) -> Li
         doctor_id = job["approvedDoctorId"]
         status = shift_statuses[i % len(shift_statuses)]
         
-        start_time = datetime.fromisoformat(job["startDate"].replace("Z", "+00:00"))
-        end_time = datetime.fromisoformat(job["endDate"].replace("Z", "+00:00"))
+        first_start, last_end, _ = job_bounds(job)
+        start_time = from_epoch_seconds(first_start)
+        end_time = from_epoch_seconds(last_end)
         
         shift = {
             "id": generate_id(),
@@ -401,9 +426,11 @@ def seed_shifts(jobs: List[Dict[str, Any]], doctors: List[Dict[str, Any]]) -> Li
     return shifts
 
 
-def seed_payments(shifts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def seed_payments(shifts: List[Dict[str, Any]], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Generate seed data for Payments table"""
+    from scheduling import shift_pay
     payments = []
+    jobs_by_id = {j["id"]: j for j in jobs}
     
     payment_statuses = ["Pending", "Processing", "Paid"]
     
@@ -422,7 +449,7 @@ def seed_payments(shifts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             "shiftId": shift["id"],
             "jobId": job_id,
             "doctorId": shift["doctorId"],
-            "amount": 400 + (i * 50),  # Estimated amount
+            "amount": shift_pay(shift, jobs_by_id[job_id]),
             "status": status,
             "dueDate": due_date.isoformat() + "Z",
             "paidDate": paid_date.isoformat() + "Z" if paid_date else None,
@@ -573,7 +600,7 @@ def generate_all_seed_data() -> Dict[str, List[Dict[str, Any]]]:
     shifts = seed_shifts(jobs, doctors)
     print(f"Generated {len(shifts)} shifts")
     
-    payments = seed_payments(shifts)
+    payments = seed_payments(shifts, jobs)
     print(f"Generated {len(payments)} payments")
     
     notifications = seed_notifications(users, jobs, applications)
@@ -604,11 +631,592 @@ def generate_all_seed_data() -> Dict[str, List[Dict[str, Any]]]:
     }
 
 
+# ============================================================================
+# DISTRIBUTION MODELS
+# ============================================================================
+
+SPECIALTIES = [
+    "Emergency Medicine",
+    "General Medicine",
+    "Pediatrics",
+    "Cardiology",
+    "Orthopedics",
+    "Neurology",
+    "ICU",
+    "Surgery",
+]
+
+JOB_ROLES = ["Duty Doctor", "RMO", "JR", "SR", "Emergency Medicine Doctor", "ICU Doctor"]
+
+SHIFT_START_HOURS = {"Morning": 8, "Evening": 14, "Night": 22}
+
+# Relative posting volume by hour of day (UTC): office-hours peak, late-evening
+# bump when rosters for the night are finalised
+DIURNAL_WEIGHTS = [
+    0.2, 0.15, 0.1, 0.1, 0.1, 0.2, 0.5, 1.0, 1.8, 2.2, 2.4, 2.2,
+    1.8, 2.0, 2.1, 1.9, 1.6, 1.3, 1.1, 1.2, 1.4, 1.0, 0.6, 0.3,
+]
+
+# Monday .. Sunday
+WEEKDAY_WEIGHTS = [1.3, 1.2, 1.1, 1.1, 1.2, 0.6, 0.5]
+
+NIGHT_HOURS = [18, 19, 20, 21, 22, 23]
+
+# Reference "now" of skewed datasets, so a seed reproduces the same data on any day
+SKEWED_EPOCH = datetime(2025, 1, 1)
+
+
+def make_rng(seed: int = 42) -> random.Random:
+    """Create a seeded random generator so distributions are reproducible"""
+    return random.Random(seed)
+
+
+def seeded_id(rng: random.Random) -> str:
+    """Generate a UUID4 string from a seeded generator"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def zipf_cum_weights(n: int, exponent: float = 1.1) -> List[float]:
+    """Cumulative Zipf weights for ranks 1..n (rank 1 is the most popular)"""
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, n + 1):
+        total += 1.0 / (rank ** exponent)
+        cum_weights.append(total)
+    return cum_weights
+
+
+def zipf_choice(rng: random.Random, items: List[Any], cum_weights: List[float]) -> Any:
+    """Pick an item with Zipf popularity (binary search over cum_weights)"""
+    return rng.choices(items, cum_weights=cum_weights, k=1)[0]
+
+
+def zipf_sample_unique(rng: random.Random, items: List[Any], cum_weights: List[float], count: int) -> List[Any]:
+    """Pick up to count distinct items with Zipf popularity"""
+    count = min(count, len(items))
+    chosen = {}
+    attempts = 0
+    while len(chosen) < count and attempts < count * 10:
+        for item in rng.choices(items, cum_weights=cum_weights, k=count - len(chosen)):
+            chosen[id(item)] = item
+        attempts += count
+    return list(chosen.values())[:count]
+
+
+def poisson(rng: random.Random, lam: float) -> int:
+    """Sample a Poisson-distributed count (Knuth for small lambda, normal approximation above 30)"""
+    if lam <= 0:
+        return 0
+    if lam > 30:
+        return max(0, int(round(rng.gauss(lam, math.sqrt(lam)))))
+    threshold = math.exp(-lam)
+    k = 0
+    p = rng.random()
+    while p > threshold:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def seasonal_weight(day_of_year: int) -> float:
+    """Annual demand curve: winter (flu season) peak, summer trough"""
+    return 1.0 + 0.35 * math.cos(2 * math.pi * (day_of_year - 15) / 365.25)
+
+
+def posting_time_sampler(rng: random.Random, start: datetime, days: int = 365, burst_rate: float = 0.03):
+    """
+    Build a sampler of job posting times over a window of days.
+
+    Day weights combine the seasonal curve, the weekday pattern and a few
+    randomly placed burst days (staff shortages) with 4x volume. Hours follow
+    DIURNAL_WEIGHTS, except on burst days where postings skew to the evening.
+
+    Returns:
+        Function returning (posted_at, is_burst) on each call
+    """
+    burst_days = {d for d in range(days) if rng.random() < burst_rate}
+    day_cum_weights = []
+    total = 0.0
+    for d in range(days):
+        day = start + timedelta(days=d)
+        weight = seasonal_weight(day.timetuple().tm_yday) * WEEKDAY_WEIGHTS[day.weekday()]
+        if d in burst_days:
+            weight *= 4.0
+        total += weight
+        day_cum_weights.append(total)
+    day_offsets = list(range(days))
+    hours = list(range(24))
+    hour_cum_weights = []
+    total = 0.0
+    for weight in DIURNAL_WEIGHTS:
+        total += weight
+        hour_cum_weights.append(total)
+
+    def sample():
+        d = rng.choices(day_offsets, cum_weights=day_cum_weights, k=1)[0]
+        is_burst = d in burst_days
+        if is_burst and rng.random() < 0.6:
+            hour = rng.choice(NIGHT_HOURS)
+        else:
+            hour = rng.choices(hours, cum_weights=hour_cum_weights, k=1)[0]
+        posted_at = start + timedelta(days=d, hours=hour, minutes=rng.randrange(60), seconds=rng.randrange(60))
+        return posted_at, is_burst
+
+    return sample
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat() + "Z"
+
+
+# ============================================================================
+# SKEWED (LOAD-TEST) SEED FUNCTION
+# ============================================================================
+
+def generate_skewed_seed_data(num_hr_users: int = 50, num_hospitals: int = 100, num_doctors: int = 2000,
+                              num_jobs: int = 20000, days: int = 365, mean_applicants: float = 3.0,
+                              zipf_exponent: float = 1.1, seed: int = 42,
+                              now: Optional[datetime] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate a large seed dataset with realistic skew, in the same shape as generate_all_seed_data()
+
+    - Hospitals and doctors have Zipf popularity: a few hospitals post most
+      jobs, a few doctors send most applications
+    - Jobs are posted over a year with seasonal, weekday and diurnal patterns,
+      including bursts of urgent night shifts
+    - Applicant counts are Poisson, with higher rates for popular hospitals
+      and urgent jobs
+
+    Args:
+        num_hr_users: Number of HR users (each manages one or more hospitals)
+        num_hospitals: Number of hospitals
+        num_doctors: Number of doctor users / profiles
+        num_jobs: Number of jobs posted over the window
+        days: Length of the posting window ending at `now`
+        mean_applicants: Poisson rate for an average job
+        zipf_exponent: Skew of hospital and doctor popularity
+        seed: Random seed; the same seed (and `now`) gives the same dataset
+        now: Reference time that timestamps and time-dependent statuses are
+             relative to (default: SKEWED_EPOCH plus `seed` days, not the wall clock)
+    """
+    from scheduling import Schedule, job_bounds, from_epoch_seconds, shift_pay
+    rng = make_rng(seed)
+    if now is None:
+        now = SKEWED_EPOCH + timedelta(days=seed % 365)
+    now = now.replace(microsecond=0)
+    window_start = now - timedelta(days=days)
+    password = hash_password("password123")
+
+    print(f"Generating skewed seed data (seed={seed})...")
+
+    # Users
+    users = []
+    for i in range(num_hr_users):
+        users.append({
+            "id": seeded_id(rng),
+            "email": f"hr{i+1}@hospital{i+1}.com",
+            "mobile": f"+1{2000000000 + i}",
+            "password": password,
+            "userType": "hr",
+            "createdAt": _iso(window_start - timedelta(days=rng.randint(1, 365))),
+            "updatedAt": _iso(now - timedelta(days=rng.randint(0, 30))),
+            "isActive": True,
+            "isVerified": True,
+        })
+    for i in range(num_doctors):
+        users.append({
+            "id": seeded_id(rng),
+            "email": f"doctor{i+1}@example.com",
+            "mobile": f"+1{3000000000 + i}",
+            "password": password,
+            "userType": "doctor",
+            "createdAt": _iso(window_start + timedelta(days=rng.randint(0, days))),
+            "updatedAt": _iso(now - timedelta(days=rng.randint(0, 30))),
+            "isActive": rng.random() < 0.97,
+            "isVerified": rng.random() < 0.85,
+        })
+    hr_users = users[:num_hr_users]
+    doctor_users = users[num_hr_users:]
+    print(f"Generated {len(users)} users")
+
+    # Doctors
+    first_names = ["John", "Sarah", "Priya", "Ahmed", "Maria", "Wei", "Olivia", "Rahul", "Fatima", "David"]
+    last_names = ["Smith", "Johnson", "Williams", "Patel", "Khan", "Garcia", "Chen", "Brown", "Nair", "Lee"]
+    doctors = []
+    for i, user in enumerate(doctor_users):
+        specialty = rng.choice(SPECIALTIES)
+        experience = rng.randint(1, 30)
+        doctors.append({
+            "id": seeded_id(rng),
+            "userId": user["id"],
+            "name": f"Dr. {rng.choice(first_names)} {rng.choice(last_names)}",
+            "specialty": specialty,
+            "avatar": f"https://example.com/avatars/doctor{i+1}.jpg",
+            "rating": round(min(5.0, max(3.0, 5.0 * rng.betavariate(8, 2))), 1),
+            "verified": user["isVerified"],
+            "experience": experience,
+            "appliedJobs": [],
+            "approvedJobs": [],
+            "completedShifts": 0,
+            "phone": user["mobile"],
+            "registrationNumber": f"REG{i+1:06d}",
+            "location": f"City {rng.randint(1, 20)}",
+            "about": f"Experienced {specialty} specialist with {experience} years of practice.",
+            "qualifications": ["MBBS", "MD"] if rng.random() < 0.4 else ["MBBS"],
+            "skills": [specialty, "Patient Care", "Emergency Response"],
+            "hospitals": [],
+        })
+    print(f"Generated {len(doctors)} doctors")
+
+    doc_types = ["License", "Certificate", "ID Proof", "Education"]
+    documents = []
+    for doctor in doctors:
+        for i in range(rng.randint(2, 4)):
+            documents.append({
+                "id": seeded_id(rng),
+                "doctorId": doctor["id"],
+                "name": f"{doc_types[i]} - {doctor['name']}",
+                "type": doc_types[i],
+                "url": f"https://example.com/documents/{doctor['id']}/{i+1}.pdf",
+                "uploadedAt": _iso(now - timedelta(days=rng.randint(1, days))),
+                "verified": doctor["verified"] and rng.random() < 0.8,
+            })
+    print(f"Generated {len(documents)} documents")
+
+    # Hospitals: popularity rank == list position
+    hospitals = []
+    for i in range(num_hospitals):
+        hr_user = hr_users[i % num_hr_users]
+        area = rng.randint(1, 20)
+        hospitals.append({
+            "id": seeded_id(rng),
+            "managedBy": hr_user["id"],
+            "createdAt": _iso(window_start - timedelta(days=rng.randint(1, 365))),
+            "updatedAt": _iso(now - timedelta(days=rng.randint(0, 60))),
+            "name": f"Hospital {i+1}",
+            "description": "Multi-specialty hospital providing comprehensive healthcare services.",
+            "image": f"https://example.com/hospitals/hospital{i+1}.jpg",
+            "contactNumber": f"+1{4000000000 + i}",
+            "location": f"City {area}",
+            "address": f"{rng.randint(1, 999)} Main Street, City {area}",
+            "latitude": round(40.7128 + rng.uniform(-0.5, 0.5), 6),
+            "longitude": round(-74.0060 + rng.uniform(-0.5, 0.5), 6),
+        })
+    print(f"Generated {len(hospitals)} hospitals")
+
+    hospital_cum_weights = zipf_cum_weights(num_hospitals, zipf_exponent)
+    doctor_cum_weights = zipf_cum_weights(num_doctors, zipf_exponent)
+    # Shuffle so doctor popularity is independent of creation order
+    doctors_by_popularity = doctors[:]
+    rng.shuffle(doctors_by_popularity)
+    hospital_rank = {h["id"]: i + 1 for i, h in enumerate(hospitals)}
+    sample_posted_at = posting_time_sampler(rng, window_start, days)
+
+    jobs = []
+    applications = []
+    shifts = []
+    payments = []
+    notifications = []
+    feedbacks = []
+    doctors_by_id = {d["id"]: d for d in doctors}
+    user_by_doctor = {d["id"]: d["userId"] for d in doctors}
+    # Approved doctors' booked windows, so no doctor is approved for overlapping shifts
+    schedule = Schedule()
+
+    for _ in range(num_jobs):
+        hospital = zipf_choice(rng, hospitals, hospital_cum_weights)
+        posted_at, is_burst = sample_posted_at()
+        urgent = rng.random() < (0.7 if is_burst else 0.15)
+        if is_burst and rng.random() < 0.6:
+            shift = "Night"
+        else:
+            shift = rng.choices(["Morning", "Evening", "Night"], weights=[0.5, 0.3, 0.2], k=1)[0]
+        duty_type = "multiple" if rng.random() < 0.25 else "single"
+        lead_hours = rng.expovariate(1 / 12) if urgent else rng.expovariate(1 / (24 * 7))
+        start_day = (posted_at + timedelta(hours=lead_hours)).replace(hour=0, minute=0, second=0)
+        start_date = start_day + timedelta(hours=SHIFT_START_HOURS[shift])
+        if start_date < posted_at:
+            start_date += timedelta(days=1)
+        end_date = start_date + timedelta(days=1 if duty_type == "single" else 3)
+        start_hour = SHIFT_START_HOURS[shift]
+        end_hour = (start_hour + 8) % 24
+        total_hours = 8 if duty_type == "single" else 24
+        pay = rng.choice([50, 60, 70, 80, 90, 100]) + (20 if urgent else 0) + (10 if shift == "Night" else 0)
+        role = rng.choice(JOB_ROLES)
+        specialty = rng.choice(SPECIALTIES)
+        publish_to = rng.choices(["all", "pool", "specific"], weights=[0.6, 0.3, 0.1], k=1)[0]
+        requirements = ["MBBS", "MD"] if rng.random() < 0.3 else ["MBBS"]
+
+        job = {
+            "id": seeded_id(rng),
+            "hospitalId": hospital["id"],
+            "hospitalName": hospital["name"],
+            "hospitalLogo": f"https://example.com/logos/hospital{hospital_rank[hospital['id']]}.png",
+            "hospitalImage": hospital["image"],
+            "role": role,
+            "specialty": specialty,
+            "date": _iso(start_date),
+            "time": f"{start_hour:02d}:00 to {end_hour:02d}:00",
+            "shift": shift,
+            "duration": "8h",
+            "pay": pay,
+            "salary": pay * 8,
+            "distance": round(rng.uniform(1.0, 40.0), 1),
+            "rating": round(min(5.0, max(3.0, 5.0 * rng.betavariate(8, 2))), 1),
+            "status": "Open",
+            "applicants": 0,
+            "applicantsCount": 0,
+            "location": hospital["location"],
+            "description": f"Looking for {role} for {hospital['name']}.",
+            "requirements": requirements,
+            "qualifications": requirements,
+            "approvedDoctorId": None,
+            "urgent": urgent,
+            "qrRequired": rng.random() < 0.5,
+            "dutyType": duty_type,
+            "startDate": _iso(start_date),
+            "startTime": f"{start_hour:02d}:00",
+            "endDate": _iso(end_date),
+            "endTime": f"{end_hour:02d}:00",
+            "selectedDays": ["Monday", "Wednesday", "Friday"] if duty_type == "multiple" else None,
+            "paymentPerHour": pay,
+            "totalHours": total_hours,
+            "totalPay": pay * total_hours,
+            "publishTo": publish_to,
+            "specificDoctors": [] if publish_to == "specific" else None,
+            "createdAt": _iso(posted_at),
+            "updatedAt": _iso(posted_at),
+            "createdBy": hospital["managedBy"],
+        }
+        jobs.append(job)
+
+        # Poisson applicant queue: popular hospitals and urgent jobs draw more
+        popularity = (1.0 / hospital_rank[hospital["id"]]) ** 0.5
+        lam = mean_applicants * (0.5 + 4.0 * popularity) * (1.5 if urgent else 1.0)
+        applicants = zipf_sample_unique(rng, doctors_by_popularity, doctor_cum_weights, poisson(rng, lam))
+        job["applicants"] = job["applicantsCount"] = len(applicants)
+
+        decided = start_date <= now or rng.random() < 0.5
+        approved_doctor = None
+        if applicants and decided and rng.random() < 0.8:
+            candidates = applicants[:]
+            rng.shuffle(candidates)
+            approved_doctor = next((d for d in candidates if schedule.book(d["id"], job)), None)
+
+        for doctor in applicants:
+            applied_at = posted_at + timedelta(hours=rng.uniform(0, max(1.0, lead_hours)))
+            if doctor is approved_doctor:
+                status = "Approved"
+            elif decided:
+                status = "Rejected"
+            else:
+                status = "Pending"
+            applications.append({
+                "id": seeded_id(rng),
+                "jobId": job["id"],
+                "doctorId": doctor["id"],
+                "appliedAt": _iso(min(applied_at, now)),
+                "status": status,
+                "coverNote": f"Interested in {role} position at {hospital['name']}." if rng.random() < 0.5 else None,
+            })
+            notifications.append({
+                "id": seeded_id(rng),
+                "userId": job["createdBy"],
+                "type": "application",
+                "title": "New Application",
+                "message": f"{doctor['name']} applied for {role}.",
+                "timestamp": _iso(min(applied_at, now)),
+                "read": applied_at < now - timedelta(days=2),
+                "actionUrl": f"/jobs/{job['id']}",
+                "relatedEntityId": job["id"],
+                "relatedEntityType": "job",
+            })
+
+        if approved_doctor is None:
+            if start_date <= now:
+                job["status"] = "Cancelled"
+            continue
+
+        job["approvedDoctorId"] = approved_doctor["id"]
+        approved_at = min(now, posted_at + timedelta(hours=max(1.0, lead_hours * 0.8)))
+        notifications.append({
+            "id": seeded_id(rng),
+            "userId": user_by_doctor[approved_doctor["id"]],
+            "type": "approval",
+            "title": "Application Approved",
+            "message": f"You have been approved for {role} at {hospital['name']}.",
+            "timestamp": _iso(approved_at),
+            "read": approved_at < now - timedelta(days=1),
+            "actionUrl": f"/jobs/{job['id']}",
+            "relatedEntityId": job["id"],
+            "relatedEntityType": "job",
+        })
+
+        if end_date <= now:
+            job["status"] = "Completed"
+            shift_status = "Completed"
+        elif start_date <= now:
+            job["status"] = "Taken"
+            shift_status = "Exit Pending" if end_date - now < timedelta(hours=2) else "Started"
+        else:
+            job["status"] = "Approved"
+            shift_status = "Scheduled"
+        started = shift_status != "Scheduled"
+        completed = shift_status == "Completed"
+        first_start, last_end, _ = job_bounds(job, total_hours)
+        shift_start = from_epoch_seconds(first_start)
+        shift_end = from_epoch_seconds(last_end)
+        job["updatedAt"] = _iso(end_date if completed else approved_at)
+        shift_record = {
+            "id": seeded_id(rng),
+            "jobId": job["id"],
+            "doctorId": approved_doctor["id"],
+            "date": job["startDate"],
+            "startTime": job["startTime"],
+            "endTime": job["endTime"],
+            "actualStartTime": _iso(shift_start + timedelta(minutes=rng.randint(-10, 20))) if started else None,
+            "actualEndTime": _iso(shift_end + timedelta(minutes=rng.randint(-15, 45))) if completed else None,
+            "status": shift_status,
+            "checkIn": _iso(shift_start) if started else None,
+            "checkOut": _iso(shift_end) if completed else None,
+            "proofOfCompletion": {
+                "photo": f"https://example.com/proof/{job['id']}.jpg",
+                "timesheet": f"https://example.com/timesheets/{job['id']}.pdf",
+                "note": "Shift completed successfully",
+            } if completed else None,
+            "createdAt": _iso(approved_at),
+            "updatedAt": _iso(min(now, end_date) if started else approved_at),
+        }
+        shifts.append(shift_record)
+        doctors_by_id[approved_doctor["id"]]["approvedJobs"].append(job["id"])
+
+        if not completed:
+            continue
+        doctors_by_id[approved_doctor["id"]]["completedShifts"] += 1
+
+        due_date = end_date + timedelta(days=7)
+        if due_date < now - timedelta(days=7):
+            payment_status = "Paid" if rng.random() < 0.95 else "Processing"
+        elif due_date < now:
+            payment_status = rng.choices(["Pending", "Processing", "Paid"], weights=[0.2, 0.3, 0.5], k=1)[0]
+        else:
+            payment_status = rng.choices(["Pending", "Processing"], weights=[0.7, 0.3], k=1)[0]
+        paid_date = due_date - timedelta(days=rng.randint(0, 5)) if payment_status == "Paid" else None
+        payments.append({
+            "id": seeded_id(rng),
+            "shiftId": shift_record["id"],
+            "jobId": job["id"],
+            "doctorId": approved_doctor["id"],
+            "amount": shift_pay(shift_record, job),
+            "status": payment_status,
+            "dueDate": _iso(due_date),
+            "paidDate": _iso(min(paid_date, now)) if paid_date else None,
+            "createdAt": _iso(end_date),
+            "updatedAt": _iso(min(now, paid_date or end_date)),
+        })
+
+        if rng.random() < 0.5:
+            feedbacks.append({
+                "id": seeded_id(rng),
+                "doctorId": approved_doctor["id"],
+                "doctorName": approved_doctor["name"],
+                "doctorAvatar": approved_doctor["avatar"],
+                "rating": rng.choices([1, 2, 3, 4, 5], weights=[1, 2, 8, 35, 54], k=1)[0],
+                "comment": f"Feedback on {role} position.",
+                "date": _iso(min(now, end_date + timedelta(days=1))),
+                "jobId": job["id"],
+                "jobTitle": role,
+                "createdBy": job["createdBy"],
+                "createdAt": _iso(min(now, end_date + timedelta(days=1))),
+            })
+
+    for application in applications:
+        doctors_by_id[application["doctorId"]]["appliedJobs"].append(application["jobId"])
+
+    print(f"Generated {len(jobs)} jobs")
+    print(f"Generated {len(applications)} applications")
+    print(f"Generated {len(shifts)} shifts")
+    print(f"Generated {len(payments)} payments")
+    print(f"Generated {len(notifications)} notifications")
+    print(f"Generated {len(feedbacks)} feedbacks")
+
+    issue_types = ["Payment", "Technical", "Account", "Other"]
+    admin_messages = []
+    for hr_user in hr_users:
+        for _ in range(poisson(rng, 1.5)):
+            issue_type = rng.choice(issue_types)
+            sent_at = window_start + timedelta(seconds=rng.randrange(days * 86400))
+            admin_messages.append({
+                "id": seeded_id(rng),
+                "from": "hr",
+                "userId": hr_user["id"],
+                "message": f"Need assistance with {issue_type.lower()} issue.",
+                "timestamp": _iso(sent_at),
+                "read": True,
+                "issueType": issue_type,
+            })
+            admin_messages.append({
+                "id": seeded_id(rng),
+                "from": "admin",
+                "userId": None,
+                "message": f"Thank you for contacting us. We'll look into your {issue_type.lower()} issue.",
+                "timestamp": _iso(min(now, sent_at + timedelta(hours=rng.uniform(1, 48)))),
+                "read": rng.random() < 0.7,
+                "issueType": issue_type,
+            })
+    print(f"Generated {len(admin_messages)} admin messages")
+
+    hr_doctor_pool = []
+    for hr_user in hr_users:
+        for doctor in zipf_sample_unique(rng, doctors_by_popularity, doctor_cum_weights, poisson(rng, 8)):
+            hr_doctor_pool.append({
+                "id": seeded_id(rng),
+                "hrId": hr_user["id"],
+                "doctorId": doctor["id"],
+                "addedAt": _iso(window_start + timedelta(seconds=rng.randrange(days * 86400))),
+            })
+    print(f"Generated {len(hr_doctor_pool)} HR doctor pool entries")
+
+    return {
+        "users": users,
+        "doctors": doctors,
+        "documents": documents,
+        "hospitals": hospitals,
+        "jobs": jobs,
+        "applications": applications,
+        "shifts": shifts,
+        "payments": payments,
+        "notifications": notifications,
+        "feedbacks": feedbacks,
+        "admin_messages": admin_messages,
+        "hr_doctor_pool": hr_doctor_pool,
+    }
+
+
 if __name__ == "__main__":
     """Example usage - print seed data as JSON"""
+    import argparse
     import json
     
-    seed_data = generate_all_seed_data()
+    parser = argparse.ArgumentParser(description='Generate seed data as JSON')
+    parser.add_argument('--skewed', action='store_true',
+                       help='Generate a large dataset with Zipf/seasonal/Poisson distributions')
+    parser.add_argument('--jobs', type=int, default=20000, help='Number of jobs for --skewed (default: 20000)')
+    parser.add_argument('--doctors', type=int, default=2000, help='Number of doctors for --skewed (default: 2000)')
+    parser.add_argument('--hospitals', type=int, default=100, help='Number of hospitals for --skewed (default: 100)')
+    parser.add_argument('--hr-users', type=int, default=50, help='Number of HR users for --skewed (default: 50)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for --skewed (default: 42)')
+    parser.add_argument('--now', type=str,
+                       help='Reference time for --skewed, e.g. 2025-06-01T00:00:00 (default: derived from --seed)')
+    
+    args = parser.parse_args()
+    
+    if args.skewed:
+        seed_data = generate_skewed_seed_data(num_hr_users=args.hr_users, num_hospitals=args.hospitals,
+                                              num_doctors=args.doctors, num_jobs=args.jobs, seed=args.seed,
+                                              now=datetime.fromisoformat(args.now) if args.now else None)
+    else:
+        seed_data = generate_all_seed_data()
     
     # Print summary
     print("\n" + "="*50)
@@ -0,0 +1,207 @@
+"""
+Unified Seed CLI
+Generates the seed data once and writes it to several targets in one run
+(SQLite, SQL file, NDJSON, MongoDB, Firestore). Backend libraries are only
+imported when their target is selected, so --help starts instantly.
+"""
+
+from sinks import SQLiteSink, SQLFileSink, NDJSONSink, MongoSink, FirestoreSink
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from itertools import islice
+import queue
+import sys
+import threading
+import time
+
+
+_DONE = object()
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+def iter_chunks(seed_data: Any, table_mapping: Dict[str, str],
+                chunk_size: int = 1000) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    (table_name, records) chunks in table_mapping order
+
+    seed_data is either a dict of record lists or a records.CompactDataset; for
+    the latter each chunk's dicts are built from the compact rows as the chunk
+    is produced, so only the chunks buffered for the sinks exist as dicts.
+    """
+    for seed_key, table_name in table_mapping.items():
+        if isinstance(seed_data, dict):
+            records = seed_data.get(seed_key, [])
+            for start in range(0, len(records), chunk_size):
+                yield table_name, records[start:start + chunk_size]
+            continue
+        rows = seed_data.iter_table(seed_key)
+        chunk = list(islice(rows, chunk_size))
+        while chunk:
+            yield table_name, chunk
+            chunk = list(islice(rows, chunk_size))
+
+
+class _SinkWorker(threading.Thread):
+    """Drains one sink's bounded queue; after a failure it keeps draining so the producer never blocks"""
+
+    def __init__(self, sink, max_chunks: int):
+        super().__init__(daemon=True)
+        self.sink = sink
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max_chunks)
+        self.rows = 0
+        self.busy_seconds = 0.0
+        self.error: Optional[BaseException] = None
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                break
+            if self.error is not None:
+                continue
+            table, records = item
+            started = time.perf_counter()
+            try:
+                self.sink.write(table, records)
+                self.rows += len(records)
+            except BaseException as e:
+                self.error = e
+            self.busy_seconds += time.perf_counter() - started
+        try:
+            self.sink.close()
+        except BaseException as e:
+            self.error = self.error or e
+
+
+def write_many(chunks: Iterator[Tuple[str, List[Dict[str, Any]]]], sinks: List[Any],
+               max_chunks: int = 8) -> Dict[str, Dict[str, Any]]:
+    """
+    Write each chunk to every sink concurrently
+
+    Every sink runs on its own thread behind a queue of at most max_chunks
+    chunks; the same chunk objects are shared by all queues. When the slowest
+    sink's queue is full the producer blocks, bounding memory.
+
+    Returns:
+        Per-sink rows written, busy seconds and error (if any)
+    """
+    workers = [_SinkWorker(sink, max_chunks) for sink in sinks]
+    for worker in workers:
+        worker.start()
+    for chunk in chunks:
+        for worker in workers:
+            worker.queue.put(chunk)
+    for worker in workers:
+        worker.queue.put(_DONE)
+    for worker in workers:
+        worker.join()
+    return {
+        worker.sink.name: {"rows": worker.rows, "seconds": worker.busy_seconds, "error": worker.error}
+        for worker in workers
+    }
+
+
+def build_sinks(args) -> List[Any]:
+    """Instantiate the selected targets, importing each backend only when used"""
+    sinks = []
+    if args.sqlite:
+        sinks.append(SQLiteSink(args.sqlite))
+    if args.sql_file:
+        sinks.append(SQLFileSink(args.sql_file, args.db_type))
+    if args.ndjson_dir:
+        sinks.append(NDJSONSink(args.ndjson_dir))
+    if args.mongodb:
+        sinks.append(MongoSink(args.mongodb, args.database, args.with_geo, args.with_search))
+    if args.firestore:
+        sinks.append(FirestoreSink(args.credentials))
+    return sinks
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate seed data once and write it to several targets')
+    parser.add_argument('--sqlite', type=str, help='SQLite database file (tables created if missing)')
+    parser.add_argument('--sql-file', type=str, help='SQL script output file')
+    parser.add_argument('--db-type', type=str, choices=['postgresql', 'mysql'], default='postgresql',
+                       help='Dialect for --sql-file (default: postgresql)')
+    parser.add_argument('--ndjson-dir', type=str, help='Directory for one NDJSON file per table')
+    parser.add_argument('--mongodb', type=str, help='MongoDB connection string (e.g. mongodb://localhost:27017/)')
+    parser.add_argument('--database', type=str, default='drlocum', help='MongoDB database name (default: drlocum)')
+    parser.add_argument('--firestore', action='store_true', help='Write to Firestore')
+    parser.add_argument('--credentials', type=str, default='API.json',
+                       help='Firebase service account JSON for --firestore (default: API.json)')
+    parser.add_argument('--with-read-models', action='store_true',
+                       help='Also write precomputed dashboard read models')
+    parser.add_argument('--with-geo', action='store_true',
+                       help='Add geohash/GeoJSON fields to hospitals and jobs (and 2dsphere indexes in MongoDB)')
+    parser.add_argument('--with-search', action='store_true',
+                       help='Add searchKeywords to jobs and doctors (multikey indexes in MongoDB, FTS5 tables in SQLite)')
+    parser.add_argument('--skewed', action='store_true', help='Generate the large skewed dataset')
+    parser.add_argument('--jobs', type=int, default=20000, help='Number of jobs for --skewed (default: 20000)')
+    parser.add_argument('--doctors', type=int, default=2000, help='Number of doctors for --skewed (default: 2000)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Records per chunk (default: 1000)')
+    parser.add_argument('--max-chunks', type=int, default=8,
+                       help='Chunks buffered per target before generation waits (default: 8)')
+    parser.add_argument('--compact', action='store_true',
+                       help='Hold the dataset as compact rows (records.py) and build dicts per chunk')
+
+    args = parser.parse_args()
+
+    try:
+        sinks = build_sinks(args)
+    except ImportError as e:
+        print(f"[ERROR] Missing backend library: {e}")
+        sys.exit(1)
+    if not sinks:
+        parser.print_help()
+        sys.exit(1)
+
+    from seed import generate_all_seed_data, generate_skewed_seed_data, COLLECTION_NAMES
+
+    started = time.perf_counter()
+    if args.skewed:
+        seed_data = generate_skewed_seed_data(num_doctors=args.doctors, num_jobs=args.jobs)
+    else:
+        seed_data = generate_all_seed_data()
+    if args.with_geo:
+        from geo_index import add_geo_fields
+        add_geo_fields(seed_data)
+    if args.with_search:
+        from search_index import add_keyword_fields
+        add_keyword_fields(seed_data)
+    table_mapping = dict(COLLECTION_NAMES)
+    if args.with_read_models:
+        from read_models import add_read_models, READ_MODEL_COLLECTIONS
+        seed_data = add_read_models(seed_data)
+        table_mapping.update(READ_MODEL_COLLECTIONS)
+    if args.with_search and args.sqlite:
+        # FTS5 tables are standalone, so build them before the dicts are compacted away
+        import sqlite3
+        from search_index import export_fts5
+        conn = sqlite3.connect(args.sqlite)
+        export_fts5(conn, seed_data)
+        conn.close()
+    if args.compact:
+        from records import CompactDataset
+        seed_data = CompactDataset.from_seed_data(
+            {key: seed_data[key] for key in table_mapping if key in seed_data}, release=True)
+    generated = time.perf_counter()
+
+    results = write_many(iter_chunks(seed_data, table_mapping, args.chunk_size), sinks, args.max_chunks)
+    finished = time.perf_counter()
+
+    print("\n" + "="*60)
+    print(f"Generated once in {generated - started:.2f}s, written to {len(sinks)} target(s) in {finished - generated:.2f}s")
+    print("="*60)
+    failed = False
+    for name, result in results.items():
+        if result["error"] is not None:
+            failed = True
+            print(f"[ERROR] {name}: {result['error']} (after {result['rows']} rows)")
+        else:
+            print(f"[OK] {name}: {result['rows']} rows in {result['seconds']:.2f}s")
+    if failed:
+        sys.exit(1)
@@ -4,8 +4,9 @@ Populates Firestore database with seed data
 """
 
 from seed import generate_all_seed_data
-import firebase_admin
-from firebase_admin import credentials, firestore
+from read_models import add_read_models, READ_MODEL_COLLECTIONS
+from geo_index import add_geo_fields
+from search_index import add_keyword_fields
 import sys
 import os
 
@@ -27,14 +28,21 @@ def convert_to_firestore_value(value):
     return str(value)
 
 
-def seed_firestore(credential_path: str = None):
+def seed_firestore(credential_path: str = None, with_read_models: bool = False, with_geo: bool = False,
+                   with_search: bool = False):
     """
     Seed Firestore database
     
     Args:
         credential_path: Path to Firebase service account JSON file
+        with_read_models: Also write precomputed dashboard read models
+        with_geo: Add geohash fields to hospitals and jobs for geohash range queries
+        with_search: Add searchKeywords to jobs and doctors for array-contains queries
     """
     try:
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+        
         # Initialize Firebase Admin
         if credential_path and os.path.exists(credential_path):
             cred = credentials.Certificate(credential_path)
@@ -51,6 +59,10 @@ def seed_firestore(credential_path: str = None):
         db = firestore.client()
         
         seed_data = generate_all_seed_data()
+        if with_geo:
+            add_geo_fields(seed_data)
+        if with_search:
+            add_keyword_fields(seed_data)
         
         # Map seed data keys to Firestore collection names
         collection_mapping = {
@@ -68,6 +80,10 @@ def seed_firestore(credential_path: str = None):
             "hr_doctor_pool": "hr_doctor_pool",
         }
         
+        if with_read_models:
+            seed_data = add_read_models(seed_data)
+            collection_mapping.update(READ_MODEL_COLLECTIONS)
+        
         print("\n" + "="*60)
         print("SEEDING FIRESTORE DATABASE")
         print("="*60)
@@ -129,8 +145,14 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Seed Firestore database with sample data')
     parser.add_argument('--credentials', type=str, default='API.json',
                        help='Path to Firebase service account JSON file (default: API.json)')
+    parser.add_argument('--with-read-models', action='store_true',
+                       help='Also write precomputed dashboard read models')
+    parser.add_argument('--with-geo', action='store_true',
+                       help='Add geohash fields to hospitals and jobs for geohash range queries')
+    parser.add_argument('--with-search', action='store_true',
+                       help='Add searchKeywords to jobs and doctors for array-contains queries')
     
     args = parser.parse_args()
     
-    seed_firestore(args.credentials)
+    seed_firestore(args.credentials, args.with_read_models, args.with_geo, args.with_search)
 
@@ -4,23 +4,35 @@ Populates MongoDB database with seed data
 """
 
 from seed import generate_all_seed_data
-from pymongo import MongoClient
+from read_models import add_read_models, READ_MODEL_COLLECTIONS
+from geo_index import add_geo_fields, create_mongo_geo_indexes
+from search_index import add_keyword_fields, create_mongo_search_indexes
 import sys
 
 
-def seed_mongodb(connection_string: str, database_name: str):
+def seed_mongodb(connection_string: str, database_name: str, with_read_models: bool = False,
+                 with_geo: bool = False, with_search: bool = False):
     """
     Seed MongoDB database
     
     Args:
         connection_string: MongoDB connection string (e.g., 'mongodb://localhost:27017/')
         database_name: Name of the database to seed
+        with_read_models: Also write precomputed dashboard read models
+        with_geo: Add geohash/GeoJSON fields to hospitals and jobs and create the 2dsphere indexes
+        with_search: Add searchKeywords to jobs and doctors and create their multikey indexes
     """
     try:
+        from pymongo import MongoClient
+        
         client = MongoClient(connection_string)
         db = client[database_name]
         
         seed_data = generate_all_seed_data()
+        if with_geo:
+            add_geo_fields(seed_data)
+        if with_search:
+            add_keyword_fields(seed_data)
         
         # Map seed data keys to MongoDB collection names
         collection_mapping = {
@@ -38,6 +50,10 @@ def seed_mongodb(connection_string: str, database_name: str):
             "hr_doctor_pool": "hr_doctor_pool",
         }
         
+        if with_read_models:
+            seed_data = add_read_models(seed_data)
+            collection_mapping.update(READ_MODEL_COLLECTIONS)
+        
         print("\nSeeding MongoDB database...")
         
         for seed_key, collection_name in collection_mapping.items():
@@ -47,6 +63,14 @@ def seed_mongodb(connection_string: str, database_name: str):
                 result = collection.insert_many(records)
                 print(f"Inserted {len(result.inserted_ids)} documents into {collection_name}")
         
+        if with_geo:
+            # Built after the load so inserts do not maintain the indexes row by row
+            create_mongo_geo_indexes(db)
+            print("Created geo indexes on jobs and hospitals")
+        if with_search:
+            create_mongo_search_indexes(db)
+            print("Created searchKeywords indexes on jobs and doctors")
+        
         print("\nMongoDB database seeded successfully!")
         
         client.close()
@@ -64,8 +88,14 @@ if __name__ == "__main__":
                        help='MongoDB connection string')
     parser.add_argument('--database', type=str, required=True,
                        help='Database name')
+    parser.add_argument('--with-read-models', action='store_true',
+                       help='Also write precomputed dashboard read models')
+    parser.add_argument('--with-geo', action='store_true',
+                       help='Add geohash/GeoJSON fields to hospitals and jobs and create 2dsphere indexes')
+    parser.add_argument('--with-search', action='store_true',
+                       help='Add searchKeywords to jobs and doctors and create multikey indexes')
     
     args = parser.parse_args()
     
-    seed_mongodb(args.connection_string, args.database)
+    seed_mongodb(args.connection_string, args.database, args.with_read_models, args.with_geo, args.with_search)
 
@@ -4,10 +4,39 @@ Populates database using raw SQL queries
 Supports SQLite, PostgreSQL, MySQL
 """
 
-from seed import generate_all_seed_data
+from seed import generate_all_seed_data, COLLECTION_NAMES
+from read_models import add_read_models, READ_MODEL_COLLECTIONS
+from geo_index import add_geo_fields
+from search_index import export_fts5
+import gzip
+import io
+import json
+import os
 import sqlite3
 import sys
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+
+# Foreign-key dependencies between tables (table -> tables it references)
+TABLE_DEPENDENCIES = {
+    "users": [],
+    "doctors": ["users"],
+    "hospitals": ["users"],
+    "notifications": ["users"],
+    "admin_messages": ["users"],
+    "documents": ["doctors"],
+    "jobs": ["hospitals", "users"],
+    "hr_doctor_pool": ["users", "doctors"],
+    "applications": ["jobs", "doctors"],
+    "shifts": ["jobs", "doctors"],
+    "feedback": ["jobs", "doctors", "users"],
+    "payments": ["shifts", "jobs", "doctors"],
+    "hr_dashboards": ["users"],
+    "doctor_summaries": ["doctors"],
+    "hospital_job_stats": ["hospitals"],
+}
+
+PART_EXTENSIONS = {None: ".sql", "gzip": ".sql.gz", "zstd": ".sql.zst"}
 
 
 def escape_sql_string(value: Any) -> str:
@@ -47,12 +76,17 @@ def generate_insert_sql(table_name: str, records: List[Dict[str, Any]]) -> List[
     return sql_statements
 
 
-def seed_sqlite(db_path: str):
+def seed_sqlite(db_path: str, with_read_models: bool = False, with_geo: bool = False,
+                with_search: bool = False):
     """Seed SQLite database"""
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
     seed_data = generate_all_seed_data()
+    if with_geo:
+        add_geo_fields(seed_data)
+    if with_read_models:
+        seed_data = add_read_models(seed_data)
     
     print("\nSeeding SQLite database...")
     
@@ -71,6 +105,8 @@ def seed_sqlite(db_path: str):
         "admin_messages": "admin_messages",
         "hr_doctor_pool": "hr_doctor_pool",
     }
+    if with_read_models:
+        table_mapping.update(READ_MODEL_COLLECTIONS)
     
     try:
         for seed_key, table_name in table_mapping.items():
@@ -82,6 +118,8 @@ def seed_sqlite(db_path: str):
                 print(f"Inserted {len(records)} records into {table_name}")
         
         conn.commit()
+        if with_search:
+            export_fts5(conn, seed_data)
         print("\nDatabase seeded successfully!")
         
     except Exception as e:
@@ -92,9 +130,14 @@ def seed_sqlite(db_path: str):
         conn.close()
 
 
-def generate_sql_file(output_file: str, database_type: str = "postgresql"):
+def generate_sql_file(output_file: str, database_type: str = "postgresql", with_read_models: bool = False,
+                      with_geo: bool = False):
     """Generate SQL file with INSERT statements"""
     seed_data = generate_all_seed_data()
+    if with_geo:
+        add_geo_fields(seed_data)
+    if with_read_models:
+        seed_data = add_read_models(seed_data)
     
     # Map table names based on database type
     if database_type.lower() == "postgresql":
@@ -127,6 +170,8 @@ def generate_sql_file(output_file: str, database_type: str = "postgresql"):
             "admin_messages": "admin_messages",
             "hr_doctor_pool": "hr_doctor_pool",
         }
+    if with_read_models:
+        table_mapping.update(READ_MODEL_COLLECTIONS)
     
     with open(output_file, "w", encoding="utf-8") as f:
         f.write(f"-- Seed data for {database_type.upper()}\n")
@@ -150,6 +195,125 @@ def generate_sql_file(output_file: str, database_type: str = "postgresql"):
     print(f"SQL file generated: {output_file}")
 
 
+def import_stages(tables: List[str]) -> List[List[str]]:
+    """Group tables into FK-ordered stages; tables within a stage can load in parallel"""
+    stages = []
+    placed = set()
+    remaining = list(tables)
+    while remaining:
+        stage = [t for t in remaining if all(dep in placed or dep not in tables for dep in TABLE_DEPENDENCIES.get(t, []))]
+        if not stage:
+            raise ValueError(f"Circular foreign-key dependencies between: {remaining}")
+        stages.append(stage)
+        placed.update(stage)
+        remaining = [t for t in remaining if t not in placed]
+    return stages
+
+
+def open_part_writer(path: str, compression: Optional[str] = None, exclusive: bool = False):
+    """
+    Open a text writer for a part file, optionally gzip or zstd compressed
+
+    With exclusive=True the file must not exist yet (FileExistsError otherwise).
+    """
+    mode = "x" if exclusive else "w"
+    if compression is None:
+        return open(path, mode, encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise Exception("zstd compression requires the zstandard package (pip install zstandard)")
+        raw = zstandard.ZstdCompressor(level=3).stream_writer(open(path, mode + "b"))
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def generate_sql_parts(output_dir: str, database_type: str = "postgresql", max_part_bytes: int = 64 * 1024 * 1024,
+                       parts_per_table: Optional[int] = None, compression: Optional[str] = None,
+                       with_read_models: bool = False, seed_data: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                       with_geo: bool = False):
+    """
+    Generate per-table SQL part files plus a manifest of FK-ordered import stages
+    
+    Each part is its own transaction, so parts of one stage can be imported over
+    parallel connections (see load_sql_parts.py).
+    
+    Args:
+        output_dir: Directory for part files and manifest.json
+        database_type: 'postgresql' or 'mysql'
+        max_part_bytes: Upper bound on uncompressed UTF-8 bytes of SQL per part
+        parts_per_table: Optionally split each table into at most this many parts by row count
+        compression: None, 'gzip' or 'zstd'
+        with_read_models: Also write precomputed dashboard read model tables
+        seed_data: Pre-generated seed data (generated if omitted)
+        with_geo: Add latitude/longitude/geohash/geo fields to hospitals and jobs
+    """
+    if seed_data is None:
+        seed_data = generate_all_seed_data()
+    if with_geo:
+        add_geo_fields(seed_data)
+    table_mapping = dict(COLLECTION_NAMES)
+    if with_read_models:
+        if "hr_dashboards" not in seed_data:
+            seed_data = add_read_models(seed_data)
+        table_mapping.update(READ_MODEL_COLLECTIONS)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    begin = "BEGIN;\n" if database_type.lower() == "postgresql" else "START TRANSACTION;\n"
+    extension = PART_EXTENSIONS[compression]
+    
+    tables = {}
+    for seed_key, table_name in table_mapping.items():
+        records = seed_data.get(seed_key, [])
+        if not records:
+            continue
+        max_rows = -(-len(records) // parts_per_table) if parts_per_table else len(records)
+        parts = []
+        writer = None
+        part_bytes = part_rows = 0
+        
+        for sql in generate_insert_sql(table_name, records):
+            line = sql + "\n"
+            line_bytes = len(line.encode("utf-8"))  # names and notes may hold multi-byte characters
+            if writer is not None and (part_bytes + line_bytes > max_part_bytes or part_rows >= max_rows):
+                writer.write("COMMIT;\n")
+                writer.close()
+                parts[-1].update(rows=part_rows, bytes=part_bytes)
+                writer = None
+            if writer is None:
+                file_name = f"{table_name}.part{len(parts) + 1:04d}{extension}"
+                writer = open_part_writer(os.path.join(output_dir, file_name), compression)
+                writer.write(begin)
+                parts.append({"file": file_name})
+                part_bytes = part_rows = 0
+            writer.write(line)
+            part_bytes += line_bytes
+            part_rows += 1
+        
+        writer.write("COMMIT;\n")
+        writer.close()
+        parts[-1].update(rows=part_rows, bytes=part_bytes)
+        tables[table_name] = parts
+        print(f"Wrote {len(records)} records into {len(parts)} part(s) for {table_name}")
+    
+    manifest = {
+        "databaseType": database_type.lower(),
+        "compression": compression,
+        "stages": [
+            [{"table": table, "parts": tables[table]} for table in stage]
+            for stage in import_stages(list(tables))
+        ],
+    }
+    with open(os.path.join(output_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    
+    print(f"SQL parts generated in {output_dir} ({len(manifest['stages'])} import stages)")
+    return manifest
+
+
 if __name__ == "__main__":
     import argparse
     
@@ -158,13 +322,32 @@ if __name__ == "__main__":
     parser.add_argument('--sql-file', type=str, help='Output SQL file path')
     parser.add_argument('--db-type', type=str, choices=['postgresql', 'mysql'], default='postgresql',
                        help='Database type for SQL file (default: postgresql)')
+    parser.add_argument('--with-read-models', action='store_true',
+                       help='Also write precomputed dashboard read model tables')
+    parser.add_argument('--parts-dir', type=str,
+                       help='Write per-table part files and manifest.json to this directory')
+    parser.add_argument('--part-size-mb', type=int, default=64,
+                       help='Maximum uncompressed size per part file in MB (default: 64)')
+    parser.add_argument('--parts', type=int, help='Split each table into at most N parts')
+    parser.add_argument('--compress', type=str, choices=['gzip', 'zstd'], help='Compress part files')
+    parser.add_argument('--with-geo', action='store_true',
+                       help='Add latitude/longitude/geohash/geo fields to hospitals and jobs')
+    parser.add_argument('--with-search', action='store_true',
+                       help='Also build jobs_fts / doctors_fts FTS5 tables (--sqlite only)')
     
     args = parser.parse_args()
     
+    if args.with_search and not args.sqlite:
+        # FTS5 tables only exist in SQLite; SQL files and parts would silently drop them
+        parser.error('--with-search requires --sqlite')
+    
     if args.sqlite:
-        seed_sqlite(args.sqlite)
+        seed_sqlite(args.sqlite, args.with_read_models, args.with_geo, args.with_search)
+    elif args.parts_dir:
+        generate_sql_parts(args.parts_dir, args.db_type, args.part_size_mb * 1024 * 1024, args.parts,
+                           args.compress, args.with_read_models, with_geo=args.with_geo)
     elif args.sql_file:
-        generate_sql_file(args.sql_file, args.db_type)
+        generate_sql_file(args.sql_file, args.db_type, args.with_read_models, args.with_geo)
     else:
         parser.print_help()
         sys.exit(1)
@@ -4,8 +4,6 @@ Populates database using SQLAlchemy ORM
 """
 
 from seed import generate_all_seed_data
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
 import sys
 
 
@@ -18,6 +16,9 @@ def seed_database(database_url: str, echo: bool = False):
         echo: Whether to echo SQL queries
     """
     try:
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        
         engine = create_engine(database_url, echo=echo)
         Session = sessionmaker(bind=engine)
         session = Session()
@@ -0,0 +1,195 @@
+"""
+Seed Sinks
+One write interface for every backend target: write(table, records) appends a
+batch of rows to a table or collection and close() flushes and releases it.
+Every sink may be called from several threads at once. Backend libraries are
+imported when a sink is constructed, not when this module is imported.
+"""
+
+from typing import List, Dict, Any, Optional
+import json
+import os
+import sqlite3
+import threading
+
+
+class NullSink:
+    """Discards batches; measures generation and dispatch overhead alone"""
+
+    name = "null"
+
+    def write(self, table: str, records: List[Dict[str, Any]]):
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteSink:
+    """Parameterized executemany per batch, one transaction per batch and one connection per thread"""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str, create_tables: bool = True, wal: bool = False):
+        self.db_path = db_path
+        self.create_tables = create_tables
+        self.wal = wal
+        self.columns: Dict[str, List[str]] = {}
+        self.local = threading.local()
+        self.connections: List[sqlite3.Connection] = []
+        self.lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=60, check_same_thread=False)
+            if self.wal:
+                conn.execute("PRAGMA journal_mode=WAL")
+            self.local.conn = conn
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _value(value: Any) -> Any:
+        # Same representation as seed_sql.escape_sql_string: lists and dicts as text
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, (list, dict)):
+            return str(value)
+        return value
+
+    def write(self, table: str, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        conn = self._connection()
+        with self.lock:
+            columns = self.columns.get(table)
+            if columns is None:
+                columns = self.columns[table] = list(records[0].keys())
+                if self.create_tables:
+                    column_defs = ", ".join(f'"{c}" PRIMARY KEY' if c == "id" else f'"{c}"' for c in columns)
+                    with conn:
+                        conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({column_defs})')
+        placeholders = ", ".join("?" for _ in columns)
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        with conn:
+            conn.executemany(
+                f'INSERT INTO "{table}" ({column_list}) VALUES ({placeholders})',
+                [tuple(self._value(r.get(c)) for c in columns) for r in records],
+            )
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+
+
+class SQLFileSink:
+    """INSERT statements in a PostgreSQL / MySQL script (see seed_sql.generate_sql_file)"""
+
+    name = "sql-file"
+
+    def __init__(self, path: str, database_type: str = "postgresql"):
+        from seed_sql import generate_insert_sql
+        self.generate_insert_sql = generate_insert_sql
+        self.database_type = database_type.lower()
+        self.lock = threading.Lock()
+        self.file = open(path, "w", encoding="utf-8")
+        self.file.write(f"-- Seed data for {self.database_type.upper()}\n\n")
+        if self.database_type == "postgresql":
+            self.file.write("BEGIN;\n\n")
+
+    def write(self, table: str, records: List[Dict[str, Any]]):
+        text = "\n".join(self.generate_insert_sql(table, records)) + "\n"
+        with self.lock:
+            self.file.write(text)
+
+    def close(self):
+        if self.database_type == "postgresql":
+            self.file.write("\nCOMMIT;\n")
+        self.file.close()
+
+
+class NDJSONSink:
+    """One newline-delimited JSON file per table in a directory"""
+
+    name = "ndjson"
+
+    def __init__(self, directory: str, append: bool = False):
+        self.directory = directory
+        self.mode = "a" if append else "w"
+        self.files: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, table: str, records: List[Dict[str, Any]]):
+        # Serialize outside the lock so writers only contend on the file write
+        text = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records)
+        with self.lock:
+            f = self.files.get(table)
+            if f is None:
+                f = self.files[table] = open(os.path.join(self.directory, f"{table}.ndjson"), self.mode,
+                                             encoding="utf-8")
+            f.write(text)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+
+class MongoSink:
+    """Unordered insert_many per batch"""
+
+    name = "mongodb"
+
+    def __init__(self, connection_string: str, database_name: str, with_geo_indexes: bool = False,
+                 with_search_indexes: bool = False):
+        from pymongo import MongoClient
+        self.client = MongoClient(connection_string)
+        self.db = self.client[database_name]
+        self.with_geo_indexes = with_geo_indexes
+        self.with_search_indexes = with_search_indexes
+
+    def write(self, table: str, records: List[Dict[str, Any]]):
+        # insert_many adds _id to the documents it is given; batches may be shared with other sinks
+        self.db[table].insert_many([dict(r) for r in records], ordered=False)
+
+    def close(self):
+        if self.with_geo_indexes:
+            # Built after the load so inserts do not maintain the indexes row by row
+            from geo_index import create_mongo_geo_indexes
+            create_mongo_geo_indexes(self.db)
+        if self.with_search_indexes:
+            from search_index import create_mongo_search_indexes
+            create_mongo_search_indexes(self.db)
+        self.client.close()
+
+
+class FirestoreSink:
+    """Write batches of up to 500 documents, keyed by record ID"""
+
+    name = "firestore"
+
+    def __init__(self, credential_path: Optional[str] = None):
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+        from seed_firestore import convert_to_firestore_value
+        self.convert = convert_to_firestore_value
+        if not firebase_admin._apps:
+            if credential_path and os.path.exists(credential_path):
+                firebase_admin.initialize_app(credentials.Certificate(credential_path))
+            else:
+                firebase_admin.initialize_app()
+        self.db = firestore.client()
+
+    def write(self, table: str, records: List[Dict[str, Any]]):
+        collection = self.db.collection(table)
+        for start in range(0, len(records), 500):
+            batch = self.db.batch()
+            for record in records[start:start + 500]:
+                doc_ref = collection.document(record["id"]) if record.get("id") else collection.document()
+                batch.set(doc_ref, self.convert(record))
+            batch.commit()
+
+    def close(self):
+        pass
@@ -0,0 +1,58 @@
+"""
+Event Log Replay Tests
+Derives the event stream from seed data, replays it into SQLite and checks
+that the replayed rows equal the seeded ones
+"""
+
+from event_log import derive_events, replay, SQLiteReplaySink, EVENT_TYPES
+from seed import generate_all_seed_data, generate_skewed_seed_data
+import contextlib
+import io
+import sqlite3
+import pytest
+
+
+REPLAYED_TABLES = sorted({table for table, _ in EVENT_TYPES.values()})
+
+
+def _skewed() -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generate_skewed_seed_data(num_hr_users=5, num_hospitals=10, num_doctors=200, num_jobs=1500, seed=11)
+
+
+def _small() -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generate_all_seed_data()
+
+
+def _replayed_rows(seed_data: dict) -> dict:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    sink = SQLiteReplaySink(conn)
+    replay(derive_events(seed_data), sink.apply)
+    sink.close()
+    return {table: {row["id"]: dict(row) for row in conn.execute(f"SELECT * FROM {table}")}
+            for table in REPLAYED_TABLES if seed_data.get(table)}
+
+
+@pytest.mark.parametrize("make_seed_data", [_skewed, _small], ids=["skewed", "small"])
+def test_replay_into_sqlite_equals_seed(make_seed_data):
+    seed_data = make_seed_data()
+    replayed = _replayed_rows(seed_data)
+    assert {"jobs", "shifts"} <= replayed.keys()
+    for table in replayed:
+        assert replayed[table].keys() == {r["id"] for r in seed_data[table]}, table
+        for record in seed_data[table]:
+            expected = {field: SQLiteReplaySink._value(value) for field, value in record.items()}
+            assert replayed[table][record["id"]] == expected, (table, record["status"])
+
+
+def test_cancelled_jobs_and_started_shifts_keep_their_updated_at():
+    seed_data = _skewed()
+    replayed = _replayed_rows(seed_data)
+    cancelled = [j for j in seed_data["jobs"] if j["status"] == "Cancelled"]
+    started = [s for s in seed_data["shifts"] if s["status"] == "Started"]
+    assert cancelled and started
+    for table, records in (("jobs", cancelled), ("shifts", started)):
+        for record in records:
+            assert replayed[table][record["id"]]["updatedAt"] == record["updatedAt"]
@@ -0,0 +1,50 @@
+"""
+Matching Distance Tests
+Checks the block distance computation against haversine at the short
+distances that drive the distance score
+"""
+
+import math
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from matching import EARTH_RADIUS_KM, _unit_vectors, pair_distances_km
+
+
+def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _offset(lat: float, lng: float, km: float, bearing_deg: float):
+    """Point km away from (lat, lng) along a bearing (spherical destination formula)"""
+    p1, l1, b, d = math.radians(lat), math.radians(lng), math.radians(bearing_deg), km / EARTH_RADIUS_KM
+    p2 = math.asin(math.sin(p1) * math.cos(d) + math.cos(p1) * math.sin(d) * math.cos(b))
+    l2 = l1 + math.atan2(math.sin(b) * math.sin(d) * math.cos(p1), math.cos(d) - math.sin(p1) * math.sin(p2))
+    return math.degrees(p2), math.degrees(l2)
+
+
+def test_short_distances_match_haversine():
+    origin = (40.7306, -73.9866)
+    targets = [_offset(*origin, km, bearing) for km in (0.05, 0.3, 1, 2, 3, 4.9) for bearing in (0, 45, 90, 200)]
+    distances = pair_distances_km(_unit_vectors(np.array([origin[0]]), np.array([origin[1]])),
+                                  _unit_vectors(np.array([t[0] for t in targets]), np.array([t[1] for t in targets])))
+    expected = [_haversine_km(*origin, *t) for t in targets]
+    np.testing.assert_allclose(distances[0], expected, atol=1e-3)
+
+
+def test_random_pairs_below_5km_match_haversine():
+    rng = np.random.default_rng(7)
+    lat = rng.uniform(-60, 60, 200)
+    lng = rng.uniform(-180, 180, 200)
+    near = [_offset(a, b, km, bearing)
+            for a, b, km, bearing in zip(lat, lng, rng.uniform(0, 5, 200), rng.uniform(0, 360, 200))]
+    a_xyz = _unit_vectors(lat, lng)
+    b_xyz = _unit_vectors(np.array([p[0] for p in near]), np.array([p[1] for p in near]))
+    distances = np.diagonal(pair_distances_km(a_xyz, b_xyz))
+    expected = [_haversine_km(lat[i], lng[i], *near[i]) for i in range(200)]
+    np.testing.assert_allclose(distances, expected, atol=1e-3)
+    assert np.all(distances >= 0)
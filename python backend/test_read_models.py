@@ -0,0 +1,58 @@
+"""
+Read Model Maintenance Tests
+Drives ReadModels through application and job status changes and checks the
+doctor summary counters
+"""
+
+from read_models import ReadModels
+
+
+JOB = {"id": "j1", "createdBy": "hr1", "hospitalId": "h1", "urgent": False}
+
+
+def _application(doctor_id: str) -> dict:
+    return {"id": f"a-{doctor_id}", "jobId": "j1", "doctorId": doctor_id}
+
+
+def test_unapproved_doctor_is_not_credited_when_job_completes():
+    models = ReadModels()
+    models.apply_job(JOB, None, "Open")
+    application = _application("d1")
+    models.apply_application(application, None, "Pending")
+    models.apply_application(application, "Pending", "Approved")
+    models.apply_job(JOB, "Open", "Approved")
+    models.apply_application(application, "Approved", "Rejected")
+    models.apply_job(JOB, "Approved", "Completed")
+
+    summary = models.doctor_summaries["d1"]
+    assert summary["applicationsCompleted"] == 0
+    assert summary["applicationsApproved"] == 0
+    assert summary["applicationsRejected"] == 1
+
+
+def test_withdrawn_approval_is_not_credited_and_reapproval_is():
+    models = ReadModels()
+    models.apply_job(JOB, None, "Open")
+    first, second = _application("d1"), _application("d2")
+    for application in (first, second):
+        models.apply_application(application, None, "Pending")
+    models.apply_application(first, "Pending", "Approved")
+    models.apply_application(first, "Approved", None)
+    models.apply_application(second, "Pending", "Approved")
+    models.apply_job(JOB, "Open", "Completed")
+
+    assert models.doctor_summaries["d1"]["applicationsCompleted"] == 0
+    assert models.doctor_summaries["d2"]["applicationsCompleted"] == 1
+
+
+def test_unapproving_a_completed_job_removes_the_credit():
+    models = ReadModels()
+    models.apply_job(JOB, None, "Open")
+    application = _application("d1")
+    models.apply_application(application, None, "Approved")
+    models.apply_job(JOB, "Open", "Completed")
+    assert models.doctor_summaries["d1"]["applicationsCompleted"] == 1
+
+    models.apply_application(application, "Approved", "Rejected")
+    models.apply_job(JOB, "Completed", "Cancelled")
+    assert models.doctor_summaries["d1"]["applicationsCompleted"] == 0
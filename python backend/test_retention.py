@@ -0,0 +1,201 @@
+"""
+Retention Pruning Tests
+Seeds a SQLite database or a mongomock collection with notifications, prunes
+it and checks the rows left behind and the archived NDJSON
+"""
+
+from retention import SQLRetentionBackend, MongoRetentionBackend, DEFAULT_POLICIES, prune
+from sinks import SQLiteSink
+from datetime import datetime, timedelta
+import glob
+import gzip
+import json
+import os
+import sqlite3
+import pytest
+
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+POLICY = DEFAULT_POLICIES[0]  # notifications: read and older than 90 days
+
+
+def _notification(index: int, days_old: float, read: bool) -> dict:
+    return {
+        "id": f"n{index:03d}",
+        "userId": f"u{index % 3}",
+        "type": "job",
+        "title": "New Job Posted",
+        "message": f"Message {index}",
+        "timestamp": (NOW - timedelta(days=days_old)).isoformat() + "Z",
+        "read": read,
+    }
+
+
+def _notifications() -> list:
+    notifications = []
+    for i in range(12):
+        notifications.append(_notification(i, 200, read=True))       # expired; equal timestamps page by id
+    for i in range(12, 17):
+        notifications.append(_notification(i, 100 + i, read=True))  # expired
+    for i in range(17, 22):
+        notifications.append(_notification(i, 200, read=False))      # old but unread: kept
+    for i in range(22, 27):
+        notifications.append(_notification(i, 10, read=True))        # read but recent: kept
+    return notifications
+
+
+def _expired_ids(notifications: list) -> set:
+    return {n["id"] for n in notifications if n["read"] and n["timestamp"] < POLICY.cutoff(NOW)}
+
+
+def _seed(db_path: str) -> list:
+    notifications = _notifications()
+    sink = SQLiteSink(db_path)
+    sink.write("notifications", notifications)
+    sink.close()
+    return notifications
+
+
+def _read_archive(path: str) -> list:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_prune_sqlite_archives_then_deletes_expired_rows(tmp_path):
+    db_path = str(tmp_path / "drlocum.db")
+    notifications = _seed(db_path)
+    expired = _expired_ids(notifications)
+    conn = sqlite3.connect(db_path)
+    backend = SQLRetentionBackend(conn)
+    backend.create_indexes([POLICY])
+
+    result = prune(backend, POLICY, now=NOW, chunk_size=4, archive_dir=str(tmp_path / "archive"))
+
+    remaining = {row[0] for row in conn.execute("SELECT id FROM notifications")}
+    assert remaining == {n["id"] for n in notifications} - expired
+    assert result["deleted"] == result["archived"] == len(expired) == 17
+    assert result["chunks"] > 1
+
+    archived = _read_archive(result["archive"])
+    assert [row["id"] for row in archived] == sorted(expired, key=lambda i: (
+        next(n["timestamp"] for n in notifications if n["id"] == i), i))
+    assert all(row["read"] == 1 for row in archived)
+    conn.close()
+
+
+def test_prune_never_overwrites_an_archive(tmp_path):
+    archive_dir = str(tmp_path / "archive")
+    first_db = str(tmp_path / "first.db")
+    second_db = str(tmp_path / "second.db")
+    _seed(first_db)
+    _seed(second_db)
+
+    # Same run time, so both runs derive the same archive name
+    first = prune(SQLRetentionBackend(sqlite3.connect(first_db)), POLICY, now=NOW, archive_dir=archive_dir)
+    second = prune(SQLRetentionBackend(sqlite3.connect(second_db)), POLICY, now=NOW, archive_dir=archive_dir)
+
+    assert first["archive"] != second["archive"]
+    assert second["archive"].endswith("-1.ndjson.gz")
+    assert len(_read_archive(first["archive"])) == len(_read_archive(second["archive"])) == 17
+
+
+def test_sql_index_leads_with_policy_conditions(tmp_path):
+    db_path = str(tmp_path / "drlocum.db")
+    _seed(db_path)
+    conn = sqlite3.connect(db_path)
+    SQLRetentionBackend(conn).create_indexes([POLICY])
+
+    indexes = [row[1] for row in conn.execute("PRAGMA index_list(notifications)") if row[1].startswith("idx_")]
+    assert len(indexes) == 1
+    columns = [row[2] for row in conn.execute(f"PRAGMA index_info({indexes[0]})")]
+    assert columns == ["read", "timestamp", "id"]
+    conn.close()
+
+
+# ============================================================================
+# MONGODB (mongomock)
+# ============================================================================
+
+def _mongo_db():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient()["drlocum"]
+    notifications = _notifications()
+    db["notifications"].insert_many([dict(n) for n in notifications])
+    return db, notifications
+
+
+class _FailingDelete(MongoRetentionBackend):
+    """Fails the delete of the given chunk, after it was archived, like a run killed mid-way"""
+
+    def __init__(self, db, fail_on: int):
+        super().__init__(db)
+        self.deletes = 0
+        self.fail_on = fail_on
+
+    def delete(self, policy, rows):
+        self.deletes += 1
+        if self.deletes == self.fail_on:
+            raise RuntimeError("interrupted")
+        super().delete(policy, rows)
+
+
+def test_prune_mongo_archives_then_deletes_expired_documents(tmp_path):
+    db, notifications = _mongo_db()
+    expired = _expired_ids(notifications)
+    backend = MongoRetentionBackend(db)
+    backend.create_indexes([POLICY])
+
+    result = prune(backend, POLICY, now=NOW, chunk_size=4, target_chunk_seconds=None,
+                   archive_dir=str(tmp_path / "archive"))
+
+    remaining = {doc["id"] for doc in db["notifications"].find({}, {"id": 1})}
+    assert remaining == {n["id"] for n in notifications} - expired
+    assert result["deleted"] == result["archived"] == len(expired) == 17
+    assert result["chunks"] == 5
+    archived = _read_archive(result["archive"])
+    assert sorted(row["id"] for row in archived) == sorted(expired)
+    assert len({row["id"] for row in archived}) == len(archived)
+
+
+def test_mongo_keyset_pages_through_equal_timestamps():
+    db, notifications = _mongo_db()
+    backend = MongoRetentionBackend(db)
+    seen, after = [], None
+    while True:
+        rows, after = backend.fetch_chunk(POLICY, POLICY.cutoff(NOW), after, 5)
+        if not rows:
+            break
+        seen.extend(row["id"] for row in rows)
+    # Twelve expired rows share one timestamp; paging must neither skip nor repeat them
+    assert seen == sorted(_expired_ids(notifications), key=lambda i: (
+        next(n["timestamp"] for n in notifications if n["id"] == i), i))
+
+
+def test_interrupted_mongo_prune_resumes_without_losing_rows(tmp_path):
+    db, notifications = _mongo_db()
+    expired = _expired_ids(notifications)
+    archive_dir = str(tmp_path / "archive")
+
+    with pytest.raises(RuntimeError):
+        prune(_FailingDelete(db, fail_on=2), POLICY, now=NOW, chunk_size=4, target_chunk_seconds=None,
+              archive_dir=archive_dir)
+    assert db["notifications"].count_documents({}) == len(notifications) - 4
+
+    result = prune(MongoRetentionBackend(db), POLICY, now=NOW, chunk_size=4, target_chunk_seconds=None,
+                   archive_dir=archive_dir)
+    assert result["deleted"] == len(expired) - 4
+    remaining = {doc["id"] for doc in db["notifications"].find({}, {"id": 1})}
+    assert remaining == {n["id"] for n in notifications} - expired
+
+    # The interrupted chunk was archived before its delete failed, so it appears in both archives
+    archived = [row["id"] for path in glob.glob(os.path.join(archive_dir, "*")) for row in _read_archive(path)]
+    assert set(archived) == expired
+    assert len(archived) == len(expired) + 4
+
+
+def test_mongo_index_leads_with_policy_conditions():
+    db, _ = _mongo_db()
+    MongoRetentionBackend(db).create_indexes([POLICY])
+    keys = [[field for field, _ in info["key"]] for name, info in db["notifications"].index_information().items()
+            if name != "_id_"]
+    assert keys == [["read", "timestamp", "id"]]